@@ -1,477 +1,1335 @@
-#!/usr/bin/env python3
-"""
-Parse geniusness league CSV(s), compute raw scores (reversing crossword handicaps),
-extract Wordle starting words, and output data for DB backfill.
-
-Usage:
-  python backfill_league.py file1.csv [file2.csv ...]
-  python backfill_league.py --sql file1.csv  # emit INSERT statements (requires id mapping)
-
-Output: JSON by default; use --sql and a mapping file for INSERT statements.
-"""
-
-import argparse
-import csv
-import json
-import re
-import sys
-from collections import defaultdict
-from datetime import datetime
-from pathlib import Path
-
-# Game name in CSV -> slug for DB (from your games table)
-# Games can have limited runs per league (see league_game.start_date / end_date).
-GAME_SLUGS = {
-    "crossword": "crossword",
-    "connections": "connections",
-    "pyramid": "pyramid",
-    "bee": "spelling-bee",
-    "wordle": "wordle",
-    "waffle": "waffle",
-    "keyword": "keyword",
-    "flashback": "flashback",
-    "quintumble": "quintumble",
-    "bracketcity": "bracket-city",
-}
-
-# Crossword: sary and stolowd always get handicap reversal; sal did until 2024-11-24 (exclusive).
-CROSSWORD_HANDICAP_ALWAYS = {"sary", "stolowd"}
-SAL_HANDICAP_CUTOFF_DATE = "2024-11-24"  # on or after this date, sal no longer gets handicap reversal
-PLAYERS = {"sary", "sal", "bob", "stolowd"}
-
-
-def _crossword_gets_handicap_reversal(player: str, date: str) -> bool:
-    """True if this player's crossword score was handicapped on this date (so we reverse it)."""
-    if player in CROSSWORD_HANDICAP_ALWAYS:
-        return True
-    if player == "sal":
-        return date < SAL_HANDICAP_CUTOFF_DATE
-    return False
-
-
-def parse_handicap(s: str) -> float | None:
-    """Parse '75%' -> 0.75, '50%' -> 0.5. Returns None if not a handicap."""
-    if not s or not isinstance(s, str):
-        return None
-    s = s.strip()
-    m = re.match(r"^(\d+(?:\.\d+)?)\s*%$", s)
-    if not m:
-        return None
-    pct = float(m.group(1))
-    if pct <= 0 or pct > 100:
-        return None
-    return pct / 100.0
-
-
-def parse_date(s: str) -> str | None:
-    """Return date as YYYY-MM-DD or None."""
-    if not s or not isinstance(s, str):
-        return None
-    s = s.strip()
-    for fmt in ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d"):
-        try:
-            dt = datetime.strptime(s, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    return None
-
-
-def load_csv_rows(path: Path) -> list[list[str]]:
-    with open(path, newline="", encoding="utf-8") as f:
-        return list(csv.reader(f))
-
-
-def find_header_and_handicap(rows: list[list[str]]) -> tuple[int, int, int] | None:
-    """Return (header_row_idx, handicap_row_idx, first_date_col) or None."""
-    header_row = None
-    handicap_row = None
-    for i, row in enumerate(rows):
-        if not row:
-            continue
-        # Header row: has "puz", "player", "cat." and a date
-        if "puz" in row and "player" in row and "cat." in row:
-            header_row = i
-            break
-    if header_row is None:
-        return None
-
-    # First date column: column that has "12/1/2025" style
-    header = rows[header_row]
-    first_date_col = None
-    for j, cell in enumerate(header):
-        if parse_date(cell):
-            first_date_col = j
-            break
-    if first_date_col is None:
-        return None
-
-    # Handicap row: row above header that contains "xword handicap"
-    for i in range(header_row - 1, -1, -1):
-        row = rows[i]
-        if any("xword handicap" in (cell or "") for cell in row):
-            handicap_row = i
-            break
-        if any("handicap" in (cell or "").lower() for cell in row):
-            handicap_row = i
-            break
-    if handicap_row is None:
-        handicap_row = header_row - 2  # fallback: row 15 in your file
-
-    return (header_row, handicap_row, first_date_col)
-
-
-def find_starting_words_row(rows: list[list[str]], after_row: int) -> int | None:
-    for i in range(after_row, len(rows)):
-        row = rows[i]
-        if any ("start w" in (cell or "").lower() for cell in row):
-            return i
-    return None
-
-
-def extract_handicaps_per_date(
-    rows: list[list[str]], handicap_row: int, first_date_col: int, num_dates: int
-) -> list[float | None]:
-    """Handicap for each date: 0.75, 0.5, or None. Index 0 = first date."""
-    out = []
-    row = rows[handicap_row]
-    # Handicap values align with date columns (75% under 12/1, etc.)
-    handicap_start = first_date_col
-    for i in range(num_dates):
-        col = handicap_start + i
-        if col < len(row):
-            h = parse_handicap(row[col])
-            out.append(h)
-        else:
-            out.append(None)
-    return out
-
-
-def extract_dates(header_row: list[str], first_date_col: int) -> list[str]:
-    dates = []
-    for j in range(first_date_col, len(header_row)):
-        d = parse_date(header_row[j])
-        if d:
-            dates.append(d)
-        else:
-            break
-    return dates
-
-
-def extract_starting_words(
-    rows: list[list[str]], words_row_idx: int, first_date_col: int, dates: list[str]
-) -> list[tuple[str, str]]:
-    """List of (date, word). Word column is first_date_col - 1 + i for date i."""
-    row = rows[words_row_idx]
-    # "start w/:" is one column before first date; words align with dates
-    word_start = first_date_col - 1
-    out = []
-    for i, date in enumerate(dates):
-        col = word_start + i
-        if col < len(row):
-            w = (row[col] or "").strip()
-            if w and w.lower() != "start w/:":
-                out.append((date, w))
-    return out
-
-
-def parse_score_cell(cell: str):
-    """Return float or int from cell, or None if empty/invalid."""
-    if not cell or not isinstance(cell, str):
-        return None
-    s = cell.strip()
-    if not s:
-        return None
-    try:
-        if "." in s:
-            return float(s)
-        return int(s)
-    except ValueError:
-        return None
-
-
-def process_file(path: Path) -> tuple[list[dict], list[tuple[str, str]]]:
-    """
-    Returns (scores_list, starting_words_list).
-    Each score: { "date": "YYYY-MM-DD", "game_slug": str, "player": str, "raw_score": float }
-    Each starting word: (date, word)
-    """
-    rows = load_csv_rows(path)
-    meta = find_header_and_handicap(rows)
-    if not meta:
-        raise SystemExit(f"{path}: could not find header row with dates")
-
-    header_row_idx, handicap_row_idx, first_date_col = meta
-    header_row = rows[header_row_idx]
-    dates = extract_dates(header_row, first_date_col)
-    if not dates:
-        raise SystemExit(f"{path}: no dates found")
-
-    handicaps = extract_handicaps_per_date(
-        rows, handicap_row_idx, first_date_col, len(dates)
-    )
-
-    # Starting words
-    words_row = find_starting_words_row(rows, header_row_idx + 1)
-    starting_words: list[tuple[str, str]] = []
-    if words_row is not None:
-        starting_words = extract_starting_words(
-            rows, words_row, first_date_col, dates
-        )
-
-    # Data row layout varies by file: some have "raw" at first_date_col-1 (scores at first_date_col),
-    # others have "raw" at first_date_col (scores at first_date_col+1). Detect from first "raw" row.
-    game_col = player_col = cat_col = score_offset = None
-    for i in range(header_row_idx + 1, min(header_row_idx + 6, len(rows))):
-        row = rows[i]
-        if len(row) <= first_date_col:
-            continue
-        raw_at_date = (row[first_date_col] or "").strip().lower() == "raw"
-        raw_before = first_date_col > 0 and (row[first_date_col - 1] or "").strip().lower() == "raw"
-        if raw_at_date:
-            game_col = first_date_col - 2
-            player_col = first_date_col - 1
-            cat_col = first_date_col
-            score_offset = 1
-            break
-        if raw_before:
-            game_col = first_date_col - 3
-            player_col = first_date_col - 2
-            cat_col = first_date_col - 1
-            score_offset = 0
-            break
-    if game_col is None:
-        raise SystemExit(f"{path}: could not find data row layout (no 'raw' row after header)")
-    scores: list[dict] = []
-
-    for i in range(header_row_idx + 1, len(rows)):
-        row = rows[i]
-        if len(row) <= max(game_col, player_col, cat_col):
-            continue
-        cat = (row[cat_col] or "").strip().lower()
-        if cat != "raw":
-            continue
-        game_name = (row[game_col] or "").strip().lower()
-        player = (row[player_col] or "").strip().lower()
-        if not game_name or player not in PLAYERS:
-            continue
-        slug = GAME_SLUGS.get(game_name) or game_name.replace(" ", "_")
-        is_crossword = game_name == "crossword"
-        for date_idx, date in enumerate(dates):
-            score_col = first_date_col + score_offset + date_idx
-            if score_col >= len(row):
-                break
-            val = parse_score_cell(row[score_col])
-            if val is None:
-                continue
-            # Reverse handicap for crossword + sary/stolowd
-            if is_crossword and _crossword_gets_handicap_reversal(player, date):
-                h = handicaps[date_idx] if date_idx < len(handicaps) else None
-                if h and h > 0:
-                    val = val / h
-            # Wordle: spreadsheet has "remaining slots" (0–5) or -1 for fail; store guesses (1–6) or 7 for fail
-            if slug == "wordle":
-                if val == -1:
-                    val = 7  # failed
-                elif 0 <= val <= 5:
-                    val = 6 - int(val)  # remaining 0 → 6 guesses, remaining 5 → 1 guess
-            # Connections: spreadsheet 5=0 mistakes, 4=1, 3=2, 2=3, 1=4, 0=fail; DB stores mistakes (0–4), fail=4
-            if slug == "connections":
-                if val == 0:
-                    val = 4  # fail = 4 mistakes
-                elif 1 <= val <= 5:
-                    val = 5 - int(val)  # 5→0, 4→1, 3→2, 2→3, 1→4 mistakes
-            scores.append({
-                "date": date,
-                "game_slug": slug,
-                "player": player,
-                "raw_score": round(val, 4) if isinstance(val, float) else val,
-            })
-
-    return scores, starting_words
-
-
-def main():
-    ap = argparse.ArgumentParser(description="Parse league CSV and output backfill data")
-    ap.add_argument("files", nargs="+", type=Path, help="CSV file(s)")
-    ap.add_argument("--sql", action="store_true", help="Emit SQL INSERTs (requires --ids)")
-    ap.add_argument(
-        "--ids",
-        type=Path,
-        help="JSON file: user_ids, game_ids (by slug), league_id, optional league_games (slug -> start_date/end_date)",
-    )
-    ap.add_argument("-o", "--output", type=Path, help="Write output to file (default: stdout)")
-    ap.add_argument(
-        "--allow-placeholders",
-        action="store_true",
-        help="Emit SQL even when ids look like placeholders (YOUR_*, REPLACE_*). Use for find-replace workflow.",
-    )
-    ap.add_argument(
-        "--deduplicate",
-        action="store_true",
-        help="Keep first occurrence when same (player, game, date) appears in multiple CSVs; warn instead of error.",
-    )
-    args = ap.parse_args()
-
-    all_scores = []
-    all_starting_words: list[tuple[str, str]] = []
-    seen_dates_words: set[tuple[str, str]] = set()
-
-    for path in args.files:
-        if not path.exists():
-            print(f"Skip (not found): {path}", file=sys.stderr)
-            continue
-        scores, words = process_file(path)
-        for s in scores:
-            s["_source"] = str(path)
-        all_scores.extend(scores)
-        for d, w in words:
-            key = (d, w)
-            if key not in seen_dates_words:
-                seen_dates_words.add(key)
-                all_starting_words.append((d, w))
-
-    # Detect duplicate (player, game, date) across files — same key in multiple CSVs
-    by_key: dict[tuple[str, str, str], list[dict]] = defaultdict(list)
-    for s in all_scores:
-        key = (s["player"], s["game_slug"], s["date"])
-        by_key[key].append(s)
-    duplicates = {k: v for k, v in by_key.items() if len(v) > 1}
-    if duplicates:
-        sources = []
-        for (player, game_slug, date), group in sorted(duplicates.items()):
-            files = sorted(set(s["_source"] for s in group))
-            sources.append(f"  ({player}, {game_slug}, {date}) from: {', '.join(files)}")
-        msg = (
-            "Duplicate scores (same player, game, date) found across CSV files.\n"
-            "This would violate scores_user_game_date_unique. Sources:\n"
-            + "\n".join(sources[:20])
-            + ("\n  ... and more" if len(sources) > 20 else "")
-        )
-        if args.deduplicate:
-            # Keep first occurrence per key, drop the rest
-            seen_key: set[tuple[str, str, str]] = set()
-            deduped = []
-            for s in all_scores:
-                key = (s["player"], s["game_slug"], s["date"])
-                if key in seen_key:
-                    continue
-                seen_key.add(key)
-                deduped.append(s)
-            all_scores = deduped
-            print(
-                f"Warning: {sum(len(g) - 1 for g in duplicates.values())} duplicate score(s) removed (same player/game/date in multiple CSVs). First occurrence kept.",
-                file=sys.stderr,
-            )
-        else:
-            print(msg, file=sys.stderr)
-            raise SystemExit(1)
-
-    if args.sql:
-        ids = {}
-        if args.ids and args.ids.exists():
-            with open(args.ids, encoding="utf-8") as f:
-                ids = json.load(f)
-        user_ids = ids.get("user_ids") or {}
-        game_ids = ids.get("game_ids") or {}
-        league_id = ids.get("league_id") or "REPLACE_LEAGUE_ID"
-        league_games = ids.get("league_games") or {}
-        lines = []
-        # league_game: which games ran for which date range in this league (optional)
-        for slug, range_spec in sorted(league_games.items()):
-            start_date = range_spec.get("start_date")
-            end_date = range_spec.get("end_date")
-            if not start_date:
-                continue
-            gid = game_ids.get(slug)
-            if not gid or gid == "REPLACE_GAME_ID":
-                continue
-            end_sql = f"'{end_date}'" if end_date else "NULL"
-            lines.append(
-                f"INSERT INTO public.league_game (leagueid, gameid, start_date, end_date) VALUES ('{league_id}', '{gid}', '{start_date}', {end_sql});"
-            )
-        def _is_placeholder(val: str) -> bool:
-            if args.allow_placeholders:
-                return False
-            if not val:
-                return True
-            return "REPLACE_" in val or val.startswith("YOUR_")
-
-        seen_ug = set()
-        skipped_scores = 0
-        seen_score_key: set[tuple[str, str, str]] = set()
-        duplicate_in_sql: list[tuple[str, str, str]] = []
-        for s in all_scores:
-            uid = user_ids.get(s["player"], "REPLACE_USER_ID")
-            gid = game_ids.get(s["game_slug"], "REPLACE_GAME_ID")
-            if _is_placeholder(uid) or _is_placeholder(gid):
-                skipped_scores += 1
-                continue
-            key = (uid, gid, s["date"])
-            if key in seen_score_key:
-                duplicate_in_sql.append(key)
-            seen_score_key.add(key)
-            lines.append(
-                f"INSERT INTO public.scores (user_id, game_id, date, score) VALUES ('{uid}', '{gid}', '{s['date']}', {s['raw_score']});"
-            )
-            seen_ug.add((uid, gid))
-        if duplicate_in_sql:
-            print(
-                "Duplicate (user_id, game_id, date) in generated SQL — would violate scores_user_game_date_unique:\n"
-                + "\n".join(f"  {k[0][:8]}... {k[1][:8]}... {k[2]}" for k in duplicate_in_sql[:30])
-                + ("\n  ... and more" if len(duplicate_in_sql) > 30 else ""),
-                file=sys.stderr,
-            )
-            raise SystemExit(1)
-        if skipped_scores:
-            print(
-                f"Warning: skipped {skipped_scores} score row(s) — no valid user_id/game_id mapping. Use --ids with a JSON file that has your real UUIDs.",
-                file=sys.stderr,
-            )
-        for (uid, gid) in sorted(seen_ug):
-            lines.append(
-                f"INSERT INTO public.user_games (user_id, game_id) VALUES ('{uid}', '{gid}') ON CONFLICT (game_id, user_id) DO NOTHING;"
-            )
-        if _is_placeholder(league_id):
-            if all_starting_words:
-                print(
-                    "Warning: skipped league_starting_words — no valid league_id. Set league_id in your ids file.",
-                    file=sys.stderr,
-                )
-        else:
-            for date, word in all_starting_words:
-                word_esc = (word or "").replace("'", "''")
-                lines.append(
-                    f"INSERT INTO public.league_starting_words (league_id, date, word) VALUES ('{league_id}', '{date}', '{word_esc}');"
-                )
-        if not lines:
-            print(
-                "No INSERTs generated — backfill.sql will be empty.\n"
-                "The script skips rows when user_id/game_id/league_id look like placeholders (YOUR_* or REPLACE_*).\n"
-                "Put your real UUIDs in the JSON file passed to --ids (e.g. ids.json) and run again.",
-                file=sys.stderr,
-            )
-        else:
-            score_count = sum(1 for ln in lines if ln.strip().startswith("INSERT INTO public.scores "))
-            dest = args.output or "stdout"
-            print(f"Wrote {len(lines)} statement(s) ({score_count} score INSERTs) to {dest}.", file=sys.stderr)
-            if args.output:
-                print(
-                    "If the SQL fails with 'duplicate key ... scores_user_game_date_unique', the DB already has those rows (e.g. from a previous run).",
-                    file=sys.stderr,
-                )
-        out = "\n".join(lines)
-    else:
-        out = json.dumps({
-            "scores": all_scores,
-            "starting_words": [{"date": d, "word": w} for d, w in all_starting_words],
-        }, indent=2)
-
-    if args.output:
-        args.output.write_text(out, encoding="utf-8")
-    else:
-        print(out)
-
-
-if __name__ == "__main__":
-    main()
+#!/usr/bin/env python3
+"""
+Parse geniusness league CSV(s), compute raw scores (reversing handicaps per the handicap schedule),
+extract Wordle starting words, and output data for DB backfill.
+
+Usage:
+  python backfill_league.py file1.csv [file2.csv ...]
+  python backfill_league.py --sql file1.csv  # emit INSERT statements (requires id mapping)
+  python backfill_league.py --format copy --ids ids.json file1.csv  # COPY blocks for bulk loading
+  python backfill_league.py --watch data/ -o scores.ndjson  # append new/changed scores as exports land
+
+Output: JSON by default; use --sql and a mapping file for INSERT statements.
+"""
+
+import argparse
+import cProfile
+import csv
+import hashlib
+import inspect
+import io
+import json
+import re
+import sys
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache, partial
+from itertools import chain
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from columnar import write_columnar
+from db_loader import CONFLICT_POLICIES, DEFAULT_SCHEMA, DbLoader
+from dedupe import (
+    DEFAULT_MEMORY_MB,
+    DEFAULT_REPORT,
+    ON_CONFLICT_POLICIES,
+    ConflictReport,
+    StreamingDeduplicator,
+    resolve_table,
+)
+from handicap_schedule import HandicapSchedule, load_handicaps
+from parse_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, ParseCache
+from pipeline import DEFAULT_DEPTH, Throughput, parse_pipelined, write_pipelined
+from run_stats import FileStats, RunStats, stage
+from score_table import ScoreTable
+from snapshot_diff import DiffWriter, Snapshot
+from split_output import SPLIT_PERIODS, SplitWriter
+from sql_output import DEFAULT_BATCH_SIZE, SQL_FORMATS, SqlWriter
+from watch import DEFAULT_INTERVAL, Delta, DirectoryWatcher, UpsertWriter
+from xlsx_reader import format_number, iter_xlsx_rows, load_cell_kinds, pick_sheet
+
+# Game name in CSV -> slug for DB (from your games table)
+# Games can have limited runs per league (see league_game.start_date / end_date).
+GAME_SLUGS = {
+    "crossword": "crossword",
+    "connections": "connections",
+    "pyramid": "pyramid",
+    "bee": "spelling-bee",
+    "wordle": "wordle",
+    "waffle": "waffle",
+    "keyword": "keyword",
+    "flashback": "flashback",
+    "quintumble": "quintumble",
+    "bracketcity": "bracket-city",
+}
+
+# games.score_type per slug, as seeded by supabase/schema.sql and the migrations. ids.json can
+# override or extend it with "score_types": {"slug": "lower_better" | "higher_better"}.
+SCORE_TYPES = {
+    "crossword": "lower_better",
+    "connections": "lower_better",
+    "wordle": "lower_better",
+    "keyword": "lower_better",
+    "pyramid": "lower_better",
+    "pyramid-scheme": "lower_better",
+    "strands": "lower_better",
+    "mini-crossword": "lower_better",
+    "quintumble": "higher_better",
+    "spelling-bee": "higher_better",
+    "bracket-city": "higher_better",
+    "waffle": "higher_better",
+    "flashback": "higher_better",
+}
+
+PLAYERS = {"sary", "sal", "bob", "stolowd"}
+
+# Handicap schedule used unless ids.json "handicaps" or --handicaps give one: sary and stolowd
+# always had a crossword handicap, sal until 2024-11-24 (exclusive). No day_multipliers, so the
+# percentage comes from the sheet's "xword handicap" row, which only applies to SHEET_HANDICAP_GAME.
+DEFAULT_HANDICAPS = [
+    {"player": "sary", "game": "crossword", "start_date": None, "end_date": None, "day_multipliers": None},
+    {"player": "stolowd", "game": "crossword", "start_date": None, "end_date": None, "day_multipliers": None},
+    {"player": "sal", "game": "crossword", "start_date": None, "end_date": "2024-11-23", "day_multipliers": None},
+]
+SHEET_HANDICAP_GAME = "crossword"
+HANDICAP_SCHEDULE = HandicapSchedule(DEFAULT_HANDICAPS)
+
+
+def set_handicap_schedule(schedule: HandicapSchedule) -> None:
+    """Use schedule for handicap reversal (also the --jobs worker initializer)."""
+    global HANDICAP_SCHEDULE
+    HANDICAP_SCHEDULE = schedule
+
+
+# Per-game score transforms, keyed by game slug. Each takes one data row at a time:
+# fn(values, player, dates, handicaps) -> values, where values[i] is the parsed cell for dates[i]
+# (None for blank/invalid cells, which must stay None). Games without an entry are stored as-is;
+# a new game that needs converting only has to register one function here.
+GAME_TRANSFORMS: dict[str, Callable] = {}
+
+
+def register_transform(slug: str):
+    def decorator(fn):
+        GAME_TRANSFORMS[slug] = fn
+        return fn
+    return decorator
+
+
+@register_transform("wordle")
+def _wordle_transform(values, player, dates, handicaps):
+    """Spreadsheet has "remaining slots" (0–5) or -1 for fail; store guesses (1–6) or 7 for fail."""
+    return [
+        7 if val == -1 else 6 - int(val) if val is not None and 0 <= val <= 5 else val
+        for val in values
+    ]
+
+
+@register_transform("connections")
+def _connections_transform(values, player, dates, handicaps):
+    """Spreadsheet 5=0 mistakes, 4=1, 3=2, 2=3, 1=4, 0=fail; DB stores mistakes (0–4), fail=4."""
+    return [
+        4 if val == 0 else 5 - int(val) if val is not None and 1 <= val <= 5 else val
+        for val in values
+    ]
+
+
+def parse_handicap(s: str) -> float | None:
+    """Parse '75%' -> 0.75, '50%' -> 0.5. Returns None if not a handicap."""
+    if not s or not isinstance(s, str):
+        return None
+    s = s.strip()
+    m = re.match(r"^(\d+(?:\.\d+)?)\s*%$", s)
+    if not m:
+        return None
+    pct = float(m.group(1))
+    if pct <= 0 or pct > 100:
+        return None
+    return pct / 100.0
+
+
+_MDY_DATE = re.compile(r"([0-9]{1,2})/([0-9]{1,2})/([0-9]{4}|[0-9]{2})")
+_ISO_DATE = re.compile(r"([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})")
+
+
+def parse_date(s: str) -> str | None:
+    """Return date as YYYY-MM-DD or None."""
+    if not s or not isinstance(s, str):
+        return None
+    return _parse_date_text(s.strip())
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_text(s: str) -> str | None:
+    """
+    parse_date of a stripped cell, memoized: header cells repeat across sheets and reruns.
+    M/D/YYYY, M/D/YY and YYYY-MM-DD are read with a regex; anything else (or any
+    impossible date) goes through strptime, which has the final say.
+    """
+    m = _MDY_DATE.fullmatch(s)
+    if m:
+        month, day, year = map(int, m.groups())
+        if len(m.group(3)) == 2:
+            year += 2000 if year < 69 else 1900  # strptime's %y pivot
+    else:
+        m = _ISO_DATE.fullmatch(s)
+        if m:
+            year, month, day = map(int, m.groups())
+    if m and year >= 1000:
+        try:
+            return date(year, month, day).isoformat()
+        except ValueError:
+            pass
+    for fmt in ("%m/%d/%Y", "%m/%d/%y", "%Y-%m-%d"):
+        try:
+            dt = datetime.strptime(s, fmt)
+            return dt.strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+@contextmanager
+def open_sheet_rows(path: Path, data: bytes | None = None):
+    """
+    Yield an iterator over a sheet's rows: a CSV export, or the league sheet of an .xlsx workbook.
+    data: the file's bytes, if already read (--pipeline's read stage); otherwise path is opened.
+    """
+    if path.suffix.lower() == ".xlsx":
+        rows = iter_xlsx_rows(path, data=data)
+        try:
+            yield rows
+        finally:
+            rows.close()
+        return
+    if data is not None:
+        yield csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        yield csv.reader(f)
+
+
+def load_csv_rows(path: Path, data: bytes | None = None) -> list[list[str]]:
+    with open_sheet_rows(path, data) as rows:
+        return list(rows)
+
+
+def find_header_and_handicap(rows: list[list[str]]) -> tuple[int, int, int] | None:
+    """Return (header_row_idx, handicap_row_idx, first_date_col) or None."""
+    header_row = None
+    handicap_row = None
+    for i, row in enumerate(rows):
+        if not row:
+            continue
+        # Header row: has "puz", "player", "cat." and a date
+        if "puz" in row and "player" in row and "cat." in row:
+            header_row = i
+            break
+    if header_row is None:
+        return None
+
+    # First date column: column that has "12/1/2025" style
+    header = rows[header_row]
+    first_date_col = None
+    for j, cell in enumerate(header):
+        if parse_date(cell):
+            first_date_col = j
+            break
+    if first_date_col is None:
+        return None
+
+    # Handicap row: row above header that contains "xword handicap"
+    for i in range(header_row - 1, -1, -1):
+        row = rows[i]
+        if any("xword handicap" in (cell or "") for cell in row):
+            handicap_row = i
+            break
+        if any("handicap" in (cell or "").lower() for cell in row):
+            handicap_row = i
+            break
+    if handicap_row is None:
+        handicap_row = header_row - 2  # fallback: row 15 in your file
+
+    return (header_row, handicap_row, first_date_col)
+
+
+def extract_handicaps_per_date(
+    rows: list[list[str]], handicap_row: int, first_date_col: int, num_dates: int
+) -> list[float | None]:
+    """Handicap for each date: 0.75, 0.5, or None. Index 0 = first date."""
+    out = []
+    row = rows[handicap_row]
+    # Handicap values align with date columns (75% under 12/1, etc.)
+    handicap_start = first_date_col
+    for i in range(num_dates):
+        col = handicap_start + i
+        if col < len(row):
+            h = parse_handicap(row[col])
+            out.append(h)
+        else:
+            out.append(None)
+    return out
+
+
+def extract_dates(header_row: list[str], first_date_col: int) -> list[str]:
+    dates = []
+    for j in range(first_date_col, len(header_row)):
+        d = parse_date(header_row[j])
+        if d:
+            dates.append(d)
+        else:
+            break
+    return dates
+
+
+def extract_starting_words(
+    rows: list[list[str]], words_row_idx: int, first_date_col: int, dates: list[str]
+) -> list[tuple[str, str]]:
+    """List of (date, word). Word column is first_date_col - 1 + i for date i."""
+    row = rows[words_row_idx]
+    # "start w/:" is one column before first date; words align with dates
+    word_start = first_date_col - 1
+    out = []
+    for i, date in enumerate(dates):
+        col = word_start + i
+        if col < len(row):
+            w = (row[col] or "").strip()
+            if w and w.lower() != "start w/:":
+                out.append((date, w))
+    return out
+
+
+def parse_score_cell(cell: str):
+    """Return float or int from cell, or None if empty/invalid."""
+    if not cell or not isinstance(cell, str):
+        return None
+    s = cell.strip()
+    if not s:
+        return None
+    try:
+        if "." in s:
+            return float(s)
+        return int(s)
+    except ValueError:
+        return None
+
+
+def detect_data_layout(rows: list[list[str]], first_date_col: int) -> tuple[int, int, int, int] | None:
+    """
+    Return (game_col, player_col, cat_col, score_offset) from the first "raw" row in rows, or None.
+    Data row layout varies by file: some have "raw" at first_date_col-1 (scores at first_date_col),
+    others have "raw" at first_date_col (scores at first_date_col+1).
+    """
+    for row in rows:
+        if len(row) <= first_date_col:
+            continue
+        raw_at_date = (row[first_date_col] or "").strip().lower() == "raw"
+        raw_before = first_date_col > 0 and (row[first_date_col - 1] or "").strip().lower() == "raw"
+        if raw_at_date:
+            return (first_date_col - 2, first_date_col - 1, first_date_col, 1)
+        if raw_before:
+            return (first_date_col - 3, first_date_col - 2, first_date_col - 1, 0)
+    return None
+
+
+class SheetLayout(NamedTuple):
+    """What sniff_sheet learns from the top of a sheet: everything the data pass needs."""
+
+    header_row: int
+    first_date_col: int
+    dates: list[str]
+    handicaps: list[float | None]
+    layout: tuple[int, int, int, int]
+
+
+# Sheet template fingerprint (header row position and labels up to "cat.") -> first date column,
+# so sheets exported from the same template skip searching the header for it
+LAYOUT_TEMPLATES: dict[tuple, int] = {}
+
+
+def layout_fingerprint(header_row: int, header: list[str]) -> tuple:
+    return (header_row, tuple(header[: header.index("cat.") + 1]))
+
+
+def sniff_sheet(rows: Iterator[list[str]], path: Path) -> tuple[SheetLayout, list[list[str]]]:
+    """
+    Read only the top of a sheet: down to the header row (noting the nearest row above it that
+    mentions "handicap"), then up to five rows until one gives the data layout. Returns the layout
+    and the rows read after the header, which the data pass must still see; rows stays positioned
+    after them. The first date column comes from LAYOUT_TEMPLATES when the sheet's template has been
+    seen (and its header agrees), else from the header, and is recorded for the next sheet.
+    """
+    header = None
+    handicap_row: list[str] | None = None
+    above_header: deque[list[str]] = deque(maxlen=2)
+    for header_row, row in enumerate(rows):
+        # Header row: has "puz", "player", "cat." and a date
+        if row and "puz" in row and "player" in row and "cat." in row:
+            header = row
+            break
+        # Handicap row: nearest row above header that mentions "handicap"
+        if any("handicap" in (cell or "").lower() for cell in row):
+            handicap_row = row
+        above_header.append(row)
+    if header is None:
+        raise SystemExit(f"{path}: could not find header row with dates")
+    fingerprint = layout_fingerprint(header_row, header)
+    first_date_col = LAYOUT_TEMPLATES.get(fingerprint)
+    if first_date_col is not None and not (
+        first_date_col < len(header)
+        and parse_date(header[first_date_col])
+        and not any(parse_date(cell) for cell in header[len(fingerprint[1]) : first_date_col])
+    ):
+        first_date_col = None
+    if first_date_col is None:
+        first_date_col = next((j for j, cell in enumerate(header) if parse_date(cell)), None)
+        if first_date_col is None:
+            raise SystemExit(f"{path}: could not find header row with dates")
+        LAYOUT_TEMPLATES[fingerprint] = first_date_col
+    dates = extract_dates(header, first_date_col)
+    if not dates:
+        raise SystemExit(f"{path}: no dates found")
+    if handicap_row is None:
+        # fallback: two rows above the header
+        handicap_row = above_header[0] if len(above_header) == 2 else []
+    handicaps = extract_handicaps_per_date([handicap_row], 0, first_date_col, len(dates))
+
+    held: list[list[str]] = []
+    layout = None
+    for row in rows:
+        held.append(row)
+        layout = detect_data_layout([row], first_date_col)
+        if layout is not None or len(held) == 5:
+            break
+    if layout is None:
+        raise SystemExit(f"{path}: could not find data row layout (no 'raw' row after header)")
+    return SheetLayout(header_row, first_date_col, dates, handicaps, layout), held
+
+
+def is_starting_words_row(row: list[str]) -> bool:
+    return "start w" in "\x00".join(row).lower()
+
+
+def iter_row_scores(
+    row: list[str],
+    layout: tuple[int, int, int, int],
+    first_date_col: int,
+    dates: list[str],
+    handicaps: list[float | None],
+    counts: Counter | None = None,
+):
+    """
+    Yield a score dict for each filled date cell of one "raw" data row (nothing for other rows).
+    With counts (--stats), also tally raw rows, cells parsed, blank/invalid cells and handicap reversals.
+    """
+    game_col, player_col, cat_col, score_offset = layout
+    if len(row) <= max(game_col, player_col, cat_col):
+        return
+    cat = (row[cat_col] or "").strip().lower()
+    if cat != "raw":
+        return
+    game_name = (row[game_col] or "").strip().lower()
+    player = (row[player_col] or "").strip().lower()
+    if not game_name or player not in PLAYERS:
+        return
+    slug = GAME_SLUGS.get(game_name) or game_name.replace(" ", "_")
+    start = first_date_col + score_offset
+    cells = row[start : start + len(dates)]
+    values = [parse_score_cell(cell) for cell in cells]
+    if counts is not None:
+        blank = sum(1 for cell in cells if not (cell or "").strip())
+        counts["raw_rows"] += 1
+        counts["cells_parsed"] += len(cells)
+        counts["blank_cells"] += blank
+        counts["invalid_cells"] += values.count(None) - blank
+    # Handicap reversal (displayed / multiplier) on dates the schedule says the player was handicapped
+    multipliers = HANDICAP_SCHEDULE.row_multipliers(
+        player, slug, dates, handicaps if slug == SHEET_HANDICAP_GAME else None
+    )
+    if multipliers is not None:
+        converted = [val / m if val is not None and m and m > 0 else val for val, m in zip(values, multipliers)]
+        if counts is not None:
+            counts["handicap_reversals"] += sum(1 for a, b in zip(values, converted) if a is not b)
+        values = converted
+    transform = GAME_TRANSFORMS.get(slug)
+    if transform is not None:
+        values = transform(values, player, dates, handicaps)
+    for date, val in zip(dates, values):
+        if val is None:
+            continue
+        yield {
+            "date": date,
+            "game_slug": slug,
+            "player": player,
+            "raw_score": round(val, 4) if isinstance(val, float) else val,
+        }
+
+
+def process_file(
+    path: Path, stats: FileStats | None = None, data: bytes | None = None
+) -> tuple[list[dict], list[tuple[str, str]]]:
+    """
+    Returns (scores_list, starting_words_list). With stats, records stage timings and counters.
+    With data (the file's bytes, already read), path is not opened.
+    Each score: { "date": "YYYY-MM-DD", "game_slug": str, "player": str, "raw_score": float }
+    Each starting word: (date, word)
+    The sheet is sniffed for its layout (sniff_sheet), then read once more from the header down,
+    extracting scores and the words of the first "start w/:" row as they go by.
+    """
+    with stage(stats, "load"):
+        rows = load_csv_rows(path, data)
+    with stage(stats, "layout"):
+        remaining = iter(rows)
+        sheet, held = sniff_sheet(remaining, path)
+    scores: list[dict] = []
+    starting_words: list[tuple[str, str]] = []
+
+    counts = stats.counts if stats is not None else None
+    _, first_date_col, dates, handicaps, layout = sheet
+    words_found = False
+    with stage(stats, "extract"):
+        for row in chain(held, remaining):
+            if not words_found and is_starting_words_row(row):
+                words_found = True
+                starting_words = extract_starting_words([row], 0, first_date_col, dates)
+            scores.extend(iter_row_scores(row, layout, first_date_col, dates, handicaps, counts))
+    if counts is not None:
+        counts["rows_scanned"] += len(rows)
+        counts["scores"] += len(scores)
+
+    return scores, starting_words
+
+
+def _process_file_with_stats(path: Path) -> tuple[list[dict], list[tuple[str, str]], FileStats]:
+    """process_file plus its FileStats; module-level so --jobs workers can run it."""
+    stats = FileStats(str(path))
+    scores, words = process_file(path, stats)
+    return scores, words, stats
+
+
+def iter_file_records(path: Path, counts: Counter | None = None):
+    """
+    Stream one sheet, reading it once: yield ("score", score_dict) and ("word", (date, word)) records.
+    sniff_sheet reads the top of the sheet (buffering at most the two rows above the header and five
+    after it); the rest is read as it is processed. With counts (--stats), rows scanned and
+    iter_row_scores' cell counters are tallied.
+    """
+    with open_sheet_rows(path) as reader:
+        if counts is not None:
+            reader = _count_rows(reader, counts)
+        sheet, held = sniff_sheet(iter(reader), path)
+        _, first_date_col, dates, handicaps, layout = sheet
+        words_found = False
+        for row in chain(held, reader):
+            if not words_found and is_starting_words_row(row):
+                words_found = True
+                for word in extract_starting_words([row], 0, first_date_col, dates):
+                    yield ("word", word)
+            for score in iter_row_scores(row, layout, first_date_col, dates, handicaps, counts):
+                yield ("score", score)
+
+
+def _count_rows(reader, counts: Counter):
+    for row in reader:
+        counts["rows_scanned"] += 1
+        yield row
+
+
+def write_ndjson(out, paths: list[Path], deduper: StreamingDeduplicator, stats: RunStats | None = None) -> None:
+    """
+    Stream every file's records to out as NDJSON, one object per line:
+      {"type": "score", "date", "game_slug", "player", "raw_score", "_source"}
+      {"type": "starting_word", "date", "word"}
+    Scores are never accumulated; deduper decides which can be written at once and holds the rest.
+    """
+    seen_dates_words: set[tuple[str, str]] = set()
+    for path in paths:
+        file_stats = None
+        if stats is not None:
+            file_stats = FileStats(str(path))
+            stats.files.append(file_stats)
+        counts = file_stats.counts if file_stats is not None else None
+        source = str(path)
+        with stage(file_stats, "extract"):
+            for kind, rec in iter_file_records(path, counts):
+                if kind == "word":
+                    if rec in seen_dates_words:
+                        continue
+                    seen_dates_words.add(rec)
+                    d, w = rec
+                    out.write(json.dumps({"type": "starting_word", "date": d, "word": w}) + "\n")
+                    continue
+                if counts is not None:
+                    counts["scores"] += 1
+                rec["_source"] = source
+                if deduper.add(rec):
+                    out.write(json.dumps({"type": "score", **rec}) + "\n")
+    with stage(stats, "dedupe"):
+        for rec in deduper.finish():
+            out.write(json.dumps({"type": "score", **rec}) + "\n")
+        deduper.report.finish(deduper.policy)
+    if stats is not None:
+        stats.counts["duplicates_dropped"] += deduper.report.dropped
+
+
+def read_sheet_handicaps(path: Path) -> tuple[list[str], list[float | None]] | None:
+    """(dates, sheet handicap per date) from the rows down to the header; the data rows are not read."""
+    rows = []
+    with open_sheet_rows(path) as reader:
+        for row in reader:
+            rows.append(row)
+            if "puz" in row and "player" in row and "cat." in row:
+                break
+    meta = find_header_and_handicap(rows)
+    if meta is None:
+        return None
+    header_row_idx, handicap_row_idx, first_date_col = meta
+    dates = extract_dates(rows[header_row_idx], first_date_col)
+    return dates, extract_handicaps_per_date(rows, handicap_row_idx, first_date_col, len(dates))
+
+
+def report_handicap_disagreements(paths: list[Path], schedule: HandicapSchedule) -> None:
+    """Warn about dates where the schedule's multiplier differs from the sheet's handicap row."""
+    found = []
+    for path in paths:
+        sheet = read_sheet_handicaps(path)
+        if sheet is not None:
+            found.extend((path, *d) for d in schedule.disagreements(SHEET_HANDICAP_GAME, *sheet))
+    if not found:
+        return
+
+    def pct(m: float | None) -> str:
+        return f"{m:.0%}" if m is not None else "none"
+
+    print(
+        f"Warning: handicap schedule disagrees with the sheet's handicap row on {len(found)} player-date(s) "
+        "(the schedule is used):\n"
+        + "\n".join(f"  {path.name} {d} {player}: sheet {pct(h)}, schedule {pct(m)}" for path, d, player, h, m in found[:20])
+        + ("\n  ... and more" if len(found) > 20 else ""),
+        file=sys.stderr,
+    )
+
+
+def parse_rules_version() -> str:
+    """
+    Hash of everything that decides what process_file returns for a given CSV: the player and
+    game tables, the handicap schedule, and the source of the parsing functions and GAME_TRANSFORMS.
+    Any edit invalidates cached parses.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps({
+        "game_slugs": GAME_SLUGS,
+        "players": sorted(PLAYERS),
+        "handicap_schedule": HANDICAP_SCHEDULE.digest(),
+        "sheet_handicap_game": SHEET_HANDICAP_GAME,
+    }, sort_keys=True).encode())
+    for fn in (
+        parse_handicap,
+        parse_date,
+        _parse_date_text,
+        open_sheet_rows,
+        load_csv_rows,
+        iter_xlsx_rows,
+        pick_sheet,
+        load_cell_kinds,
+        format_number,
+        extract_handicaps_per_date,
+        extract_dates,
+        extract_starting_words,
+        parse_score_cell,
+        detect_data_layout,
+        sniff_sheet,
+        is_starting_words_row,
+        iter_row_scores,
+        process_file,
+        *GAME_TRANSFORMS.values(),
+    ):
+        h.update(inspect.getsource(fn).encode())
+    return h.hexdigest()
+
+
+def _process_file_no_stats(path: Path) -> tuple[list[dict], list[tuple[str, str]], None]:
+    return (*process_file(path), None)
+
+
+def _process_file_bytes(with_stats: bool, path: Path, data: bytes):
+    """--pipeline worker: process_file on the bytes the read stage already has, plus FileStats with stats."""
+    stats = FileStats(str(path)) if with_stats else None
+    return (*process_file(path, stats, data), stats)
+
+
+def parse_files(
+    paths: list[Path],
+    jobs: int = 1,
+    cache: ParseCache | None = None,
+    stats: RunStats | None = None,
+):
+    """
+    Yield (path, scores, starting_words) for each path, in the order given.
+    With jobs > 1, files are parsed in a process pool; results are still yielded in input
+    order, so merging them (first occurrence wins) gives the same output as a serial run.
+    With a cache, unchanged files are loaded from it and only the rest are parsed.
+    With stats, each file's FileStats is appended to stats.files in the same order.
+    """
+    for path, scores, words, file_stats in _parse_files(paths, jobs, cache, stats is not None):
+        if stats is not None:
+            stats.files.append(file_stats)
+        yield path, scores, words
+
+
+def _parse_files(paths: list[Path], jobs: int, cache: ParseCache | None, with_stats: bool):
+    if cache is not None:
+        cached = []
+        for path in paths:
+            file_stats = FileStats(str(path)) if with_stats else None
+            with stage(file_stats, "load"):
+                hit = cache.load(path)
+            if file_stats is not None and hit is not None:
+                file_stats.cached = True
+                file_stats.counts["scores"] = len(hit[0])
+            cached.append((hit, file_stats))
+        parsed = _parse_files([p for p, (hit, _) in zip(paths, cached) if hit is None], jobs, None, with_stats)
+        for path, (hit, file_stats) in zip(paths, cached):
+            if hit is not None:
+                yield (path, *hit, file_stats)
+                continue
+            _, scores, words, file_stats = next(parsed)
+            cache.store(path, scores, words)
+            yield path, scores, words, file_stats
+        return
+    parse = _process_file_with_stats if with_stats else _process_file_no_stats
+    if jobs <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield (path, *parse(path))
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(paths)), initializer=set_handicap_schedule, initargs=(HANDICAP_SCHEDULE,)
+    ) as pool:
+        for path, result in zip(paths, pool.map(parse, paths)):
+            yield (path, *result)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parse league CSV and output backfill data")
+    ap.add_argument("files", nargs="*", type=Path, help="CSV export(s) or .xlsx workbook(s)")
+    ap.add_argument("--sql", action="store_true", help="Emit SQL INSERTs (requires --ids)")
+    ap.add_argument(
+        "--ids",
+        type=Path,
+        help="JSON file: user_ids, game_ids (by slug), league_id, optional league_games (slug -> start_date/end_date)",
+    )
+    ap.add_argument("-o", "--output", type=Path, help="Write output to file (default: stdout)")
+    ap.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Parse CSV files in N worker processes (default: 1). Output is identical to a serial run.",
+    )
+    ap.add_argument(
+        "--pipeline",
+        action="store_true",
+        help=(
+            "Overlap file reads, parsing (in --jobs worker processes) and output writes as asyncio stages joined by "
+            "bounded queues, and report each stage's throughput. Output is identical to a serial run."
+        ),
+    )
+    ap.add_argument(
+        "--pipeline-depth",
+        type=int,
+        default=DEFAULT_DEPTH,
+        help=f"--pipeline: files read or parsed ahead of the merge (default: {DEFAULT_DEPTH})",
+    )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every CSV without reading or writing the parse cache.",
+    )
+    ap.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Reparse every CSV and overwrite its parse cache entry.",
+    )
+    ap.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Parse cache directory (default: {DEFAULT_CACHE_DIR.name}/ next to this script)",
+    )
+    ap.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Evict least recently used parse cache entries above this size (default: 64)",
+    )
+    ap.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print per-file and total stage timings and counters to stderr.",
+    )
+    ap.add_argument("--stats-json", type=Path, help="Write per-file and total stats as JSON to this path.")
+    ap.add_argument(
+        "--profile",
+        type=Path,
+        help="cProfile the CSV parsing (in-process, without --jobs or the parse cache) and save pstats data here.",
+    )
+    ap.add_argument(
+        "--allow-placeholders",
+        action="store_true",
+        help="Emit SQL even when ids look like placeholders (YOUR_*, REPLACE_*). Use for find-replace workflow.",
+    )
+    ap.add_argument(
+        "--deduplicate",
+        action="store_true",
+        help="Same as --on-conflict first (kept for existing scripts).",
+    )
+    ap.add_argument(
+        "--on-conflict",
+        choices=ON_CONFLICT_POLICIES,
+        help=(
+            "Same (player, game, date) more than once: error (default), keep the first or last occurrence, "
+            "or keep the max (best) / min (worst) score by the game's score_type"
+        ),
+    )
+    ap.add_argument(
+        "--conflicts-report",
+        type=Path,
+        default=DEFAULT_REPORT,
+        help=f"CSV listing every occurrence of each duplicate key, written only if there are any (default: {DEFAULT_REPORT})",
+    )
+    ap.add_argument(
+        "--dedupe-memory-mb",
+        type=float,
+        default=DEFAULT_MEMORY_MB,
+        help=f"--format ndjson: memory for the duplicate index before spilling to disk for an external sort-merge (default: {DEFAULT_MEMORY_MB})",
+    )
+    ap.add_argument(
+        "--format",
+        choices=("json", "ndjson", "columnar", *SQL_FORMATS),
+        help=(
+            "Output format: json (default); ndjson (one record per line, streamed file by file in bounded memory); "
+            "columnar (a directory of .npy columns, -o DIR); "
+            "or SQL as insert (default with --sql), multirow or copy. SQL formats imply --sql."
+        ),
+    )
+    ap.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per statement for --format multirow, or per committed batch for --load (default: {DEFAULT_BATCH_SIZE})",
+    )
+    ap.add_argument(
+        "--load",
+        metavar="DSN",
+        help="Upsert straight into the database (postgresql://... or sqlite:///file.db) instead of writing output. Needs --ids.",
+    )
+    ap.add_argument(
+        "--upsert",
+        choices=CONFLICT_POLICIES,
+        default="update",
+        help="--load: on an existing (user_id, game_id, date) score or (league_id, date) word, update it or leave it (default: update)",
+    )
+    ap.add_argument("--pool-size", type=int, default=4, help="--load: database connections in the pool (default: 4)")
+    ap.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="--load: file recording committed batches so an interrupted load resumes (default: .load-checkpoint-<dsn hash>.json here)",
+    )
+    ap.add_argument(
+        "--schema",
+        type=Path,
+        default=DEFAULT_SCHEMA,
+        help="--load with sqlite: schema to create tables from (default: ../supabase/schema.sql)",
+    )
+    ap.add_argument(
+        "--diff",
+        metavar="SNAPSHOT",
+        type=Path,
+        action="append",
+        help=(
+            "Delta backfill: CSV/JSON export of the scores and/or league_starting_words rows already in the DB "
+            "(repeatable). Emits SQL for new and changed rows only. Implies --sql."
+        ),
+    )
+    ap.add_argument(
+        "--diff-delete",
+        action="store_true",
+        help="--diff: also DELETE snapshot rows missing from the CSVs (only on dates and player/game pairs the CSVs cover)",
+    )
+    ap.add_argument(
+        "--handicaps",
+        type=Path,
+        action="append",
+        help=(
+            "Export of public.league_handicap (CSV or JSON, repeatable) to reverse handicaps by; "
+            "default: ids.json \"handicaps\", else the built-in crossword schedule with the sheet's percentages"
+        ),
+    )
+    ap.add_argument(
+        "--watch",
+        metavar="DIR",
+        type=Path,
+        help=(
+            "Keep polling DIR for new or changed CSVs and append only their new or changed scores to -o "
+            "(ndjson by default, or a SQL format) or to --load. Stop with Ctrl-C."
+        ),
+    )
+    ap.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=f"--watch: seconds between polls (default: {DEFAULT_INTERVAL:g})",
+    )
+    ap.add_argument(
+        "--watch-state",
+        type=Path,
+        help="--watch: file recording what was already sent (default: .watch-state-<hash>.json here)",
+    )
+    ap.add_argument("--watch-once", action="store_true", help="--watch: run a single cycle and exit (for cron)")
+    ap.add_argument(
+        "--split-by",
+        choices=SPLIT_PERIODS,
+        help=(
+            "Write SQL as one file per month or year in -o DIR (plus prologue.sql and manifest.json), "
+            "so the periods can be loaded by parallel sessions. Implies --sql."
+        ),
+    )
+    ap.add_argument(
+        "--create-partitions",
+        action="store_true",
+        help="--split-by: create each period's scores partition in the prologue (after supabase/migration_partition_scores.sql)",
+    )
+    args = ap.parse_args()
+    if args.watch and args.files:
+        ap.error("--watch reads its directory; do not also pass CSV files")
+    if not args.watch and not args.files:
+        ap.error("the following arguments are required: files")
+    fmt = args.format or ("insert" if args.sql or args.diff or args.split_by else "ndjson" if args.watch else "json")
+    if args.diff and (args.load or fmt not in SQL_FORMATS):
+        raise SystemExit("--diff writes SQL: use it with --format insert/multirow/copy, not --load or json/ndjson")
+    if fmt == "columnar" and not args.load and not args.output:
+        raise SystemExit("--format columnar writes a directory: pass it with -o")
+    if args.watch and (args.diff or fmt in ("json", "columnar")):
+        raise SystemExit("--watch appends to its output: use --format ndjson or a SQL format (or --load), without --diff")
+    if args.split_by and (args.diff or args.load or args.watch or fmt not in SQL_FORMATS or not args.output):
+        raise SystemExit("--split-by writes a directory of SQL files: use it with -o DIR and an SQL format, without --diff/--load/--watch")
+    if args.create_partitions and not args.split_by:
+        raise SystemExit("--create-partitions goes with --split-by")
+    if args.pipeline and (args.watch or args.profile or fmt == "ndjson"):
+        raise SystemExit("--pipeline does not apply to --watch, --profile or --format ndjson (which already streams)")
+
+    all_scores = ScoreTable()
+    all_starting_words: list[tuple[str, str]] = []
+    seen_dates_words: set[tuple[str, str]] = set()
+
+    paths = []
+    for path in args.files:
+        if not path.exists():
+            print(f"Skip (not found): {path}", file=sys.stderr)
+            continue
+        paths.append(path)
+
+    ids = load_ids(args.ids)
+    policy = args.on_conflict or ("first" if args.deduplicate else "error")
+    score_types = {**SCORE_TYPES, **(ids.get("score_types") or {})}
+    schedule = None
+    if args.handicaps:
+        schedule = HandicapSchedule.from_league_handicap(load_handicaps(args.handicaps), ids)
+    elif ids.get("handicaps"):
+        schedule = HandicapSchedule(ids["handicaps"])
+    if schedule is not None:
+        set_handicap_schedule(schedule)
+        report_handicap_disagreements(paths, schedule)
+
+    if args.watch:
+        watch(args, fmt, ids, policy, score_types)
+        return
+
+    stats = RunStats() if args.stats or args.stats_json else None
+    if fmt == "ndjson":
+        with open_output(args.output) as out:
+            deduper = StreamingDeduplicator(
+                policy, score_types, ConflictReport(args.conflicts_report), args.dedupe_memory_mb
+            )
+            write_ndjson(out, paths, deduper, stats)
+        report_stats(stats, args.stats, args.stats_json)
+        return
+
+    cache = None
+    if not args.no_cache and not args.profile:
+        cache = ParseCache(
+            parse_rules_version(),
+            cache_dir=args.cache_dir,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+            rebuild=args.rebuild_cache,
+        )
+
+    profiler = None
+    if args.profile:
+        # Profile the parse in this process (workers would not be profiled)
+        profiler = cProfile.Profile()
+        args.jobs = 1
+        profiler.enable()
+
+    def merge(path: Path, scores: list[dict], words: list[tuple[str, str]]) -> None:
+        all_scores.extend(scores, source=str(path))
+        for d, w in words:
+            key = (d, w)
+            if key not in seen_dates_words:
+                seen_dates_words.add(key)
+                all_starting_words.append((d, w))
+
+    throughput = None
+    if args.pipeline:
+        throughput = Throughput()
+
+        def merge_parsed(path, scores, words, file_stats, cached):
+            if stats is not None:
+                if cached:
+                    file_stats = FileStats(str(path))
+                    file_stats.cached = True
+                    file_stats.counts["scores"] = len(scores)
+                stats.files.append(file_stats)
+            merge(path, scores, words)
+
+        parse_pipelined(
+            paths,
+            partial(_process_file_bytes, stats is not None),
+            merge_parsed,
+            args.jobs,
+            cache,
+            args.pipeline_depth,
+            initializer=set_handicap_schedule,
+            initargs=(HANDICAP_SCHEDULE,),
+            throughput=throughput,
+        )
+    else:
+        for path, scores, words in parse_files(paths, args.jobs, cache, stats):
+            merge(path, scores, words)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        print(f"Wrote parse profile to {args.profile} (view with: python3 -m pstats {args.profile})", file=sys.stderr)
+    if cache is not None and cache.hits:
+        print(f"Parse cache: {cache.hits} file(s) unchanged, {cache.misses} parsed.", file=sys.stderr)
+
+    # Duplicate (player, game, date) — ScoreTable indexed the keys as scores were added
+    with stage(stats, "dedupe"):
+        report = ConflictReport(args.conflicts_report)
+        all_scores = resolve_table(all_scores, policy, score_types, report)
+    if stats is not None:
+        stats.counts["duplicates_dropped"] += report.dropped
+
+    if args.load:
+        with stage(stats, "emit"):
+            skipped = load_into_db(args, all_scores, all_starting_words)
+        if stats is not None:
+            stats.counts["skipped_placeholder_ids"] += skipped
+        report_stats(stats, args.stats, args.stats_json, throughput)
+        return
+
+    if fmt == "columnar":
+        with stage(stats, "emit"):
+            write_columnar(args.output, all_scores, all_starting_words, parse_rules_version())
+        print(f"Wrote {len(all_scores)} score row(s) as .npy columns to {args.output}/.", file=sys.stderr)
+        report_stats(stats, args.stats, args.stats_json, throughput)
+        return
+
+    if args.split_by:
+        with stage(stats, "emit"):
+            writer = SplitWriter(args.split_by, fmt, args.batch_size)
+            skipped = write_sql(writer, all_scores, all_starting_words, ids, args.allow_placeholders)
+            manifest = writer.finish(args.output, args.create_partitions)
+        if stats is not None:
+            stats.counts["skipped_placeholder_ids"] += skipped
+        print(
+            f"Wrote {len(manifest['periods'])} {args.split_by} file(s) and prologue.sql "
+            f"({writer.rows['public.scores']} score row(s), format {fmt}) to {args.output}/; load order in manifest.json.",
+            file=sys.stderr,
+        )
+        report_stats(stats, args.stats, args.stats_json, throughput)
+        return
+
+    with stage(stats, "emit"), open_output(args.output) as out:
+        if args.pipeline:
+            write_pipelined(
+                out, lambda sink: write_output(sink, args, fmt, ids, all_scores, all_starting_words, stats), throughput
+            )
+        else:
+            write_output(out, args, fmt, ids, all_scores, all_starting_words, stats)
+    report_stats(stats, args.stats, args.stats_json, throughput)
+
+
+def write_output(
+    out, args, fmt: str, ids: dict, scores: ScoreTable, starting_words: list[tuple[str, str]], stats: RunStats | None
+) -> None:
+    """The JSON or SQL text of a run (json/insert/multirow/copy, with --diff), written to out."""
+    if fmt in SQL_FORMATS:
+        writer = SqlWriter(out, fmt, args.batch_size)
+        if args.diff:
+            writer = DiffWriter(writer, Snapshot.load(args.diff), delete=args.diff_delete)
+        skipped = write_sql(writer, scores, starting_words, ids, args.allow_placeholders)
+        if args.diff:
+            print(
+                f"Diff: {writer.inserts} insert(s), {writer.updates} update(s), {writer.deletes} delete(s), "
+                f"{writer.unchanged} unchanged.",
+                file=sys.stderr,
+            )
+        if stats is not None:
+            stats.counts["skipped_placeholder_ids"] += skipped
+        if not writer.statements and not args.diff:
+            print(
+                "No INSERTs generated — backfill.sql will be empty.\n"
+                "The script skips rows when user_id/game_id/league_id look like placeholders (YOUR_* or REPLACE_*).\n"
+                "Put your real UUIDs in the JSON file passed to --ids (e.g. ids.json) and run again.",
+                file=sys.stderr,
+            )
+        else:
+            dest = args.output or "stdout"
+            print(
+                f"Wrote {writer.statements} statement(s) ({writer.rows['public.scores']} score row(s), format {fmt}) to {dest}.",
+                file=sys.stderr,
+            )
+            if args.output:
+                print(
+                    "If the SQL fails with 'duplicate key ... scores_user_game_date_unique', the DB already has those rows (e.g. from a previous run).",
+                    file=sys.stderr,
+                )
+    else:
+        write_json(out, scores, starting_words)
+    if not args.output:
+        out.write("\n")
+
+
+def load_ids(path: Path | None) -> dict:
+    if path and path.exists():
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def load_into_db(args, scores: ScoreTable, starting_words: list[tuple[str, str]]) -> int:
+    """--load: upsert straight into the database. Returns scores skipped for placeholder ids."""
+    checkpoint = args.checkpoint
+    if checkpoint is None:
+        dsn_hash = hashlib.sha256(args.load.encode()).hexdigest()[:12]
+        checkpoint = Path(__file__).resolve().parent / f".load-checkpoint-{dsn_hash}.json"
+    loader = DbLoader(
+        args.load,
+        batch_size=args.batch_size,
+        conflict=args.upsert,
+        pool_size=args.pool_size,
+        checkpoint=checkpoint,
+        schema=args.schema,
+    )
+    completed = False
+    try:
+        # Placeholder ids are never sent to a database, whatever --allow-placeholders says.
+        skipped = write_sql(loader, scores, starting_words, load_ids(args.ids))
+        completed = True
+    finally:
+        loader.close(completed)
+        if not completed:
+            print(
+                f"Load interrupted; committed batches are recorded in {checkpoint}. Rerun the same command to resume.",
+                file=sys.stderr,
+            )
+    resumed = f", {loader.resumed_batches} batch(es) already loaded" if loader.resumed_batches else ""
+    print(
+        f"Loaded {loader.rows.get('public.scores', 0)} score row(s) in {loader.statements} batch(es){resumed}.",
+        file=sys.stderr,
+    )
+    return skipped
+
+
+def watch(args, fmt: str, ids: dict, policy: str, score_types: dict) -> None:
+    """--watch: append each cycle's new or changed rows to -o (or --load) until interrupted."""
+    if not args.watch.is_dir():
+        raise SystemExit(f"Not a directory: {args.watch}")
+    state = args.watch_state
+    if state is None:
+        sink_id = f"{args.watch.resolve()}|{args.load or (args.output and args.output.resolve())}|{fmt}"
+        state = Path(__file__).resolve().parent / f".watch-state-{hashlib.sha256(sink_id.encode()).hexdigest()[:12]}.json"
+
+    def resolve(table: ScoreTable) -> ScoreTable:
+        return resolve_table(table, policy, score_types, ConflictReport(args.conflicts_report))
+
+    def sink(delta: Delta, first_cycle: bool) -> None:
+        if args.load:
+            load_into_db(args, delta.scores, delta.words)
+            return
+        out = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+        try:
+            if fmt == "ndjson":
+                for rec in delta.scores:
+                    out.write(json.dumps({"type": "score", **rec}) + "\n")
+                for d, w in delta.words:
+                    out.write(json.dumps({"type": "starting_word", "date": d, "word": w}) + "\n")
+            else:
+                writer = UpsertWriter(SqlWriter(out, fmt, args.batch_size), include_league_game=first_cycle)
+                write_sql(writer, delta.scores, delta.words, ids, args.allow_placeholders)
+                if writer.statements:
+                    out.write("\n")
+            out.flush()
+        finally:
+            if args.output:
+                out.close()
+
+    watcher = DirectoryWatcher(args.watch, state, parse_rules_version(), process_file, resolve)
+    print(f"Watching {args.watch} (state in {state}).", file=sys.stderr)
+    watcher.run(sink, args.watch_interval, once=args.watch_once)
+
+
+def report_stats(
+    stats: RunStats | None, to_stderr: bool, json_path: Path | None, throughput: Throughput | None = None
+) -> None:
+    if throughput is not None:
+        throughput.report(sys.stderr)
+    if stats is None:
+        return
+    if to_stderr:
+        stats.report(sys.stderr)
+    if json_path:
+        stats.write_json(json_path)
+        print(f"Wrote stats to {json_path}", file=sys.stderr)
+
+
+@contextmanager
+def open_output(path: Path | None):
+    """
+    Yield a text stream for output: stdout, or a temp file beside path that replaces it on success.
+    A run that fails part-way leaves any previous output file untouched.
+    """
+    if path is None:
+        yield sys.stdout
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            yield f
+        tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_json(out, scores: Iterable[dict], starting_words: list[tuple[str, str]]) -> None:
+    """Stream the same text as json.dumps({"scores": ..., "starting_words": ...}, indent=2)."""
+    def write_list(items) -> None:
+        first = True
+        for item in items:
+            out.write("\n    " if first else ",\n    ")
+            out.write(json.dumps(item, indent=2).replace("\n", "\n    "))
+            first = False
+        out.write("[]" if first else "\n  ]")
+
+    out.write('{\n  "scores": ')
+    out.write("[" if scores else "")
+    write_list(scores)
+    out.write(',\n  "starting_words": ')
+    out.write("[" if starting_words else "")
+    write_list({"date": d, "word": w} for d, w in starting_words)
+    out.write("\n}")
+
+
+def write_sql(
+    writer: SqlWriter | DiffWriter | DbLoader,
+    scores: ScoreTable,
+    starting_words: list[tuple[str, str]],
+    ids: dict,
+    allow_placeholders: bool = False,
+) -> int:
+    """
+    Emit league_game, scores, user_games and league_starting_words rows through writer
+    (a SqlWriter, wrapped in a DiffWriter for --diff, or a DbLoader for --load).
+    Returns how many scores were skipped for placeholder user/game ids.
+    """
+    user_ids = ids.get("user_ids") or {}
+    game_ids = ids.get("game_ids") or {}
+    league_id = ids.get("league_id") or "REPLACE_LEAGUE_ID"
+    league_games = ids.get("league_games") or {}
+
+    def _is_placeholder(val: str) -> bool:
+        if allow_placeholders:
+            return False
+        if not val:
+            return True
+        return "REPLACE_" in val or val.startswith("YOUR_")
+
+    # league_game: which games ran for which date range in this league (optional)
+    def league_game_rows():
+        for slug, range_spec in sorted(league_games.items()):
+            start_date = range_spec.get("start_date")
+            if not start_date:
+                continue
+            gid = game_ids.get(slug)
+            if not gid or gid == "REPLACE_GAME_ID":
+                continue
+            yield (league_id, gid, start_date, range_spec.get("end_date") or None)
+
+    writer.write_rows(
+        "public.league_game", ("leagueid", "gameid", "start_date", "end_date"), league_game_rows()
+    )
+
+    # scores is already deduplicated on (player, game, date), so generated (user_id, game_id, date)
+    # keys can only collide if two players or two games map to the same id.
+    for label, names, mapping, default in (
+        ("players", scores.players.values, user_ids, "REPLACE_USER_ID"),
+        ("games", scores.games.values, game_ids, "REPLACE_GAME_ID"),
+    ):
+        by_id: dict[str, list[str]] = {}
+        for name in names:
+            val = mapping.get(name, default)
+            if not _is_placeholder(val):
+                by_id.setdefault(val, []).append(name)
+        shared = {val: group for val, group in by_id.items() if len(group) > 1}
+        if shared:
+            raise SystemExit(
+                f"These {label} map to the same id, which would violate scores_user_game_date_unique:\n"
+                + "\n".join(f"  {val}: {', '.join(group)}" for val, group in sorted(shared.items()))
+            )
+
+    seen_ug: set[tuple[str, str]] = set()
+    skipped_scores = 0
+
+    def score_rows():
+        nonlocal skipped_scores
+        for date, game_slug, player, raw_score, _ in scores.rows():
+            uid = user_ids.get(player, "REPLACE_USER_ID")
+            gid = game_ids.get(game_slug, "REPLACE_GAME_ID")
+            if _is_placeholder(uid) or _is_placeholder(gid):
+                skipped_scores += 1
+                continue
+            seen_ug.add((uid, gid))
+            yield (uid, gid, date, raw_score)
+
+    writer.write_rows("public.scores", ("user_id", "game_id", "date", "score"), score_rows())
+    if skipped_scores:
+        print(
+            f"Warning: skipped {skipped_scores} score row(s) — no valid user_id/game_id mapping. Use --ids with a JSON file that has your real UUIDs.",
+            file=sys.stderr,
+        )
+    writer.write_rows(
+        "public.user_games",
+        ("user_id", "game_id"),
+        sorted(seen_ug),
+        on_conflict="(game_id, user_id) DO NOTHING",
+    )
+    if _is_placeholder(league_id):
+        if starting_words:
+            print(
+                "Warning: skipped league_starting_words — no valid league_id. Set league_id in your ids file.",
+                file=sys.stderr,
+            )
+    else:
+        writer.write_rows(
+            "public.league_starting_words",
+            ("league_id", "date", "word"),
+            ((league_id, date, word or "") for date, word in starting_words),
+        )
+    return skipped_scores
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for chat_ingest: a synthetic group-chat export of share messages and chatter,
+ingested with the precompiled dispatch table, versus a per-message chain that tries each game's
+patterns in turn (what server/routes/shareParser.js does per request).
+
+Usage (from backfill/):
+  python3 bench/bench_chat_ingest.py [--messages 300000] [--share-ratio 0.4] [--repeat 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chat_ingest import SHARE_PARSERS, iter_chat_scores, iter_messages  # noqa: E402
+
+PLAYERS = ["sal", "bob", "sary", "stolowd"]
+CHATTER = ["morning all", "ugh today's was rough", "lol", "who's doing the crossword?", "brb", "nice one!!"]
+SQUARES = "🟪🟦🟩🟨"
+
+
+def share(rng: random.Random, day: date) -> str:
+    wordle_n = (day - date(2021, 6, 19)).days
+    game = rng.randrange(8)
+    if game == 0:
+        g = rng.randint(1, 7)
+        rows = "\n".join("".join(rng.choice("⬛🟨🟩") for _ in range(5)) for _ in range(min(g, 6)))
+        return f"Wordle {wordle_n:,} {'X' if g == 7 else g}/6\n\n{rows}"
+    if game == 1:
+        rows = [c * 4 for c in SQUARES]
+        for _ in range(rng.randint(0, 4)):
+            rows.insert(rng.randrange(len(rows)), "".join(rng.choice(SQUARES) for _ in range(4)))
+        return "Connections\nPuzzle #" + str((day - date(2023, 6, 11)).days) + "\n" + "\n".join(rows)
+    if game == 2:
+        return f"#waffle{wordle_n - 200} {rng.choice('012345X')}/5 🔥\n\n🟩🟩🟩🟩🟩\n🟩⭐🟩⭐🟩"
+    if game == 3:
+        return f"I solved the {day:%A} {day.month}/{day.day}/{day.year} New York Times Daily Crossword in {rng.randint(4, 40)}:{rng.randint(0, 59):02d}!"
+    if game == 4:
+        return f"Pyramid Scheme\nSolved on Expert Mode in 0:{rng.randint(5, 59):02d}"
+    if game == 5:
+        return f"Quintumble #{wordle_n - 800}\n🎯 {rng.randint(60, 100)}"
+    if game == 6:
+        return f"Bracket City {day:%b %d}\nTotal Score: {rng.randint(40, 100)}.0"
+    return f"Spelling Bee {rng.choice(['Genius', 'Queen Bee', 'Amazing'])}"
+
+
+def write_chat(path: Path, messages: int, share_ratio: float, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    day = date(2023, 10, 1)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(messages):
+            if i and i % 40 == 0:
+                day += timedelta(days=1)
+            player = rng.choice(PLAYERS)
+            text = share(rng, day) if rng.random() < share_ratio else rng.choice(CHATTER)
+            f.write(f"{day.month}/{day.day}/{day:%y}, {rng.randint(1, 12)}:{rng.randint(0, 59):02d} PM - {player}: {text}\n")
+
+
+def chain_parse(path: Path) -> int:
+    """Baseline: split the same way, then try every game's header pattern in turn, compiling as it goes."""
+    found = 0
+    with open(path, encoding="utf-8") as f:
+        for _, _, _, text in iter_messages(f):
+            for _, pattern, _ in SHARE_PARSERS.values():
+                if re.compile(pattern, re.I).search(text):
+                    found += 1
+                    break
+    return found
+
+
+def best_of(repeat: int, fn) -> tuple[float, object]:
+    times = []
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return min(times), result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark chat export ingestion throughput")
+    ap.add_argument("--messages", type=int, default=300_000)
+    ap.add_argument("--share-ratio", type=float, default=0.4, help="Fraction of messages that are share texts")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "chat.txt"
+        write_chat(path, args.messages, args.share_ratio)
+        size = path.stat().st_size
+        print(f"{args.messages} messages ({size / 1e6:.1f} MB, {args.share_ratio:.0%} shares)")
+
+        def ingest():
+            counts = Counter()
+            n = sum(1 for _ in iter_chat_scores(path, counts=counts))
+            return n
+
+        elapsed, scores = best_of(args.repeat, ingest)
+        print(f"  dispatch table  {elapsed:6.2f}s  {args.messages / elapsed:10,.0f} msg/s  {scores} scores")
+        elapsed, found = best_of(args.repeat, lambda: chain_parse(path))
+        print(f"  regex chain     {elapsed:6.2f}s  {args.messages / elapsed:10,.0f} msg/s  {found} shares found (detection only)")
+
+
+if __name__ == "__main__":
+    main()
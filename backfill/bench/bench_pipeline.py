@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+End-to-end time of a backfill run, serial vs --pipeline, on a directory of league CSVs: the whole
+CLI (read, parse, dedupe, format, write to -o) without the parse cache, best and median of --repeat
+runs per output format. Checks that both modes write byte-identical files and prints the last
+pipelined run's per-stage throughput.
+
+Usage (from backfill/):
+  python3 bench/generate_sheets.py --out /tmp/sheets --players 20 --months 120
+  python3 bench/bench_pipeline.py /tmp/sheets [--formats json insert] [--jobs 2] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import backfill_league as bl  # noqa: E402
+from run_benchmarks import synthetic_ids  # noqa: E402
+
+
+def run_cli(argv: list[str]) -> tuple[float, str]:
+    """(seconds, stderr) of one in-process backfill_league.py run."""
+    sys.argv = ["backfill_league.py", *argv]
+    err = io.StringIO()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stderr(err):
+        bl.main()
+    return time.perf_counter() - t0, err.getvalue()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serial vs --pipeline end-to-end backfill time")
+    ap.add_argument("data_dir", type=Path, help="Directory of league CSVs (e.g. from generate_sheets.py)")
+    ap.add_argument("--formats", nargs="+", default=["json", "insert"], choices=("json", *bl.SQL_FORMATS))
+    ap.add_argument("--jobs", type=int, default=1, help="--jobs for both modes (default: 1)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    paths = sorted(args.data_dir.glob("*.csv"))
+    if not paths:
+        raise SystemExit(f"No CSV files in {args.data_dir}")
+    manifest_path = args.data_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    players = manifest.get("players") or sorted(bl.PLAYERS)
+    games = manifest.get("games") or sorted(bl.GAME_SLUGS)
+    # Synthetic sheets can have more players than the real league (workers inherit this by fork)
+    bl.PLAYERS.update(players)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ids_path = tmp / "ids.json"
+        ids_path.write_text(json.dumps(synthetic_ids(players, [bl.GAME_SLUGS.get(g) or g.replace(" ", "_") for g in games])))
+        common = [*map(str, paths), "--no-cache", "--jobs", str(args.jobs), "--ids", str(ids_path), "--on-conflict", "first"]
+        size = sum(p.stat().st_size for p in paths)
+        print(f"{len(paths)} file(s), {size / 1e6:.1f} MB, --jobs {args.jobs}, best/median of {args.repeat}")
+        print(f"  {'format':<9} {'serial s':>16} {'pipeline s':>16} {'speedup':>8}  output")
+        report = ""
+        for fmt in args.formats:
+            times = {}
+            for mode, extra in (("serial", []), ("pipeline", ["--pipeline"])):
+                out = tmp / f"{mode}.{fmt}"
+                runs = []
+                for _ in range(args.repeat):
+                    seconds, err = run_cli([*common, *extra, "--format", fmt, "-o", str(out)])
+                    runs.append(seconds)
+                times[mode] = (min(runs), statistics.median(runs))
+                if mode == "pipeline":
+                    report = err
+            same = (tmp / f"serial.{fmt}").read_bytes() == (tmp / f"pipeline.{fmt}").read_bytes()
+            (s_best, s_median), (p_best, p_median) = times["serial"], times["pipeline"]
+            print(
+                f"  {fmt:<9} {s_best:7.2f} / {s_median:6.2f} {p_best:7.2f} / {p_median:6.2f} {s_best / p_best:7.2f}x  "
+                f"{(tmp / f'pipeline.{fmt}').stat().st_size / 1e6:.1f} MB, {'identical' if same else 'DIFFERENT'}"
+            )
+            if not same:
+                raise SystemExit(f"--pipeline output differs from the serial run for --format {fmt}")
+        stage_lines = [line for line in report.splitlines() if line.startswith(("Pipeline:", "  "))]
+        print("Last pipelined run:\n" + "\n".join(stage_lines))
+
+
+if __name__ == "__main__":
+    main()
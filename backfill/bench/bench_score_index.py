@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Query latency benchmark for ScoreIndex on a synthetic history --scale times the size of data/
+(about 25k scores, so 2.5M rows at the default 100), against one linear scan of the same table.
+
+Usage (from backfill/):
+  python3 bench/bench_score_index.py [--scale 100] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backfill_league import GAME_SLUGS, PLAYERS  # noqa: E402
+from score_index import ScoreIndex  # noqa: E402
+from score_table import ScoreTable  # noqa: E402
+
+CURRENT_SCORES = 25_276  # parsed scores in data/*.csv
+
+
+def synthetic_table(rows: int, players: int = 20, seed: int = 0) -> ScoreTable:
+    """About rows scores: every player plays each game on 85% of days, one source file per month."""
+    rng = random.Random(seed)
+    names = sorted(PLAYERS) + [f"player{i:02d}" for i in range(players - len(PLAYERS))]
+    games = sorted(set(GAME_SLUGS.values()))
+    table = ScoreTable()
+    day = date(1990, 1, 1)
+    while len(table) < rows:
+        d = day.isoformat()
+        source = f"data/geniusness {day:%m%y}.xlsx - current.csv"
+        for game in games:
+            for player in names:
+                if rng.random() < 0.85:
+                    score = rng.randint(150, 1800) if game in ("crossword", "pyramid") else rng.randint(0, 6)
+                    table.append(d, game, player, score, source)
+        day += timedelta(days=1)
+    return table
+
+
+def timed(repeat: int, fn) -> tuple[float, float, int]:
+    """(best ms, median ms, result size) of repeat calls of fn, which returns a list."""
+    times = []
+    n = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        n = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times), statistics.median(times), n
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark ScoreIndex queries on a large synthetic history")
+    ap.add_argument("--scale", type=float, default=100, help="Multiple of the current data's size (default: 100)")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    table = synthetic_table(int(CURRENT_SCORES * args.scale))
+    built = time.perf_counter()
+    index = ScoreIndex(table)
+    indexed = time.perf_counter()
+    print(
+        f"{len(table):,} rows, {index.dates[0]} .. {index.dates[-1]}: table {built - t0:.1f}s, "
+        f"index {indexed - built:.1f}s"
+    )
+
+    queries = {
+        "stolowd crossword, Sundays of 2024": lambda: len(list(index.query(
+            player="stolowd", game="crossword", start="2024-01-01", end="2024-12-31", weekdays={"Sunday"}
+        ))),
+        "sal wordle, March 2010": lambda: len(list(index.query(
+            player="sal", game="wordle", start="2010-03-01", end="2010-03-31"
+        ))),
+        "every pyramid score on one date": lambda: len(list(index.query(game="pyramid", start="2015-06-01", end="2015-06-01"))),
+        "pyramid ties, one month": lambda: len(list(index.ties("pyramid", start="2015-06-01", end="2015-06-30"))),
+        "2 players x 2 games, one week": lambda: len(list(index.query(
+            player=["sary", "bob"], game=["connections", "waffle"], start="2020-02-03", end="2020-02-09"
+        ))),
+        "count: sary's scores in 2015": lambda: index.count(player="sary", start="2015-01-01", end="2015-12-31"),
+    }
+    print(f"  {'query':40} {'best ms':>9} {'median ms':>10} {'rows':>7}")
+    for name, fn in queries.items():
+        best, median, n = timed(args.repeat, fn)
+        print(f"  {name:40} {best:9.3f} {median:10.3f} {n:7}")
+
+    def scan():
+        return sum(
+            1
+            for d, game, player, _, _ in table.rows()
+            if player == "stolowd" and game == "crossword" and "2024-01-01" <= d <= "2024-12-31"
+            and date.fromisoformat(d).weekday() == 6
+        )
+
+    best, _, n = timed(1, scan)
+    print(f"  {'linear scan (first query)':40} {best:9.1f} {'':10} {n:7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: list of score dicts (+ the by_key duplicate index main() used to build)
+versus ScoreTable, on a synthetic league history.
+
+Usage (from backfill/):
+  python3 bench/bench_score_table_memory.py [--years 10] [--players 20] [--games 10]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from score_table import ScoreTable  # noqa: E402
+
+
+def synthetic_scores(years: int, players: int, games: int, seed: int = 0):
+    """Yield score dicts shaped like main()'s all_scores: one monthly source file per month."""
+    rng = random.Random(seed)
+    player_names = [f"player{i:02d}" for i in range(players)]
+    game_slugs = [f"game-{i:02d}" for i in range(games)]
+    day = date(2016, 1, 1)
+    for _ in range(years * 365):
+        d = day.isoformat()
+        source = f"data/geniusness {day:%m%y}.xlsx - current.csv"
+        for slug in game_slugs:
+            for player in player_names:
+                # half the games are timed (float seconds after handicap reversal), half are counts
+                score = round(rng.uniform(20, 600) / 0.75, 4) if slug < "game-05" else rng.randint(0, 6)
+                yield {"date": d, "game_slug": slug, "player": player, "raw_score": score, "_source": source}
+        day += timedelta(days=1)
+
+
+def measure(build) -> tuple[int, float]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current, elapsed
+
+
+def build_dicts(args):
+    # Strings are built per score, as csv.reader and process_file produce them.
+    all_scores = list(synthetic_scores(args.years, args.players, args.games))
+    by_key = defaultdict(list)
+    for s in all_scores:
+        by_key[(s["player"], s["game_slug"], s["date"])].append(s)
+    return all_scores, by_key
+
+
+def build_table(args):
+    table = ScoreTable()
+    for s in synthetic_scores(args.years, args.players, args.games):
+        table.append(s["date"], s["game_slug"], s["player"], s["raw_score"], s["_source"])
+    return table
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare memory of list-of-dicts scores vs ScoreTable")
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--players", type=int, default=20)
+    ap.add_argument("--games", type=int, default=10)
+    args = ap.parse_args()
+
+    n = args.years * 365 * args.players * args.games
+    print(f"{n} scores ({args.years} years, {args.players} players, {args.games} games)")
+    for name, build in (("list of dicts + by_key", build_dicts), ("ScoreTable", build_table)):
+        mem, elapsed = measure(lambda: build(args))
+        print(f"  {name:<24} {mem / 1e6:8.1f} MB  {mem / n:6.1f} B/score  built in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
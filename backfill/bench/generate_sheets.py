@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Write synthetic monthly league sheets in the CSV shape process_file() reads.
+
+Both data-row layouts are supported: "raw" one column before the first date (scores start at
+first_date_col, like every export in data/), or "raw" at first_date_col (scores start one
+column later). A manifest.json lists the players and games used, so benchmarks can register
+synthetic player names.
+
+Usage (from backfill/):
+  python3 bench/generate_sheets.py --out /tmp/sheets --players 20 --games 10 --months 120
+"""
+
+import argparse
+import calendar
+import csv
+import json
+import random
+from datetime import date
+from pathlib import Path
+
+REAL_PLAYERS = ["sary", "sal", "bob", "stolowd"]
+REAL_GAMES = [
+    "crossword", "connections", "pyramid", "bee", "wordle",
+    "waffle", "keyword", "flashback", "quintumble", "bracketcity",
+]
+LAYOUTS = ("raw-before", "raw-at", "mixed")
+HANDICAP_BY_WEEKDAY = ["75%", "75%", "75%", "50%", "50%", "50%", "50%"]  # Mon..Sun
+WORDS = ["glace", "pearl", "gride", "rhyta", "gamut", "oxbow", "joule", "kloof", "level", "fondu"]
+
+
+def player_names(n: int) -> list[str]:
+    return (REAL_PLAYERS + [f"player{i:02d}" for i in range(len(REAL_PLAYERS) + 1, n + 1)])[:n]
+
+
+def game_names(n: int) -> list[str]:
+    return (REAL_GAMES + [f"game{i:02d}" for i in range(len(REAL_GAMES) + 1, n + 1)])[:n]
+
+
+def cell_score(rng: random.Random, game: str) -> str:
+    if rng.random() < 0.05:
+        return ""  # missed day
+    if game == "connections":
+        return str(rng.choice([5, 5, 5, 4, 3, 2, 0]))
+    if game == "wordle":
+        return str(rng.choice([-1, 0, 1, 2, 2, 3, 3, 4]))
+    if game in ("bee", "waffle", "flashback"):
+        return str(rng.randint(0, 5))
+    if game == "crossword":
+        return str(round(rng.uniform(150, 1500) * rng.choice([1, 0.75, 0.5]), 2))
+    return str(rng.randint(5, 400))
+
+
+def sheet_rows(
+    year: int, month: int, players: list[str], games: list[str], layout: str, handicap_rows: int, rng: random.Random
+) -> list[list[str]]:
+    ndays = calendar.monthrange(year, month)[1]
+    days = [date(year, month, d) for d in range(1, ndays + 1)]
+    first_date_col = 6
+    width = first_date_col + ndays + 8
+    # raw-at shifts data rows one column right of the header's date columns
+    shift = 1 if layout == "raw-at" else 0
+
+    def row(cells: dict[int, str]) -> list[str]:
+        out = [""] * width
+        for col, val in cells.items():
+            out[col] = val
+        return out
+
+    rows = [row({}), row({2: "5"})]
+    # legend block, like the real exports
+    for g in games[:10]:
+        rows.append(row({2: g, 3: "scoring notes"}))
+    rows.append(row({}))
+    for k in range(handicap_rows):
+        label = "xword handicap" if k == handicap_rows - 1 else "old handicap"
+        rows.append(row({4: label, **{first_date_col + i: HANDICAP_BY_WEEKDAY[d.weekday()] for i, d in enumerate(days)}}))
+    if not handicap_rows:
+        rows.append(row({4: "notes", **{first_date_col + i: HANDICAP_BY_WEEKDAY[d.weekday()] for i, d in enumerate(days)}}))
+    rows.append(row({}))
+    rows.append(row({3: "puz", 4: "player", 5: "cat.", **{first_date_col + i: f"{d.month}/{d.day}/{d.year}" for i, d in enumerate(days)}}))
+    rows.append(row({}))
+    for g in games:
+        for p in players:
+            cells = {3 + shift: g, 4 + shift: p, 5 + shift: "raw"}
+            for i in range(ndays):
+                cells[first_date_col + shift + i] = cell_score(rng, g)
+            rows.append(row(cells))
+            # handicapped display row the parser must skip
+            rows.append(row({3 + shift: g, 4 + shift: p, 5 + shift: "pts", first_date_col + shift: "1"}))
+        rows.append(row({}))
+    rows.append(row({5: "start w/:", **{first_date_col - 1 + i: rng.choice(WORDS) for i in range(1, ndays)}}))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate synthetic league CSVs for benchmarks")
+    ap.add_argument("--out", type=Path, required=True, help="Output directory")
+    ap.add_argument("--players", type=int, default=4)
+    ap.add_argument("--games", type=int, default=10)
+    ap.add_argument("--months", type=int, default=27)
+    ap.add_argument("--start", default="2023-10", help="First month, YYYY-MM (default: 2023-10)")
+    ap.add_argument("--layout", choices=LAYOUTS, default="mixed", help="Data row layout (mixed alternates by month)")
+    ap.add_argument("--handicap-rows", type=int, default=1, help="Handicap rows above the header (0 = use fallback row)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    players = player_names(args.players)
+    games = game_names(args.games)
+    args.out.mkdir(parents=True, exist_ok=True)
+    year, month = (int(x) for x in args.start.split("-"))
+    files = []
+    for m in range(args.months):
+        layout = args.layout if args.layout != "mixed" else LAYOUTS[m % 2]
+        path = args.out / f"geniusness {month:02d}{year % 100:02d}.xlsx - current.csv"
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(sheet_rows(year, month, players, games, layout, args.handicap_rows, rng))
+        files.append(path.name)
+        month += 1
+        if month > 12:
+            year, month = year + 1, 1
+    manifest = {"players": players, "games": games, "files": files, "args": {k: str(v) for k, v in vars(args).items()}}
+    (args.out / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    print(f"Wrote {len(files)} sheet(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Time each stage of the backfill pipeline on a directory of league CSVs and save the results as JSON.
+
+Stages (each timed over every file, best and median of --repeat runs):
+  load       csv.reader over each file (load_csv_rows)
+  layout     sniff_sheet: header and handicap rows, dates, per-date handicaps and data layout
+  extract    score extraction and conversion (iter_row_scores) and the "start w/:" row
+  dedupe     building the ScoreTable and finding duplicates
+  emit_json  write_json
+  emit_sql   write_sql, once per SQL format
+
+Usage (from backfill/):
+  python3 bench/generate_sheets.py --out /tmp/sheets --players 20 --months 120
+  python3 bench/run_benchmarks.py /tmp/sheets -o bench-$(git rev-parse --short HEAD).json
+  python3 bench/run_benchmarks.py /tmp/sheets --compare bench-OLD.json
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from itertools import chain
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import backfill_league as bl  # noqa: E402
+from score_table import ScoreTable  # noqa: E402
+from sql_output import SQL_FORMATS, SqlWriter  # noqa: E402
+
+
+class _NullWriter(io.TextIOBase):
+    """Text sink that counts characters instead of keeping them."""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, s: str) -> int:
+        self.chars += len(s)
+        return len(s)
+
+
+def synthetic_ids(players, games) -> dict:
+    return {
+        "user_ids": {p: f"00000000-0000-0000-0000-{i:012d}" for i, p in enumerate(sorted(players))},
+        "game_ids": {g: f"00000000-0000-0000-0001-{i:012d}" for i, g in enumerate(sorted(games))},
+        "league_id": "00000000-0000-0000-0002-000000000000",
+    }
+
+
+def run_once(paths: list[Path], ids: dict) -> tuple[dict[str, float], dict[str, int]]:
+    timings: dict[str, float] = {}
+    clock = time.perf_counter
+
+    t = clock()
+    sheets = [bl.load_csv_rows(p) for p in paths]
+    timings["load"] = clock() - t
+
+    t = clock()
+    sniffed = []
+    for path, rows in zip(paths, sheets):
+        remaining = iter(rows)
+        sheet, held = bl.sniff_sheet(remaining, path)
+        sniffed.append((sheet, held, remaining))
+    timings["layout"] = clock() - t
+
+    t = clock()
+    per_file = []
+    for sheet, held, remaining in sniffed:
+        _, first_date_col, dates, handicaps, layout = sheet
+        scores = []
+        words = None
+        for row in chain(held, remaining):
+            if words is None and bl.is_starting_words_row(row):
+                words = bl.extract_starting_words([row], 0, first_date_col, dates)
+            scores.extend(bl.iter_row_scores(row, layout, first_date_col, dates, handicaps))
+        per_file.append((scores, words or []))
+    timings["extract"] = clock() - t
+
+    t = clock()
+    table = ScoreTable()
+    for path, (scores, _) in zip(paths, per_file):
+        table.extend(scores, source=str(path))
+    duplicates = table.duplicates()
+    if duplicates:
+        table = table.deduplicated()
+    timings["dedupe"] = clock() - t
+
+    words = []
+    seen = set()
+    for _, file_words in per_file:
+        for w in file_words:
+            if w not in seen:
+                seen.add(w)
+                words.append(w)
+
+    t = clock()
+    bl.write_json(_NullWriter(), table, words)
+    timings["emit_json"] = clock() - t
+
+    for fmt in SQL_FORMATS:
+        t = clock()
+        bl.write_sql(SqlWriter(_NullWriter(), fmt), table, words, ids)
+        timings[f"emit_sql_{fmt}"] = clock() - t
+
+    counts = {"files": len(paths), "rows": sum(len(r) for r in sheets), "scores": len(table), "duplicates": len(duplicates)}
+    return timings, counts
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-stage timings for the backfill pipeline")
+    ap.add_argument("data_dir", type=Path, help="Directory of league CSVs (e.g. from generate_sheets.py)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("-o", "--output", type=Path, help="Write results JSON here")
+    ap.add_argument("--compare", type=Path, help="Earlier results JSON to compare against")
+    args = ap.parse_args()
+
+    paths = sorted(args.data_dir.glob("*.csv"))
+    if not paths:
+        raise SystemExit(f"No CSV files in {args.data_dir}")
+    manifest_path = args.data_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    players = manifest.get("players") or sorted(bl.PLAYERS)
+    games = manifest.get("games") or sorted(bl.GAME_SLUGS)
+    # Synthetic sheets can have more players than the real league
+    bl.PLAYERS.update(players)
+    ids = synthetic_ids(players, [bl.GAME_SLUGS.get(g) or g.replace(" ", "_") for g in games])
+
+    runs = []
+    counts = {}
+    for _ in range(args.repeat):
+        timings, counts = run_once(paths, ids)
+        runs.append(timings)
+    stages = {
+        name: {"best": min(r[name] for r in runs), "median": statistics.median(r[name] for r in runs)}
+        for name in runs[0]
+    }
+    result = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "data_dir": str(args.data_dir),
+        "repeat": args.repeat,
+        "counts": counts,
+        "stages": stages,
+    }
+
+    previous = json.loads(args.compare.read_text(encoding="utf-8"))["stages"] if args.compare else {}
+    print(f"{counts['files']} file(s), {counts['rows']} rows, {counts['scores']} scores")
+    for name, s in stages.items():
+        line = f"  {name:<18} best {s['best'] * 1000:9.2f} ms   median {s['median'] * 1000:9.2f} ms"
+        if name in previous:
+            line += f"   ({s['best'] / previous[name]['best']:.2f}x previous best)"
+        print(line)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Bulk-ingest pasted share messages (Wordle, Connections, Waffle, ...) from a group-chat export.
+
+The export is streamed line by line and split into messages at each "date, time - sender: text"
+header (WhatsApp's Android "12/31/23, 9:41 PM - sal: ..." and iOS "[12/31/23, 9:41:05 PM] sal: ..."
+forms); continuation lines belong to the message above. The export is read in large chunks and each
+chunk is scanned once for the literal that starts every game's share (see SHARE_PARSERS, keyed
+like GAME_SLUGS). Only a hit does any Python work: the dispatch table maps it to the game's
+precompiled header pattern and extractor, and its message is cut out around it. A message
+holding several pasted shares is split at each header. Chatter costs nothing beyond the scan.
+
+Extractors return the value as the league sheet would record it (e.g. Wordle as remaining slots,
+-1 for a fail). It then goes through GAME_TRANSFORMS exactly as process_file's values do, so
+records come out in the backfill format and units. Handicaps are not reversed: a share is the
+player's own, unhandicapped result. Wordle and Connections are dated by puzzle number, the
+NYT Crossword by the date in its share line, and everything else by the message date.
+
+Usage:
+  python3 chat_ingest.py chat.txt -o chat-scores.ndjson
+  python3 chat_ingest.py chat.txt --alias "Sarah L=sary" --on-conflict first --format json -o chat.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from datetime import date as Date, datetime, timedelta
+from pathlib import Path
+
+from backfill_league import GAME_SLUGS, GAME_TRANSFORMS, PLAYERS, SCORE_TYPES, load_ids, open_output, write_json
+from dedupe import DEFAULT_REPORT, ON_CONFLICT_POLICIES, ConflictReport, StreamingDeduplicator
+
+WORDLE_EPOCH = Date(2021, 6, 19)  # Wordle 0
+CONNECTIONS_EPOCH = Date(2023, 6, 11)  # Connections puzzle #1 was 2023-06-12
+
+_HEADER = (
+    r"^\u200e?\[?(?P<date>\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}),? "
+    r"\d{1,2}:\d{2}(?::\d{2})?(?:\s?[AaPp]\.?[Mm]\.?)?\]?(?: -)? "
+    r"(?P<sender>[^:\n]{1,64}?): (?P<text>.*)"
+)
+MESSAGE_HEADER = re.compile(_HEADER)
+# Over a whole chunk: every header line (to find messages) and a group-free copy (to count them)
+HEADER_LINE = re.compile(_HEADER, re.M)
+HEADER_COUNT = re.compile(re.sub(r"\(\?P<\w+>", "(?:", _HEADER), re.M)
+CHUNK_SIZE = 1 << 22
+CONNECTIONS_ROW = re.compile(r"^\s*([🟪🟦🟩🟨]{4})\s*$", re.M)
+CLOCK = re.compile(r"\b(?:(\d{1,2}):)?(\d{1,2}):(\d{2})\b")
+
+
+def _clock_seconds(text: str, start: int, end: int) -> int | None:
+    m = CLOCK.search(text, start, end)
+    if not m:
+        return None
+    hours, minutes, seconds = m.groups()
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+
+
+def _puzzle_number(s: str) -> int:
+    return int(s.replace(",", "").replace(".", ""))
+
+
+# Extractors: fn(m, text, start, end) -> (sheet value, puzzle date or None), or None. m is the
+# game's header match; text[start:end] is the share.
+
+def _wordle(m, text, start, end):
+    n, guesses = m.group("n"), m.group("guesses")
+    value = -1 if guesses in "Xx" else 6 - int(guesses)
+    return value, (WORDLE_EPOCH + timedelta(days=_puzzle_number(n))).isoformat()
+
+
+def _connections(m, text, start, end):
+    rows = CONNECTIONS_ROW.findall(text, start, end)
+    if not rows:
+        return None
+    mistakes = sum(1 for row in rows if len(set(row)) > 1)
+    # Sheet: 5 = no mistakes ... 1 = four mistakes, 0 = fail
+    value = 0 if mistakes >= 4 else 5 - mistakes
+    n = m.group("n")
+    return value, (CONNECTIONS_EPOCH + timedelta(days=int(n))).isoformat() if n else None
+
+
+_CROSSWORD_DATE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+
+def _crossword(m, text, start, end):
+    seconds = _clock_seconds(text, m.end(), end)
+    if seconds is None:
+        return None
+    # "I solved the Tuesday 1/2/2024 New York Times Daily Crossword in 12:05!"
+    d = _CROSSWORD_DATE.search(text, start, m.start())
+    puzzle = f"{d.group(3)}-{int(d.group(1)):02d}-{int(d.group(2)):02d}" if d else None
+    return seconds, puzzle
+
+
+_SECONDS = re.compile(r"(\d+)\s*sec", re.I)
+
+
+def _pyramid(m, text, start, end):
+    seconds = _clock_seconds(text, start, end)
+    if seconds is None:
+        s = _SECONDS.search(text, start, end)
+        seconds = int(s.group(1)) if s else None
+    return None if seconds is None else (seconds, None)
+
+
+_BEE_RANK = re.compile(r"Queen(?:\s|%20|\+)Bee|Genius", re.I)
+
+
+def _spelling_bee(m, text, start, end):
+    rank = _BEE_RANK.search(text, start, end)
+    if rank is None:
+        return 0, None
+    return (2 if rank.group(0).lower().startswith("queen") else 1), None
+
+
+def _waffle(m, text, start, end):
+    swaps = m.group("swaps")
+    return (0 if swaps in "Xx" else int(swaps)), None
+
+
+_KEYWORD = re.compile(r"Time:\s*(\d+).*?Errors:\s*(\d+)", re.I | re.S)
+
+
+def _keyword(m, text, start, end):
+    k = _KEYWORD.search(text, start, end)
+    return None if k is None else (int(k.group(1)) + int(k.group(2)) * 10, None)
+
+
+_FLASHBACK = re.compile(r"(\d+)\s*(?:points?\b|/\s*8\b)", re.I)
+
+
+def _flashback(m, text, start, end):
+    f = _FLASHBACK.search(text, start, end)
+    return None if f is None else (int(f.group(1)), None)
+
+
+_QUINTUMBLE = re.compile(r"🎯\s*(\d+)")
+
+
+def _quintumble(m, text, start, end):
+    q = _QUINTUMBLE.search(text, start, end)
+    return None if q is None else (int(q.group(1)), None)
+
+
+_BRACKET_CITY = re.compile(r"Total Score:\s*(\d+(?:\.\d+)?)", re.I)
+
+
+def _bracket_city(m, text, start, end):
+    b = _BRACKET_CITY.search(text, start, end)
+    if b is None:
+        return None
+    score = float(b.group(1))
+    return (int(score) if score.is_integer() else score), None
+
+
+# Dispatch table, keyed by GAME_SLUGS key (sheet game name): the literal every share of the game
+# starts with, the full header pattern (from that literal on), and the extractor. ROUTER is a
+# plain alternation of the literals, which the regex engine scans for without trying every
+# alternative at every position; a hit picks the game, whose header pattern is then matched
+# at that spot.
+SHARE_PARSERS = {
+    "crossword": ("New York Times", r"New York Times (?:Daily )?Crossword", _crossword),
+    "connections": ("Connections", r"Connections\s*\n?\s*Puzzle\s*#(?P<n>\d+)", _connections),
+    "pyramid": ("Pyramid Scheme", r"Pyramid Scheme", _pyramid),
+    "bee": ("Spelling Bee", r"Spelling Bee", _spelling_bee),
+    "wordle": ("Wordle", r"Wordle\s+(?P<n>\d[\d,.]*)\s+(?P<guesses>[1-6Xx])\s*/\s*6", _wordle),
+    "waffle": ("#waffle", r"#waffle\d+\s+(?P<swaps>[0-5Xx])\s*/\s*5", _waffle),
+    "keyword": ("Keyword", r"Keyword", _keyword),
+    "flashback": ("Flashback", r"Flashback", _flashback),
+    "quintumble": ("Quintumble", r"Quintumble", _quintumble),
+    "bracketcity": ("Bracket City", r"Bracket City", _bracket_city),
+}
+assert SHARE_PARSERS.keys() <= GAME_SLUGS.keys()
+ROUTER = re.compile("|".join(re.escape(literal) for literal, _, _ in SHARE_PARSERS.values()))
+DISPATCH = {
+    literal: (GAME_SLUGS[name], re.compile(pattern), extract)
+    for name, (literal, pattern, extract) in SHARE_PARSERS.items()
+}
+
+
+def parse_shares(text: str) -> list[tuple[str, int | float, str | None]]:
+    """
+    (slug, sheet value, puzzle date or None) for each share pasted in one message. Each share
+    runs from the start of its header's line to the line of the next header.
+    """
+    headers = []
+    for m in ROUTER.finditer(text):
+        slug, header, extract = DISPATCH[m.group()]
+        found = header.match(text, m.start())
+        if found is not None:
+            headers.append((found, slug, extract))
+    out = []
+    for i, (m, slug, extract) in enumerate(headers):
+        start = text.rfind("\n", 0, m.start()) + 1
+        end = len(text)
+        if i + 1 < len(headers):
+            following = headers[i + 1][0].start()
+            end = text.rfind("\n", 0, following) + 1
+            if end <= start:
+                end = following  # two headers on one line
+        found = extract(m, text, start, end)
+        if found is not None:
+            out.append((slug, *found))
+    return out
+
+
+def iter_messages(lines):
+    """Yield (line number, date text, sender, message text) for each message of a chat export."""
+    current = None
+    body: list[str] = []
+    for line_no, line in enumerate(lines, 1):
+        m = MESSAGE_HEADER.match(line)
+        if m is None:
+            if current is not None:
+                body.append(line.rstrip("\r\n"))
+            continue
+        if current is not None:
+            yield (*current, "\n".join(body))
+        current = (line_no, m.group("date"), m.group("sender").strip())
+        body = [m.group("text").rstrip("\r\n")]
+    if current is not None:
+        yield (*current, "\n".join(body))
+
+
+class ChatDates:
+    """Memoized message-date parsing (month first unless day_first)."""
+
+    def __init__(self, day_first: bool = False):
+        self.formats = (
+            ("%d/%m/%y", "%d/%m/%Y", "%d.%m.%y", "%d.%m.%Y", "%Y-%m-%d")
+            if day_first
+            else ("%m/%d/%y", "%m/%d/%Y", "%m.%d.%y", "%m.%d.%Y", "%Y-%m-%d")
+        )
+        self._cache: dict[str, str | None] = {}
+
+    def __call__(self, s: str) -> str | None:
+        found = self._cache.get(s, False)
+        if found is not False:
+            return found
+        found = None
+        for fmt in self.formats:
+            try:
+                found = datetime.strptime(s, fmt).strftime("%Y-%m-%d")
+                break
+            except ValueError:
+                continue
+        self._cache[s] = found
+        return found
+
+
+def player_resolver(aliases: dict[str, str]):
+    """Sender display name -> backfill player (alias, else the name or its first word if in PLAYERS)."""
+    aliases = {k.strip().lower(): v for k, v in aliases.items()}
+    cache: dict[str, str | None] = {}
+
+    def resolve(sender: str) -> str | None:
+        found = cache.get(sender, False)
+        if found is not False:
+            return found
+        name = sender.lower()
+        found = aliases.get(name)
+        if found is None:
+            first = name.split()[0] if name.split() else ""
+            found = name if name in PLAYERS else first if first in PLAYERS else None
+        cache[sender] = found
+        return found
+
+    return resolve
+
+
+def _last_header(buf: str) -> int:
+    """Offset of the last header line in buf (0 if there is none after the first line)."""
+    pos = len(buf)
+    while pos > 0:
+        pos = buf.rfind("\n", 0, pos - 1) + 1
+        if HEADER_LINE.match(buf, pos):
+            return pos
+    return 0
+
+
+def iter_share_messages(f, counts: Counter):
+    """
+    Yield (line number, date text, sender, message text) for each message of a chat export that
+    may contain a share. The export is read in large chunks; ROUTER runs once over each
+    chunk, and only a share's own message is located (walking back to its header line and
+    forward to the next). Chatter never reaches Python code. counts["messages"] counts all messages.
+    """
+    line_no = 1  # line number of buf[0]
+    carry = ""
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        buf = carry + chunk
+        if not buf:
+            return
+        # Hold back the last message, which may continue in the next chunk
+        cut = _last_header(buf) if chunk else len(buf)
+        if cut == 0 and chunk:
+            carry = buf
+            continue
+        counts["messages"] += len(HEADER_COUNT.findall(buf, 0, cut))
+        counted_pos, counted_line = 0, line_no
+        message_end = 0
+        for m in ROUTER.finditer(buf, 0, cut):
+            if m.start() < message_end:
+                continue  # another share in a message already yielded
+            start = buf.rfind("\n", 0, m.start()) + 1
+            header = HEADER_LINE.match(buf, start)
+            while header is None and start > 0:
+                start = buf.rfind("\n", 0, start - 1) + 1
+                header = HEADER_LINE.match(buf, start)
+            if header is None or m.start() < header.start("text"):
+                continue  # before the first message, or inside a header line
+            following = HEADER_LINE.search(buf, m.end(), cut)
+            message_end = following.start() if following is not None else cut
+            counted_line += buf.count("\n", counted_pos, start)
+            counted_pos = start
+            text = buf[header.start("text") : message_end].rstrip("\n")
+            yield counted_line, header.group("date"), header.group("sender").strip(), text
+        line_no += buf.count("\n", 0, cut)
+        carry = buf[cut:]
+
+
+def iter_chat_scores(path: Path, aliases: dict[str, str] | None = None, day_first: bool = False, counts: Counter | None = None):
+    """Yield a backfill score dict (with _source "file:line") for each share in the chat export at path."""
+    counts = counts if counts is not None else Counter()
+    message_date = ChatDates(day_first)
+    resolve_player = player_resolver(aliases or {})
+    source = str(path)
+    with open(path, encoding="utf-8-sig", errors="replace") as f:
+        for line_no, date_text, sender, text in iter_share_messages(f, counts):
+            shares = parse_shares(text)
+            if not shares:
+                continue
+            player = resolve_player(sender)
+            if player is None:
+                counts["unknown_sender"] += len(shares)
+                continue
+            for slug, value, puzzle_date in shares:
+                d = puzzle_date or message_date(date_text)
+                if d is None:
+                    counts["undated"] += 1
+                    continue
+                transform = GAME_TRANSFORMS.get(slug)
+                if transform is not None:
+                    value = transform([value], player, [d], [None])[0]
+                counts[slug] += 1
+                counts["scores"] += 1
+                yield {
+                    "date": d,
+                    "game_slug": slug,
+                    "player": player,
+                    "raw_score": round(value, 4) if isinstance(value, float) else value,
+                    "_source": f"{source}:{line_no}",
+                }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Extract league scores from share messages in a group-chat export")
+    ap.add_argument("files", nargs="+", type=Path, help="Chat export text file(s)")
+    ap.add_argument("-o", "--output", type=Path, help="Write output to file (default: stdout)")
+    ap.add_argument("--format", choices=("ndjson", "json"), default="ndjson", help="Output format (default: ndjson)")
+    ap.add_argument("--ids", type=Path, help="ids file; its \"chat_names\" ({display name: player}) add aliases")
+    ap.add_argument("--alias", action="append", default=[], metavar="NAME=PLAYER", help="Map a chat display name to a player (repeatable)")
+    ap.add_argument("--day-first", action="store_true", help="Message dates are day/month/year")
+    ap.add_argument(
+        "--on-conflict",
+        choices=ON_CONFLICT_POLICIES,
+        default="error",
+        help="Same (player, game, date) posted more than once: error (default), first, last, min or max",
+    )
+    ap.add_argument("--conflicts-report", type=Path, default=DEFAULT_REPORT, help=f"Duplicate report CSV (default: {DEFAULT_REPORT})")
+    args = ap.parse_args()
+
+    ids = load_ids(args.ids)
+    aliases = dict(ids.get("chat_names") or {})
+    for spec in args.alias:
+        name, sep, player = spec.rpartition("=")
+        if not sep or not name:
+            raise SystemExit(f"--alias expects NAME=PLAYER, got {spec!r}")
+        aliases[name] = player
+    score_types = {**SCORE_TYPES, **(ids.get("score_types") or {})}
+    deduper = StreamingDeduplicator(args.on_conflict, score_types, ConflictReport(args.conflicts_report))
+
+    counts = Counter()
+    start = time.perf_counter()
+    with open_output(args.output) as out:
+        if args.format == "ndjson":
+            for path in args.files:
+                for rec in iter_chat_scores(path, aliases, args.day_first, counts):
+                    if deduper.add(rec):
+                        out.write(json.dumps({"type": "score", **rec}) + "\n")
+            for rec in deduper.finish():
+                out.write(json.dumps({"type": "score", **rec}) + "\n")
+        else:
+            kept = []
+            for path in args.files:
+                for rec in iter_chat_scores(path, aliases, args.day_first, counts):
+                    if deduper.add(rec):
+                        kept.append(rec)
+            kept.extend(deduper.finish())
+            write_json(out, kept, [])
+            if not args.output:
+                out.write("\n")
+        deduper.report.finish(args.on_conflict)
+    elapsed = time.perf_counter() - start
+    games = ", ".join(f"{slug} {counts[slug]}" for slug in sorted(set(GAME_SLUGS.values())) if counts[slug])
+    print(
+        f"{counts['messages']} message(s) in {elapsed:.2f}s ({counts['messages'] / elapsed if elapsed else 0:,.0f}/s): "
+        f"{counts['scores']} score(s){' (' + games + ')' if games else ''}; "
+        f"{counts['unknown_sender']} share(s) from unknown senders, {counts['undated']} undated.",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
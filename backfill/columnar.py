@@ -0,0 +1,143 @@
+"""
+--format columnar: parsed scores as a directory of fixed-width NumPy .npy columns.
+
+  date.npy, game.npy, player.npy, source.npy   dictionary codes (<u4, <u2, <u2, <u2)
+  score.npy                                    raw scores (<f8)
+  is_int.npy                                   1 where the raw score was an integer (|u1)
+  dictionaries.json                            {"date": [...], "game": [...], "player": [...], "source": [...]}
+  starting_words.json                          [{"date", "word"}, ...]
+  metadata.json                                row count, column dtypes, parse rules version
+
+These are ScoreTable's own columns, written as .npy version 1.0 files: little-endian, C order,
+with the data 64-byte aligned. Downstream code can np.load(path, mmap_mode="r") them without
+decoding any text. Nothing here needs NumPy: the header is written by hand, and read_columnar()
+maps a directory back to a ScoreTable (iterate it for the usual score dicts) using only array.
+"""
+
+import ast
+import json
+import shutil
+import sys
+from array import array
+from pathlib import Path
+
+from score_table import ScoreTable
+
+FORMAT_VERSION = 1
+NPY_MAGIC = b"\x93NUMPY"
+# ScoreTable column -> file stem
+COLUMNS = {
+    "date_codes": "date",
+    "game_codes": "game",
+    "player_codes": "player",
+    "source_codes": "source",
+    "scores": "score",
+    "is_int": "is_int",
+}
+_KINDS = {"I": "u", "H": "u", "B": "u", "d": "f"}
+
+
+def _descr(col: array) -> str:
+    return ("|" if col.itemsize == 1 else "<") + _KINDS[col.typecode] + str(col.itemsize)
+
+
+def write_npy(path: Path, col: array) -> None:
+    """Write a 1-D array.array as a .npy (version 1.0) file."""
+    header = f"{{'descr': '{_descr(col)}', 'fortran_order': False, 'shape': ({len(col)},), }}"
+    # magic (6) + version (2) + header length (2) + header, padded so the data starts on a 64-byte boundary
+    pad = -(10 + len(header) + 1) % 64
+    header = header + " " * pad + "\n"
+    if sys.byteorder == "big" and col.itemsize > 1:
+        col = array(col.typecode, col)
+        col.byteswap()
+    with open(path, "wb") as f:
+        f.write(NPY_MAGIC + b"\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1"))
+        col.tofile(f)
+
+
+def read_npy(path: Path, typecode: str) -> array:
+    """Read a 1-D .npy file written by write_npy() (or NumPy) into an array.array of typecode."""
+    with open(path, "rb") as f:
+        if f.read(6) != NPY_MAGIC:
+            raise SystemExit(f"{path}: not a .npy file")
+        major = f.read(2)[0]
+        size = 2 if major == 1 else 4
+        header = ast.literal_eval(f.read(int.from_bytes(f.read(size), "little")).decode("latin1"))
+        col = array(typecode)
+        expected = ("|" if col.itemsize == 1 else "<") + _KINDS[typecode] + str(col.itemsize)
+        if header["descr"] != expected or header["fortran_order"] or len(header["shape"]) != 1:
+            raise SystemExit(f"{path}: expected a 1-D {expected} column, got {header}")
+        col.fromfile(f, header["shape"][0])
+    if sys.byteorder == "big" and col.itemsize > 1:
+        col.byteswap()
+    return col
+
+
+def write_columnar(
+    directory: Path, scores: ScoreTable, starting_words: list[tuple[str, str]], rules_version: str | None = None
+) -> None:
+    """
+    Write scores and starting words to directory (see module docstring). The columns are written
+    to a sibling temp directory first, so a failed run leaves any previous export untouched.
+    """
+    tmp = directory.with_name(directory.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    try:
+        columns = {}
+        for attr, stem in COLUMNS.items():
+            col = getattr(scores, attr)
+            write_npy(tmp / f"{stem}.npy", col)
+            columns[stem] = {"file": f"{stem}.npy", "dtype": _descr(col)}
+        dictionaries = {
+            "date": scores.dates.values,
+            "game": scores.games.values,
+            "player": scores.players.values,
+            "source": scores.sources.values,
+        }
+        with open(tmp / "dictionaries.json", "w", encoding="utf-8") as f:
+            json.dump(dictionaries, f, indent=2)
+        with open(tmp / "starting_words.json", "w", encoding="utf-8") as f:
+            json.dump([{"date": d, "word": w} for d, w in starting_words], f, indent=2)
+        metadata = {
+            "format": "backfill-columnar",
+            "version": FORMAT_VERSION,
+            "rows": len(scores),
+            "columns": columns,
+            "parse_rules_version": rules_version,
+        }
+        with open(tmp / "metadata.json", "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+        old = directory.with_name(directory.name + ".old")
+        if directory.exists():
+            directory.rename(old)
+        tmp.rename(directory)
+        shutil.rmtree(old, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def read_columnar(directory: Path) -> tuple[ScoreTable, list[tuple[str, str]]]:
+    """(scores, starting_words) from a --format columnar directory; iterate the table for score dicts."""
+    with open(directory / "metadata.json", encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata.get("format") != "backfill-columnar" or metadata.get("version") != FORMAT_VERSION:
+        raise SystemExit(f"{directory}: not a version {FORMAT_VERSION} backfill columnar export")
+    with open(directory / "dictionaries.json", encoding="utf-8") as f:
+        dictionaries = json.load(f)
+    with open(directory / "starting_words.json", encoding="utf-8") as f:
+        starting_words = [(w["date"], w["word"]) for w in json.load(f)]
+    table = ScoreTable()
+    cols = {
+        stem: read_npy(directory / f"{stem}.npy", getattr(table, attr).typecode) for attr, stem in COLUMNS.items()
+    }
+    if any(len(col) != metadata["rows"] for col in cols.values()):
+        raise SystemExit(f"{directory}: column lengths do not match metadata rows ({metadata['rows']})")
+    dates, games, players, sources = (
+        dictionaries["date"], dictionaries["game"], dictionaries["player"], dictionaries["source"]
+    )
+    for d, g, p, s, score, is_int in zip(
+        cols["date"], cols["game"], cols["player"], cols["source"], cols["score"], cols["is_int"]
+    ):
+        table.append(dates[d], games[g], players[p], int(score) if is_int else score, sources[s])
+    return table, starting_words
@@ -0,0 +1,243 @@
+"""
+Resolve duplicate (player, game, date) scores in one pass, under an --on-conflict policy:
+
+  error  stop, listing every conflict (the default)
+  first  keep the first occurrence, in file order
+  last   keep the last occurrence
+  max    keep the best score of the group: lowest for lower_better games, highest for higher_better
+  min    keep the worst score of the group
+
+Every conflicting group goes to a CSV report (player, game_slug, date, raw_score, source, kept),
+one line per occurrence, instead of a truncated list on stderr.
+
+For the in-memory path, ScoreTable already indexes keys as rows are added, so only the
+conflicting groups are visited. StreamingDeduplicator is the --format ndjson path: with first
+and error it emits scores as they arrive and keeps a compact index of keys; once the index
+(or, for last/min/max, the buffered scores) outgrows the memory budget it spills sorted runs
+to disk and finishes with an external sort-merge.
+"""
+
+import csv
+import heapq
+import json
+import sys
+import tempfile
+from array import array
+from itertools import groupby
+from pathlib import Path
+
+from score_table import ScoreTable
+
+ON_CONFLICT_POLICIES = ("error", "first", "last", "min", "max")
+DEFAULT_REPORT = Path("backfill-conflicts.csv")
+DEFAULT_MEMORY_MB = 256
+# Rough in-memory cost per key, used to turn the memory budget into a key count.
+_INDEX_BYTES_PER_KEY = 120
+_BUFFER_BYTES_PER_SCORE = 400
+
+
+def pick(policy: str, scores: list, score_type: str | None) -> int:
+    """Index of the occurrence policy keeps, given each occurrence's raw_score in input order."""
+    if policy == "first":
+        return 0
+    if policy == "last":
+        return len(scores) - 1
+    if score_type not in ("lower_better", "higher_better"):
+        raise SystemExit(
+            f"--on-conflict {policy} needs the game's score_type; add \"score_types\" to the ids file"
+        )
+    best_is_high = score_type == "higher_better"
+    want_high = best_is_high if policy == "max" else not best_is_high
+    chooser = max if want_high else min
+    # max()/min() return the first of equal scores, so ties keep the earliest occurrence
+    return chooser(range(len(scores)), key=scores.__getitem__)
+
+
+class ConflictReport:
+    """CSV side report of every conflicting group; the file is only created if there is one."""
+
+    def __init__(self, path: Path = DEFAULT_REPORT):
+        self.path = path
+        self.groups = 0
+        self.dropped = 0
+        self._f = None
+        self._w = None
+
+    def add(self, player: str, game_slug: str, date: str, occurrences: list[tuple], kept: int | None) -> None:
+        """occurrences: (raw_score, source) in input order; kept: index kept, None for --on-conflict error."""
+        if self._w is None:
+            self._f = open(self.path, "w", newline="", encoding="utf-8")
+            self._w = csv.writer(self._f, lineterminator="\n")
+            self._w.writerow(("player", "game_slug", "date", "raw_score", "source", "kept"))
+        for i, (raw_score, source) in enumerate(occurrences):
+            self._w.writerow((player, game_slug, date, raw_score, source or "", int(i == kept)))
+        self.groups += 1
+        self.dropped += len(occurrences) - 1
+
+    def finish(self, policy: str) -> None:
+        """Close the report and tell the user; exits with status 1 under --on-conflict error."""
+        if self._f is None:
+            return
+        self._f.close()
+        if policy == "error":
+            print(
+                f"{self.groups} duplicate score key(s) (same player, game, date) — would violate "
+                f"scores_user_game_date_unique. Every occurrence is listed in {self.path}.\n"
+                "Fix the CSVs or pick --on-conflict first|last|min|max.",
+                file=sys.stderr,
+            )
+            raise SystemExit(1)
+        print(
+            f"Warning: {self.dropped} duplicate score(s) dropped from {self.groups} key(s) "
+            f"(--on-conflict {policy}); details in {self.path}.",
+            file=sys.stderr,
+        )
+
+
+def resolve_table(table: ScoreTable, policy: str, score_types: dict, report: ConflictReport) -> ScoreTable:
+    """Apply policy to the table's duplicate keys; returns a table without the dropped rows."""
+    drop: set[int] = set()
+    for rows in table.conflict_rows():
+        occurrences = [table.row(i) for i in rows]
+        date, game_slug, player, _, _ = occurrences[0]
+        kept = None if policy == "error" else pick(policy, [o[3] for o in occurrences], score_types.get(game_slug))
+        report.add(player, game_slug, date, [(o[3], o[4]) for o in occurrences], kept)
+        drop.update(r for i, r in enumerate(rows) if i != kept)
+    report.finish(policy)
+    return table.without_rows(drop) if drop else table
+
+
+class StreamingDeduplicator:
+    """
+    add() each score dict in input order; it returns True if the score can be written now.
+    finish() then yields the scores held back. See the module docstring for the spill logic.
+    """
+
+    def __init__(self, policy: str, score_types: dict, report: ConflictReport, memory_mb: float = DEFAULT_MEMORY_MB):
+        self.policy = policy
+        self.score_types = score_types
+        self.report = report
+        self.streaming = policy in ("first", "error")
+        budget = int(memory_mb * 1024 * 1024)
+        self.max_items = max(1, budget // (_INDEX_BYTES_PER_KEY if self.streaming else _BUFFER_BYTES_PER_SCORE))
+        self._seq = 0
+        self._runs: list[Path] = []
+        self._tmp: tempfile.TemporaryDirectory | None = None
+        # first/error index: packed (player, game, date) codes -> slot in the score/source columns
+        self._codes: tuple[dict, dict, dict] = ({}, {}, {})
+        self._values: tuple[list, list, list] = ([], [], [])
+        self._index: dict[int, int] = {}
+        self._scores = array("d")
+        self._is_int = array("B")
+        self._sources: list[str | None] = []
+        self._conflicts: dict[int, list[tuple]] = {}
+        # last/min/max (and first/error once spilled): [player, game, date, seq, raw_score, source, emitted]
+        self._buffer: list[list] = []
+
+    def _encode(self, i: int, value: str) -> int:
+        codes = self._codes[i]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._values[i])
+            self._values[i].append(value)
+        return code
+
+    def add(self, rec: dict) -> bool:
+        seq = self._seq
+        self._seq += 1
+        player, game, date, score, source = rec["player"], rec["game_slug"], rec["date"], rec["raw_score"], rec.get("_source")
+        if not self.streaming or self._runs:
+            self._buffer.append([player, game, date, seq, score, source, 0])
+            if len(self._buffer) >= self.max_items:
+                self._spill()
+            return False
+        key = (self._encode(0, player) << 40) | (self._encode(1, game) << 24) | self._encode(2, date)
+        slot = self._index.get(key)
+        if slot is not None:
+            self._conflicts.setdefault(key, []).append((seq, score, source))
+            return False
+        self._index[key] = len(self._scores)
+        self._scores.append(score)
+        self._is_int.append(isinstance(score, int))
+        self._sources.append(source)
+        if len(self._index) >= self.max_items:
+            self._spill_index()
+        return True
+
+    def _run_path(self) -> Path:
+        if self._tmp is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="backfill-dedupe-")
+        return Path(self._tmp.name) / f"run{len(self._runs):05d}.ndjson"
+
+    def _write_run(self, items) -> None:
+        path = self._run_path()
+        with open(path, "w", encoding="utf-8") as f:
+            for item in sorted(items, key=lambda x: (x[0], x[1], x[2], x[3])):
+                f.write(json.dumps(item) + "\n")
+        self._runs.append(path)
+
+    def _index_items(self):
+        """Indexed (already written) scores and their later duplicates, as run items."""
+        players, games, dates = self._values
+        for key, slot in self._index.items():
+            p, g, d = players[key >> 40], games[(key >> 24) & 0xFFFF], dates[key & 0xFFFFFF]
+            score = self._scores[slot]
+            yield [p, g, d, -1, int(score) if self._is_int[slot] else score, self._sources[slot], 1]
+            for dup_seq, dup_score, dup_source in self._conflicts.get(key, ()):
+                yield [p, g, d, dup_seq, dup_score, dup_source, 0]
+
+    def _spill_index(self) -> None:
+        # Written keys go to disk marked emitted; every later score is buffered and merged at the end.
+        self._write_run(self._index_items())
+        self._index.clear()
+        self._conflicts.clear()
+        self._scores = array("d")
+        self._is_int = array("B")
+        self._sources = []
+
+    def _spill(self) -> None:
+        self._write_run(self._buffer)
+        self._buffer = []
+
+    def _resolve(self, player: str, game: str, date: str, group: list[list]):
+        """Report a conflicting group and yield its winner unless it was already written."""
+        if len(group) == 1:
+            if not group[0][6]:
+                yield group[0]
+            return
+        kept = None if self.policy == "error" else pick(self.policy, [g[4] for g in group], self.score_types.get(game))
+        self.report.add(player, game, date, [(g[4], g[5]) for g in group], kept)
+        if kept is not None and not group[kept][6]:
+            yield group[kept]
+
+    def finish(self):
+        """Yield held-back score dicts: in input order if everything fit in memory, else in key order."""
+        if self._runs:
+            if self._buffer:
+                self._spill()
+            files = [open(path, encoding="utf-8") for path in self._runs]
+            try:
+                merged = heapq.merge(*(map(json.loads, f) for f in files), key=lambda x: (x[0], x[1], x[2], x[3]))
+                for (p, g, d), group in groupby(merged, key=lambda x: (x[0], x[1], x[2])):
+                    for w in self._resolve(p, g, d, list(group)):
+                        yield {"date": w[2], "game_slug": w[1], "player": w[0], "raw_score": w[4], "_source": w[5]}
+            finally:
+                for f in files:
+                    f.close()
+                self._tmp.cleanup()
+            return
+        if self.streaming:
+            # Every winner was written by add(); only the report is left
+            groups = {}
+            for item in self._index_items():
+                groups.setdefault((item[0], item[1], item[2]), []).append(item)
+            for (p, g, d), group in groups.items():
+                if len(group) > 1:
+                    list(self._resolve(p, g, d, group))
+            return
+        groups = {}
+        for item in self._buffer:
+            groups.setdefault((item[0], item[1], item[2]), []).append(item)
+        winners = [w for (p, g, d), group in groups.items() for w in self._resolve(p, g, d, group)]
+        for w in sorted(winners, key=lambda w: w[3]):
+            yield {"date": w[2], "game_slug": w[1], "player": w[0], "raw_score": w[4], "_source": w[5]}
@@ -0,0 +1,149 @@
+"""
+Who was handicapped in which game, when, and by how much: the backfill's copy of league_handicap.
+
+Intervals are indexed per (player, game slug) and sorted by start date, so finding the one
+covering a date is a bisect, however many players, games and schedule changes there are.
+An interval's day_multipliers map day of week ("0" = Sunday ... "6" = Saturday, as in
+league_handicap) to a multiplier; a missing day means no handicap that day. An interval
+with day_multipliers None takes the percentage from the sheet's handicap row instead.
+
+Sources, in backfill player names and game slugs:
+  - ids.json "handicaps": [{"player", "game", "start_date", "end_date", "day_multipliers"}, ...]
+  - a league_handicap export (CSV with header, or JSON list; user_id/game_id mapped back to
+    names through the ids file's user_ids/game_ids)
+"""
+
+import csv
+import hashlib
+import json
+from bisect import bisect_right
+from datetime import date as Date
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=None)
+def day_of_week(d: str) -> str:
+    """Postgres extract(dow) as a day_multipliers key: "0" = Sunday ... "6" = Saturday."""
+    return str((Date.fromisoformat(d).weekday() + 1) % 7)
+
+
+def load_handicaps(paths: list[Path]) -> list[dict]:
+    """league_handicap rows from CSV exports (day_multipliers as JSON text) or JSON lists."""
+    rows: list[dict] = []
+    for path in paths:
+        if path.suffix.lower() == ".json":
+            with open(path, encoding="utf-8") as f:
+                rows.extend(json.load(f))
+        else:
+            with open(path, newline="", encoding="utf-8") as f:
+                rows.extend(csv.DictReader(f))
+    return rows
+
+
+class HandicapSchedule:
+    """Per-(player, game) interval index; see module docstring."""
+
+    def __init__(self, entries: list[dict] = ()):
+        self.entries: list[dict] = []
+        self._index: dict[tuple[str, str], tuple[list[str], list[tuple[str | None, dict | None]]]] = {}
+        for e in entries:
+            self.add(e["player"], e["game"], e.get("start_date"), e.get("end_date"), e.get("day_multipliers"))
+
+    def add(self, player: str, game: str, start_date: str | None, end_date: str | None, day_multipliers) -> None:
+        if isinstance(day_multipliers, str):
+            day_multipliers = json.loads(day_multipliers)
+        start_date = start_date or ""
+        end_date = end_date or None
+        self.entries.append({
+            "player": player, "game": game, "start_date": start_date,
+            "end_date": end_date, "day_multipliers": day_multipliers,
+        })
+        starts, intervals = self._index.setdefault((player, game), ([], []))
+        i = bisect_right(starts, start_date)
+        starts.insert(i, start_date)
+        intervals.insert(i, (end_date, day_multipliers))
+
+    @classmethod
+    def from_league_handicap(cls, rows: list[dict], ids: dict) -> "HandicapSchedule":
+        """Schedule from league_handicap rows (uuids), keeping only players and games the ids file names."""
+        players = {uid: name for name, uid in (ids.get("user_ids") or {}).items()}
+        games = {gid: slug for slug, gid in (ids.get("game_ids") or {}).items()}
+        league_id = ids.get("league_id")
+        schedule = cls()
+        for row in rows:
+            if league_id and row.get("league_id") and row["league_id"] != league_id:
+                continue
+            player, game = players.get(row["user_id"]), games.get(row["game_id"])
+            if player and game:
+                # NULL (an empty CSV cell) falls back to the sheet's handicap row; {} is no handicap
+                mults = row.get("day_multipliers")
+                schedule.add(player, game, row["start_date"], row.get("end_date"), None if mults == "" else mults)
+        return schedule
+
+    def covers(self, player: str, game: str) -> bool:
+        return (player, game) in self._index
+
+    def interval(self, player: str, game: str, d: str) -> tuple[str | None, dict | None] | None:
+        """(end_date, day_multipliers) of the interval covering d, or None."""
+        found = self._index.get((player, game))
+        if found is None:
+            return None
+        starts, intervals = found
+        i = bisect_right(starts, d) - 1
+        if i < 0:
+            return None
+        end, mults = intervals[i]
+        return None if end is not None and d > end else (end, mults)
+
+    def multiplier(self, player: str, game: str, d: str, sheet: float | None = None) -> float | None:
+        """Multiplier for one score (None = not handicapped); sheet is the sheet's value for d."""
+        found = self.interval(player, game, d)
+        if found is None:
+            return None
+        mults = found[1]
+        if mults is None:
+            return sheet
+        m = mults.get(day_of_week(d))
+        return float(m) if m is not None else None
+
+    def row_multipliers(self, player: str, game: str, dates: list[str], sheet: list[float | None] | None):
+        """multiplier() for each date of a data row, or None if the player has no handicap in this game."""
+        found = self._index.get((player, game))
+        if found is None:
+            return None
+        starts, intervals = found
+        sheet = sheet or [None] * len(dates)
+        out = []
+        for d, h in zip(dates, sheet):
+            i = bisect_right(starts, d) - 1
+            if i < 0:
+                out.append(None)
+                continue
+            end, mults = intervals[i]
+            if end is not None and d > end:
+                out.append(None)
+            elif mults is None:
+                out.append(h)
+            else:
+                m = mults.get(day_of_week(d))
+                out.append(float(m) if m is not None else None)
+        return out
+
+    def disagreements(self, game: str, dates: list[str], sheet: list[float | None]) -> list[tuple[str, str, float | None, float | None]]:
+        """(date, player, sheet value, scheduled value) wherever the schedule sets a multiplier the sheet row does not show."""
+        out = []
+        for player, g in sorted(self._index):
+            if g != game:
+                continue
+            for d, h in zip(dates, sheet):
+                found = self.interval(player, game, d)
+                if found is None or found[1] is None:
+                    continue
+                m = self.multiplier(player, game, d)
+                if abs((m or 1.0) - (h or 1.0)) > 1e-9:
+                    out.append((d, player, h, m))
+        return out
+
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self.entries, sort_keys=True).encode()).hexdigest()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Rewrite existing scores to a new scoring convention, in small resumable batches.
+
+Remaps are declared in score_remaps.json (game slug -> {"note", "map": {old score: new score}});
+every selected game is converted in one pass over public.scores. Rows are walked in (date, id)
+order, --batch-size at a time (keyset pagination: each batch starts after the last (date, id) of
+the previous one), and each batch commits on its own, so locks are only held briefly. Progress
+is kept in public.score_migration_progress under a name derived from the remaps: an interrupted
+run resumes after the last committed batch, and a finished migration is never applied twice.
+
+Usage:
+  python3 migrate_scores.py --ids ids.json -o migrate_scores.sql          # psql script (PostgreSQL 11+)
+  python3 migrate_scores.py --ids ids.json --game wordle --dry-run        # per-batch counts, no changes
+  python3 migrate_scores.py --ids ids.json --dsn sqlite:///backfill-test.db  # run the batches from here
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+from db_loader import DEFAULT_SCHEMA, open_dialect
+from sql_output import sql_literal
+
+DEFAULT_REMAPS = Path(__file__).resolve().parent / "score_remaps.json"
+DEFAULT_BATCH_SIZE = 1000
+PROGRESS_DDL = """CREATE TABLE IF NOT EXISTS public.score_migration_progress (
+  migration text primary key,
+  last_date date,
+  last_id uuid,
+  rows_updated bigint not null default 0,
+  done boolean not null default false
+);"""
+
+
+def load_remaps(path: Path, games: list[str] | None, game_ids: dict) -> dict[str, tuple[str, str, dict]]:
+    """game_id -> (slug, note, {old: new}) for the selected games (default: every game in the file)."""
+    table = json.loads(path.read_text(encoding="utf-8"))
+    selected = games or sorted(table)
+    unknown = [g for g in selected if g not in table]
+    if unknown:
+        raise SystemExit(f"No remap for: {', '.join(unknown)} (see {path})")
+    out = {}
+    for slug in selected:
+        gid = game_ids.get(slug)
+        if not gid or gid.startswith("YOUR_") or "REPLACE" in gid:
+            raise SystemExit(f"ids file must contain a real game_ids.{slug} UUID (not a placeholder)")
+        mapping = {Decimal(old): Decimal(str(new)) for old, new in table[slug]["map"].items()}
+        out[gid] = (slug, table[slug].get("note", ""), mapping)
+    return out
+
+
+def migration_name(remaps: dict) -> str:
+    """Stable name for this exact set of remaps; editing a map gives a new migration."""
+    spec = sorted((slug, sorted((str(k), str(v)) for k, v in m.items())) for slug, _, m in remaps.values())
+    digest = hashlib.sha256(json.dumps(spec).encode()).hexdigest()[:12]
+    return f"remap:{','.join(slug for slug, _ in spec)}:{digest}"
+
+
+def case_expr(remaps: dict) -> str:
+    """New score for a row of any selected game."""
+    arms = []
+    for gid, (_, _, mapping) in remaps.items():
+        inner = " ".join(f"WHEN {str(old)} THEN {str(new)}" for old, new in mapping.items())
+        arms.append(f"WHEN s.game_id = {sql_literal(gid)} THEN CASE s.score {inner} ELSE s.score END")
+    return "CASE\n        " + "\n        ".join(arms) + "\n        ELSE s.score\n      END"
+
+
+def changes_expr(remaps: dict) -> str:
+    """True for rows the remap actually changes."""
+    parts = []
+    for gid, (_, _, mapping) in remaps.items():
+        olds = ", ".join(str(old) for old, new in mapping.items() if old != new)
+        parts.append(f"(s.game_id = {sql_literal(gid)} AND s.score IN ({olds}))")
+    return "(" + " OR ".join(parts) + ")"
+
+
+def write_psql_script(out, remaps: dict, batch_size: int, dry_run: bool) -> None:
+    """A DO block that walks scores by (date, id) and commits after each batch."""
+    name = sql_literal(migration_name(remaps))
+    games = ", ".join(sql_literal(gid) for gid in remaps)
+    out.write(f"-- Score remap {migration_name(remaps)}\n")
+    for slug, note, _ in remaps.values():
+        out.write(f"--   {slug}: {note}\n")
+    out.write(
+        f"-- Batches of {batch_size} rows by (date, id). Run with psql outside a transaction block (PostgreSQL 11+).\n"
+    )
+    batch = f"""SELECT s.id, s.date, {changes_expr(remaps)} AS changes
+      FROM public.scores s
+      WHERE s.game_id IN ({games})
+        AND (cur_date IS NULL OR (s.date, s.id) > (cur_date, cur_id))
+      ORDER BY s.date, s.id
+      LIMIT {batch_size}"""
+    if dry_run:
+        out.write(f"""DO $$
+DECLARE
+  batch_no int := 0;
+  cur_date date;
+  cur_id uuid;
+  n bigint;
+BEGIN
+  LOOP
+    WITH batch AS (
+      {batch}
+    )
+    SELECT (SELECT count(*) FROM batch WHERE changes), lastrow.date, lastrow.id
+    INTO n, cur_date, cur_id
+    FROM (SELECT date, id FROM batch ORDER BY date DESC, id DESC LIMIT 1) lastrow;
+    EXIT WHEN NOT FOUND;
+    batch_no := batch_no + 1;
+    RAISE NOTICE 'batch %: % row(s) would change, through (%, %)', batch_no, n, cur_date, cur_id;
+  END LOOP;
+END $$;
+""")
+        return
+    out.write(f"""{PROGRESS_DDL}
+INSERT INTO public.score_migration_progress (migration) VALUES ({name}) ON CONFLICT (migration) DO NOTHING;
+DO $$
+DECLARE
+  batch_no int := 0;
+  cur_date date;
+  cur_id uuid;
+  is_done boolean;
+  n bigint;
+BEGIN
+  SELECT last_date, last_id, done INTO cur_date, cur_id, is_done
+  FROM public.score_migration_progress WHERE migration = {name};
+  IF is_done THEN
+    RAISE NOTICE '% was already applied', {name};
+    RETURN;
+  END IF;
+  LOOP
+    WITH batch AS (
+      {batch}
+    ), changed AS (
+      UPDATE public.scores s
+      SET score = {case_expr(remaps)}
+      FROM batch b
+      WHERE s.id = b.id AND b.changes
+      RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM changed), lastrow.date, lastrow.id
+    INTO n, cur_date, cur_id
+    FROM (SELECT date, id FROM batch ORDER BY date DESC, id DESC LIMIT 1) lastrow;
+    EXIT WHEN NOT FOUND;
+    batch_no := batch_no + 1;
+    UPDATE public.score_migration_progress
+    SET last_date = cur_date, last_id = cur_id, rows_updated = rows_updated + n
+    WHERE migration = {name};
+    COMMIT;
+    RAISE NOTICE 'batch %: % row(s) updated, through (%, %)', batch_no, n, cur_date, cur_id;
+  END LOOP;
+  UPDATE public.score_migration_progress SET done = true WHERE migration = {name};
+  COMMIT;
+END $$;
+""")
+
+
+def run_batches(dsn: str, remaps: dict, batch_size: int, dry_run: bool, schema: Path = DEFAULT_SCHEMA) -> int:
+    """Run the migration (or the dry run) from here, one committed batch at a time. Returns rows changed."""
+    dialect = open_dialect(dsn, schema)
+    ph = dialect.placeholder
+    scores = dialect.table("public.scores")
+    progress = dialect.table("public.score_migration_progress")
+    name = migration_name(remaps)
+    conn = dialect.connect()
+    try:
+        cur = conn.cursor()
+        cur.execute(PROGRESS_DDL.replace("public.score_migration_progress", progress))
+        cur.execute(f"INSERT INTO {progress} (migration) VALUES ({ph}) ON CONFLICT (migration) DO NOTHING", (name,))
+        conn.commit()
+        cur.execute(f"SELECT last_date, last_id, done FROM {progress} WHERE migration = {ph}", (name,))
+        last_date, last_id, done = cur.fetchone()
+        if dry_run:
+            last_date = last_id = None
+        elif done:
+            print(f"{name} was already applied.", file=sys.stderr)
+            return 0
+        games = ", ".join(ph for _ in remaps)
+        select = (
+            f"SELECT id, date, game_id, score FROM {scores} WHERE game_id IN ({games})"
+            f" {{after}} ORDER BY date, id LIMIT {batch_size}"
+        )
+        total = 0
+        batch_no = 0
+        while True:
+            if last_date is None:
+                cur.execute(select.format(after=""), tuple(remaps))
+            else:
+                cur.execute(
+                    select.format(after=f"AND (date, id) > ({ph}, {ph})"), (*remaps, str(last_date), str(last_id))
+                )
+            rows = cur.fetchall()
+            if not rows:
+                break
+            batch_no += 1
+            updates = []
+            for row_id, _, game_id, score in rows:
+                new = remaps[game_id][2].get(Decimal(str(score)))
+                if new is not None and new != Decimal(str(score)):
+                    updates.append((int(new) if new == new.to_integral_value() else float(new), row_id))
+            last_date, last_id = rows[-1][1], rows[-1][0]
+            total += len(updates)
+            if dry_run:
+                print(f"batch {batch_no}: {len(updates)} row(s) would change, through ({last_date}, {last_id})", file=sys.stderr)
+                continue
+            if updates:
+                cur.executemany(f"UPDATE {scores} SET score = {ph} WHERE id = {ph}", updates)
+            cur.execute(
+                f"UPDATE {progress} SET last_date = {ph}, last_id = {ph}, rows_updated = rows_updated + {ph} WHERE migration = {ph}",
+                (str(last_date), str(last_id), len(updates), name),
+            )
+            conn.commit()
+            print(f"batch {batch_no}: {len(updates)} row(s) updated, through ({last_date}, {last_id})", file=sys.stderr)
+        if not dry_run:
+            cur.execute(f"UPDATE {progress} SET done = {ph} WHERE migration = {ph}", (True, name))
+            conn.commit()
+        return total
+    finally:
+        conn.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Generate (or run) batched, resumable score remaps from score_remaps.json")
+    ap.add_argument("--ids", type=Path, required=True, help="JSON file with game_ids for the remapped games")
+    ap.add_argument("--remaps", type=Path, default=DEFAULT_REMAPS, help="Remap table (default: score_remaps.json here)")
+    ap.add_argument("--game", action="append", help="Only this game slug (repeatable; default: every game in the remap table)")
+    ap.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help=f"Rows per batch (default: {DEFAULT_BATCH_SIZE})")
+    ap.add_argument("--dry-run", action="store_true", help="Only count, per batch, the rows that would change")
+    ap.add_argument("--dsn", help="Run the batches against this database (postgresql://... or sqlite:///file.db) instead of writing SQL")
+    ap.add_argument("--schema", type=Path, default=DEFAULT_SCHEMA, help="--dsn with sqlite: schema to create tables from")
+    ap.add_argument("-o", "--output", type=Path, help="Write SQL to file (default: stdout)")
+    args = ap.parse_args()
+
+    if not args.ids.exists():
+        raise SystemExit(f"Ids file not found: {args.ids}")
+    with open(args.ids, encoding="utf-8") as f:
+        ids = json.load(f)
+    remaps = load_remaps(args.remaps, args.game, ids.get("game_ids") or {})
+
+    if args.dsn:
+        n = run_batches(args.dsn, remaps, args.batch_size, args.dry_run, args.schema)
+        print(f"{migration_name(remaps)}: {n} row(s) {'would change' if args.dry_run else 'updated'}.", file=sys.stderr)
+        return
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write_psql_script(out, remaps, args.batch_size, args.dry_run)
+        print(f"Wrote SQL to {args.output}. Run it with psql against your DB.", file=sys.stderr)
+    else:
+        write_psql_script(sys.stdout, remaps, args.batch_size, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+On-disk cache of parsed league CSVs, so reruns only reparse sheets that changed.
+
+Entries are keyed by the SHA-256 of the file's bytes plus a version string for the parsing
+and conversion rules (see backfill_league.parse_rules_version). Editing a CSV changes its
+hash; changing a rule changes the version. Either way the old entry is simply never read
+again and ages out under the size limit (least recently used entries are evicted first).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".parse_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def file_digest(path: Path, data: bytes | None = None) -> str:
+    if data is not None:
+        return hashlib.sha256(data).hexdigest()
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """Load/store (scores, starting_words) per file; see module docstring for keying."""
+
+    def __init__(
+        self,
+        rules_version: str,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        rebuild: bool = False,
+    ):
+        self.rules_version = rules_version
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.rebuild = rebuild
+        self.hits = 0
+        self.misses = 0
+        self._digests: dict[Path, str] = {}
+
+    def _entry_path(self, path: Path, data: bytes | None = None) -> Path:
+        digest = self._digests.get(path)
+        if digest is None:
+            digest = self._digests[path] = file_digest(path, data)
+        return self.cache_dir / f"{digest[:32]}-{self.rules_version[:16]}.json"
+
+    def load(self, path: Path, data: bytes | None = None) -> tuple[list[dict], list[tuple[str, str]]] | None:
+        """
+        Cached (scores, starting_words) for path, or None on a miss (always None with rebuild).
+        data: the file's bytes, if the caller has already read them (hashed instead of rereading the file).
+        """
+        entry = self._entry_path(path, data)
+        if self.rebuild or not entry.exists():
+            self.misses += 1
+            return None
+        try:
+            with open(entry, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # Unreadable or half-written entry: treat as a miss; store() will overwrite it.
+            self.misses += 1
+            return None
+        os.utime(entry)  # mark as recently used for eviction
+        self.hits += 1
+        scores = [
+            {"date": d, "game_slug": slug, "player": player, "raw_score": score}
+            for d, slug, player, score in data["scores"]
+        ]
+        return scores, [tuple(w) for w in data["starting_words"]]
+
+    def store(self, path: Path, scores: list[dict], starting_words: list[tuple[str, str]]) -> None:
+        entry = self._entry_path(path)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(entry.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            # Scores as [date, game_slug, player, raw_score] rows: smaller, and faster to load than dicts.
+            rows = [[s["date"], s["game_slug"], s["player"], s["raw_score"]] for s in scores]
+            json.dump({"source": str(path), "scores": rows, "starting_words": starting_words}, f)
+        tmp.replace(entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob("*.json"):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry))
+            total += st.st_size
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
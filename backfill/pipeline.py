@@ -0,0 +1,208 @@
+"""
+--pipeline: run a backfill as asyncio stages joined by bounded queues, so disk reads, parsing and
+output writes overlap instead of happening one after another.
+
+  read    each file's bytes (or its parse-cache entry), in a thread
+  parse   process_file on those bytes, in --jobs worker processes (one by default)
+  merge   each file's results, strictly in input order, into the run's table (as the serial path does)
+  emit    write_json / write_sql over the deduplicated table, in a thread, cut into text chunks
+  write   the chunks to the output, in a thread
+
+read_q holds at most --pipeline-depth files' bytes and parse_q at most that many files in flight, so
+a slow merge stalls the reads instead of piling up results; the write queue holds a few chunks.
+The output depends on every file (a duplicate policy may keep a later occurrence; SQL checks ids
+across all players and sorts user_games), so emission starts after the last merge: reading, parsing
+and merging overlap with each other, and formatting with writing. The merged table goes through
+the same writers as the serial path, so the output is byte-identical.
+"""
+
+import asyncio
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from parse_cache import ParseCache
+
+STAGES = ("read", "parse", "merge", "emit", "write")
+DEFAULT_DEPTH = 4
+CHUNK_CHARS = 256 * 1024
+WRITE_QUEUE_CHUNKS = 8
+
+
+class _Abort(Exception):
+    """A stage's SystemExit, carried out of the event loop (SystemExit does not unwind tasks cleanly)."""
+
+
+def _timed_call(fn: Callable, *args):
+    """(seconds, fn(*args)), run in a thread or worker process; SystemExit comes back as _Abort."""
+    t0 = time.perf_counter()
+    try:
+        result = fn(*args)
+    except SystemExit as e:
+        raise _Abort(e.code) from None
+    return time.perf_counter() - t0, result
+
+
+def _run(coro):
+    try:
+        return asyncio.run(coro)
+    except _Abort as e:
+        raise SystemExit(e.args[0]) from None
+
+
+class Throughput:
+    """Per-stage items, amount (bytes or scores) and busy seconds, for the closing report."""
+
+    def __init__(self):
+        self.stages: dict[str, list] = {}  # name -> [items, amount, unit, seconds]
+        self.started = time.perf_counter()
+
+    def add(self, name: str, items: int, amount: int, unit: str, seconds: float) -> None:
+        s = self.stages.setdefault(name, [0, 0, unit, 0.0])
+        s[0] += items
+        s[1] += amount
+        s[3] += seconds
+
+    def report(self, out) -> None:
+        wall = time.perf_counter() - self.started
+        print(f"Pipeline: {wall:.2f} s end to end", file=out)
+        for name in (name for name in STAGES if name in self.stages):
+            items, amount, unit, seconds = self.stages[name]
+            if unit == "bytes":
+                size, rate = f"{amount / 1e6:.1f} MB", f"{amount / 1e6 / seconds:.1f} MB/s" if seconds else "-"
+            else:
+                size, rate = f"{amount:,} {unit}", f"{amount / seconds:,.0f} {unit}/s" if seconds else "-"
+            print(f"  {name:<6} {items} item(s), {size} in {seconds:.2f} s busy ({rate})", file=out)
+
+
+def parse_pipelined(
+    paths: list[Path],
+    parse: Callable,
+    merge: Callable,
+    jobs: int = 1,
+    cache: ParseCache | None = None,
+    depth: int = DEFAULT_DEPTH,
+    initializer: Callable | None = None,
+    initargs: tuple = (),
+    throughput: Throughput | None = None,
+) -> None:
+    """
+    Read, parse and merge paths as overlapping stages. parse(path, data) runs in a worker process
+    and returns (scores, starting_words, file_stats); merge(path, scores, starting_words, file_stats,
+    cached) is called in input order. Cache hits skip parse (file_stats None, cached True); misses
+    are stored after it.
+    """
+    throughput = throughput if throughput is not None else Throughput()
+    _run(_parse_stages(paths, parse, merge, max(1, jobs), cache, max(1, depth), initializer, initargs, throughput))
+
+
+async def _parse_stages(paths, parse, merge, jobs, cache, depth, initializer, initargs, throughput: Throughput):
+    loop = asyncio.get_running_loop()
+    read_q: asyncio.Queue = asyncio.Queue(depth)
+    parse_q: asyncio.Queue = asyncio.Queue(depth)
+
+    async def read():
+        for path in paths:
+            seconds, data = await asyncio.to_thread(_timed_call, path.read_bytes)
+            throughput.add("read", 1, len(data), "bytes", seconds)
+            hit = None if cache is None else await asyncio.to_thread(cache.load, path, data)
+            await read_q.put((path, None if hit is not None else data, hit))
+        await read_q.put(None)
+
+    async def dispatch(pool: ProcessPoolExecutor):
+        while (item := await read_q.get()) is not None:
+            path, data, hit = item
+            job = None if hit is not None else loop.run_in_executor(pool, _timed_call, parse, path, data)
+            await parse_q.put((path, job, hit))
+        await parse_q.put(None)
+
+    async def collect():
+        while (item := await parse_q.get()) is not None:
+            path, job, hit = item
+            if hit is not None:
+                scores, words = hit
+                file_stats = None
+            else:
+                seconds, (scores, words, file_stats) = await job
+                throughput.add("parse", 1, len(scores), "scores", seconds)
+                if cache is not None:
+                    await asyncio.to_thread(cache.store, path, scores, words)
+            t0 = time.perf_counter()
+            merge(path, scores, words, file_stats, hit is not None)
+            throughput.add("merge", 1, len(scores), "scores", time.perf_counter() - t0)
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=initializer, initargs=initargs) as pool:
+        await asyncio.gather(read(), dispatch(pool), collect())
+
+
+class _ChunkSink(io.TextIOBase):
+    """Text stream for the emit thread: collects writes into chunks and queues each for the write stage."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        self.loop = loop
+        self.queue = queue
+        self.parts: list[str] = []
+        self.size = 0
+        self.chars = 0
+        self.waited = 0.0  # seconds blocked on a full queue, not formatting
+
+    def write(self, s: str) -> int:
+        self.parts.append(s)
+        self.size += len(s)
+        self.chars += len(s)
+        if self.size >= CHUNK_CHARS:
+            self._hand_off()
+        return len(s)
+
+    def _hand_off(self) -> None:
+        if self.parts:
+            chunk = "".join(self.parts)
+            self.parts, self.size = [], 0
+            # Blocks while the queue is full: formatting waits for the disk rather than buffering the output
+            t0 = time.perf_counter()
+            asyncio.run_coroutine_threadsafe(self.queue.put(chunk), self.loop).result()
+            self.waited += time.perf_counter() - t0
+
+    def finish(self) -> None:
+        self._hand_off()
+        asyncio.run_coroutine_threadsafe(self.queue.put(None), self.loop).result()
+
+
+def write_pipelined(out, emit: Callable, throughput: Throughput | None = None) -> None:
+    """
+    emit(stream) formats the output into a stream in one thread while another writes the
+    text to out, chunk by chunk, through a bounded queue. out receives exactly what emit wrote.
+    """
+    throughput = throughput if throughput is not None else Throughput()
+    _run(_write_stages(out, emit, throughput))
+
+
+async def _write_stages(out, emit: Callable, throughput: Throughput):
+    queue: asyncio.Queue = asyncio.Queue(WRITE_QUEUE_CHUNKS)
+    sink = _ChunkSink(asyncio.get_running_loop(), queue)
+
+    def format_output():
+        try:
+            return _timed_call(emit, sink)
+        finally:
+            sink.finish()
+
+    async def write():
+        failed = None
+        while (chunk := await queue.get()) is not None:
+            if failed is not None:
+                continue  # keep draining so the emit thread is never left blocked on a full queue
+            try:
+                seconds, _ = await asyncio.to_thread(_timed_call, out.write, chunk)
+            except Exception as e:
+                failed = e
+                continue
+            throughput.add("write", 1, len(chunk), "chars", seconds)
+        if failed is not None:
+            raise failed
+
+    (seconds, _), _ = await asyncio.gather(asyncio.to_thread(format_output), write())
+    throughput.add("emit", 1, sink.chars, "chars", seconds - sink.waited)
+    await asyncio.to_thread(out.flush)
@@ -0,0 +1,637 @@
+#!/usr/bin/env python3
+"""
+Running per-player, per-game statistics, updated one score at a time and kept in a small state file.
+
+For every (player, game), and every (player, game, month), a RunningStats keeps:
+  - count, mean and variance (Welford's update; two states combine with Chan's formula);
+  - min and max, with the few smallest and largest values behind them (EXTREMES);
+  - the days played as runs of consecutive dates, giving the longest and current streaks;
+  - a QuantileSketch for percentiles within a fixed relative error (1% by default).
+Each score costs O(1) (appending a date at the end of its runs is the common case), and the state
+does not grow with the number of scores. The runs record which dates are already counted, so
+feeding the same scores again changes nothing: a watch or delta ingest can pass whatever it has
+and only new dates are added.
+
+A correction is a date whose value changes within one run's inputs, as it does in a watch run's
+growing ndjson, where a changed score is appended after the value first sent. The run's last value
+counts: the first one is retracted from the count, mean and variance (Welford's update in reverse),
+the sketch and the extremes, and the last one added. Corrected dates keep their new value in the
+state, so feeding the same inputs again does not retract it twice. When corrections use up a
+series' kept extremes, min/max are rebuilt from the run's values if it covers all of the series'
+dates, and reported as unknown otherwise. A sheet re-read with a changed value, but without the old
+one among the run's inputs, cannot be told from the counted value and is skipped; rebuild the state
+to pick it up.
+
+State files built from different inputs (files, months) can be merged as long as no (player,
+game) has the same date in both. --verify checks the result against a full recompute.
+
+Usage:
+  python3 rollups.py data/*.csv --state rollups.json                    # add scores, print per-month stats
+  python3 rollups.py backfill.ndjson --state rollups.json --report totals -o stats.csv
+  python3 rollups.py --merge a.json b.json --state all.json
+  python3 rollups.py data/*.csv --verify                                # incremental vs full recompute
+"""
+
+import argparse
+import csv
+import json
+import math
+import statistics
+import sys
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date
+from pathlib import Path
+
+FORMAT_VERSION = 2
+DEFAULT_ACCURACY = 0.01
+EXTREMES = 8  # smallest and largest values kept per series, so retracting the min or max can restore it
+PERCENTILES = (0.5, 0.9)
+REPORT_COLUMNS = (
+    "player", "game_slug", "month", "count", "mean", "stdev", "min", "max",
+    *(f"p{round(q * 100)}" for q in PERCENTILES), "longest_streak", "current_streak", "last_date",
+)
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch (DDSketch): a value x > 0 is counted in bucket ceil(log_gamma(x)),
+    with gamma = (1 + a) / (1 - a), so every bucket's midpoint is within a (the accuracy) of the values
+    in it. Negative values mirror into their own buckets and zeros are counted apart. Two sketches
+    with the same accuracy merge by adding bucket counts. Buckets grow with the log of the value
+    range, not with the number of values.
+    """
+
+    __slots__ = ("accuracy", "gamma", "_log_gamma", "zeros", "positive", "negative", "count")
+
+    def __init__(self, accuracy: float = DEFAULT_ACCURACY):
+        self.accuracy = accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.zeros = 0
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+        self.count = 0
+
+    def add(self, x: float) -> None:
+        if x > 0:
+            k = math.ceil(math.log(x) / self._log_gamma)
+            self.positive[k] = self.positive.get(k, 0) + 1
+        elif x < 0:
+            k = math.ceil(math.log(-x) / self._log_gamma)
+            self.negative[k] = self.negative.get(k, 0) + 1
+        else:
+            self.zeros += 1
+        self.count += 1
+
+    def remove(self, x: float) -> None:
+        """Take back one add(x) (x must have been added)."""
+        if x == 0:
+            self.zeros -= 1
+        else:
+            buckets = self.positive if x > 0 else self.negative
+            k = math.ceil(math.log(abs(x)) / self._log_gamma)
+            buckets[k] -= 1
+            if not buckets[k]:
+                del buckets[k]
+        self.count -= 1
+
+    def _value(self, k: int) -> float:
+        return 2 * self.gamma**k / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate of the value at rank floor(q * (count - 1)) in sorted order; None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.negative, reverse=True):
+            seen += self.negative[k]
+            if seen > rank:
+                return -self._value(k)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.positive):
+            seen += self.positive[k]
+            if seen > rank:
+                return self._value(k)
+        return self._value(max(self.positive))
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.accuracy != self.accuracy:
+            raise SystemExit(f"cannot merge quantile sketches of accuracy {self.accuracy} and {other.accuracy}")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for k, n in theirs.items():
+                mine[k] = mine.get(k, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def to_json(self) -> dict:
+        return {"zeros": self.zeros, "positive": self.positive, "negative": self.negative}
+
+    @classmethod
+    def from_json(cls, data: dict, accuracy: float) -> "QuantileSketch":
+        sketch = cls(accuracy)
+        sketch.zeros = data["zeros"]
+        sketch.positive = {int(k): n for k, n in data["positive"].items()}
+        sketch.negative = {int(k): n for k, n in data["negative"].items()}
+        sketch.count = sketch.zeros + sum(sketch.positive.values()) + sum(sketch.negative.values())
+        return sketch
+
+
+class RunningStats:
+    """Count, mean, variance, min/max, streaks and a quantile sketch over one series of dated scores."""
+
+    __slots__ = ("count", "mean", "m2", "min", "max", "lows", "highs", "runs", "sketch")
+
+    def __init__(self, accuracy: float = DEFAULT_ACCURACY):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared deviations from the mean
+        self.min: float | None = None
+        self.max: float | None = None
+        # Up to EXTREMES of the smallest and of the largest values, ascending: every value below
+        # lows[-1] (above highs[0]) is in them, and all values are while len(lows) == count
+        self.lows: list[float] = []
+        self.highs: list[float] = []
+        self.runs: list[list[int]] = []  # sorted, disjoint [first, last] date ordinals of consecutive days
+        self.sketch = QuantileSketch(accuracy)
+
+    def _add_day(self, day: int) -> bool:
+        """Record day in runs; False if it was already there."""
+        runs = self.runs
+        if runs and day > runs[-1][1]:
+            if day == runs[-1][1] + 1:
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+            return True
+        if not runs:
+            runs.append([day, day])
+            return True
+        # Out of order: find the first run ending at or after day
+        i = bisect_left(runs, day, key=lambda run: run[1])
+        if runs[i][0] <= day:
+            return False
+        joins_prev = i > 0 and runs[i - 1][1] == day - 1
+        joins_next = runs[i][0] == day + 1
+        if joins_prev and joins_next:
+            runs[i - 1][1] = runs[i][1]
+            del runs[i]
+        elif joins_prev:
+            runs[i - 1][1] = day
+        elif joins_next:
+            runs[i][0] = day
+        else:
+            runs.insert(i, [day, day])
+        return True
+
+    def add(self, day: str, x: float) -> bool:
+        """Count score x for ISO date day; False (and nothing changes) if day was already counted."""
+        if not self._add_day(date.fromisoformat(day).toordinal()):
+            return False
+        self._include(x)
+        return True
+
+    def replace(self, old: float, new: float) -> None:
+        """Retract old, the value counted for one of the dates, and count new for it instead."""
+        self._exclude(old)
+        self._include(new)
+
+    def _include(self, x: float) -> None:
+        if len(self.lows) == self.count or (self.lows and x <= self.lows[-1]):
+            insort(self.lows, x)
+            del self.lows[EXTREMES:]
+        if len(self.highs) == self.count or (self.highs and x >= self.highs[0]):
+            insort(self.highs, x)
+            del self.highs[:-EXTREMES]
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        self.sketch.add(x)
+        self._set_extremes()
+
+    def _exclude(self, x: float) -> None:
+        """Welford's update in reverse."""
+        if self.lows and x <= self.lows[-1]:
+            self.lows.remove(x)
+        if self.highs and x >= self.highs[0]:
+            self.highs.remove(x)
+        self.sketch.remove(x)
+        self.count -= 1
+        if self.count:
+            mean = self.mean
+            self.mean = (mean * (self.count + 1) - x) / self.count
+            self.m2 = max(self.m2 - (x - self.mean) * (x - mean), 0.0)
+        else:
+            self.mean = self.m2 = 0.0
+        self._set_extremes()
+
+    def _set_extremes(self) -> None:
+        self.min = self.lows[0] if self.lows else None
+        self.max = self.highs[-1] if self.highs else None
+
+    @property
+    def extremes_known(self) -> bool:
+        """False once corrections have retracted every kept low or high value."""
+        return not self.count or bool(self.lows and self.highs)
+
+    def restore_extremes(self, values: list[float]) -> None:
+        """Rebuild the kept extremes from every value counted (one per date)."""
+        ordered = sorted(values)
+        self.lows = ordered[:EXTREMES]
+        self.highs = ordered[-EXTREMES:]
+        self._set_extremes()
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold in stats over a disjoint set of dates."""
+        if not other.count:
+            return
+        runs = sorted(self.runs + [list(run) for run in other.runs])
+        merged: list[list[int]] = []
+        for run in runs:
+            if merged and run[0] <= merged[-1][1]:
+                raise SystemExit("cannot merge rollups: both cover the same date for one player and game")
+            if merged and run[0] == merged[-1][1] + 1:
+                merged[-1][1] = run[1]
+            else:
+                merged.append(run)
+        self.lows = _merged_lows(self.lows, self.count, other.lows, other.count)
+        self.highs = [-x for x in reversed(_merged_lows(
+            [-x for x in reversed(self.highs)], self.count, [-x for x in reversed(other.highs)], other.count
+        ))]
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta * delta * self.count * other.count / n
+        self.count = n
+        self._set_extremes()
+        self.runs = merged
+        self.sketch.merge(other.sketch)
+
+    def quantile(self, q: float) -> float | None:
+        """Sketch estimate of the q-quantile, kept within the exact min and max (when known)."""
+        estimate = self.sketch.quantile(q)
+        if estimate is not None and self.min is not None:
+            estimate = max(estimate, self.min)
+        if estimate is not None and self.max is not None:
+            estimate = min(estimate, self.max)
+        return estimate
+
+    @property
+    def variance(self) -> float | None:
+        """Sample variance (n - 1), as the sheets' and statistics.variance compute it."""
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    @property
+    def longest_streak(self) -> int:
+        return max((last - first + 1 for first, last in self.runs), default=0)
+
+    @property
+    def current_streak(self) -> int:
+        """Days in the run ending on the last date played."""
+        return self.runs[-1][1] - self.runs[-1][0] + 1 if self.runs else 0
+
+    @property
+    def last_date(self) -> str | None:
+        return date.fromordinal(self.runs[-1][1]).isoformat() if self.runs else None
+
+    def to_json(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "lows": self.lows,
+            "highs": self.highs,
+            "runs": [[date.fromordinal(a).isoformat(), date.fromordinal(b).isoformat()] for a, b in self.runs],
+            "sketch": self.sketch.to_json(),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict, accuracy: float) -> "RunningStats":
+        stats = cls(accuracy)
+        stats.count = data["count"]
+        stats.mean = data["mean"]
+        stats.m2 = data["m2"]
+        stats.min = data["min"]
+        stats.max = data["max"]
+        stats.lows = data["lows"]
+        stats.highs = data["highs"]
+        stats.runs = [[date.fromisoformat(a).toordinal(), date.fromisoformat(b).toordinal()] for a, b in data["runs"]]
+        stats.sketch = QuantileSketch.from_json(data["sketch"], accuracy)
+        return stats
+
+
+def _merged_lows(a: list[float], a_count: int, b: list[float], b_count: int) -> list[float]:
+    """Kept smallest values of two disjoint series (a holds all of its series' values when len(a) == a_count)."""
+    merged = sorted(a + b)
+    bounds = [side[-1] if side else -math.inf for side, n in ((a, a_count), (b, b_count)) if len(side) < n]
+    if bounds:
+        merged = [x for x in merged if x <= min(bounds)]
+    return merged[:EXTREMES]
+
+
+class Rollups:
+    """RunningStats per (player, game) in totals and per (player, game, month) in monthly."""
+
+    def __init__(self, accuracy: float = DEFAULT_ACCURACY):
+        self.accuracy = accuracy
+        self.totals: dict[tuple[str, str], RunningStats] = {}
+        self.monthly: dict[tuple[str, str, str], RunningStats] = {}
+        # (player, game, date) -> value counted after a correction; only corrected dates are here
+        self.corrected: dict[tuple[str, str, str], float] = {}
+        self.added = 0
+        self.replaced = 0  # corrections applied to dates already counted
+        self.skipped = 0  # scores on dates already counted
+
+    def add(self, player: str, game_slug: str, day: str, x: float, previous: float | None = None) -> bool:
+        """
+        Count a score; False if its date was already counted. previous is the value the same run
+        gave the date before x: if the date was counted, that (or the value of an earlier
+        correction) is retracted and x counted instead.
+        """
+        key = (player, game_slug)
+        stats = self.totals.get(key)
+        if stats is None:
+            stats = self.totals[key] = RunningStats(self.accuracy)
+        if not stats.add(day, x):
+            old = self.corrected.get((player, game_slug, day), previous)
+            if old is None or old == x:
+                self.skipped += 1
+                return False
+            stats.replace(old, x)
+            self.monthly[(player, game_slug, day[:7])].replace(old, x)
+            self.corrected[(player, game_slug, day)] = x
+            self.replaced += 1
+            return True
+        month_key = (player, game_slug, day[:7])
+        month = self.monthly.get(month_key)
+        if month is None:
+            month = self.monthly[month_key] = RunningStats(self.accuracy)
+        month.add(day, x)
+        self.added += 1
+        return True
+
+    def merge(self, other: "Rollups") -> None:
+        if other.accuracy != self.accuracy:
+            raise SystemExit(f"cannot merge rollups of accuracy {self.accuracy} and {other.accuracy}")
+        for mine, theirs in ((self.totals, other.totals), (self.monthly, other.monthly)):
+            for key, stats in theirs.items():
+                if key in mine:
+                    mine[key].merge(stats)
+                else:
+                    mine[key] = RunningStats.from_json(stats.to_json(), self.accuracy)
+        self.corrected.update(other.corrected)
+
+    def unknown_extremes(self) -> set[tuple]:
+        """Keys of totals and monthly series whose min/max corrections have used up."""
+        return {k for kept in (self.totals, self.monthly) for k, s in kept.items() if not s.extremes_known}
+
+    def restore_extremes(self, values: dict[tuple, list[float]]) -> None:
+        """Rebuild min/max of the series in values that list one value for every counted date."""
+        for key, series in values.items():
+            stats = (self.totals if len(key) == 2 else self.monthly).get(key)
+            if stats is not None and len(series) == stats.count:
+                stats.restore_extremes(series)
+
+    def save(self, path: Path) -> None:
+        state = {
+            "format": "backfill-rollups",
+            "version": FORMAT_VERSION,
+            "accuracy": self.accuracy,
+            "totals": {"|".join(k): s.to_json() for k, s in sorted(self.totals.items())},
+            "monthly": {"|".join(k): s.to_json() for k, s in sorted(self.monthly.items())},
+            "corrected": [[*k, x] for k, x in sorted(self.corrected.items())],
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "Rollups":
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("format") != "backfill-rollups" or state.get("version") != FORMAT_VERSION:
+            raise SystemExit(f"{path}: not a version {FORMAT_VERSION} rollups state file")
+        rollups = cls(state["accuracy"])
+        for key, data in state["totals"].items():
+            rollups.totals[tuple(key.split("|"))] = RunningStats.from_json(data, rollups.accuracy)
+        for key, data in state["monthly"].items():
+            rollups.monthly[tuple(key.split("|"))] = RunningStats.from_json(data, rollups.accuracy)
+        rollups.corrected = {(player, game, day): x for player, game, day, x in state["corrected"]}
+        return rollups
+
+
+def first_and_last(scores) -> dict[tuple[str, str, str], list[float]]:
+    """(player, game, date) -> [first, last] value among one run's (player, game, date, score) tuples."""
+    seen: dict[tuple[str, str, str], list[float]] = {}
+    for player, game, day, x in scores:
+        values = seen.get((player, game, day))
+        if values is None:
+            seen[(player, game, day)] = [x, x]
+        else:
+            values[1] = x
+    return seen
+
+
+def feed(rollups: Rollups, scores) -> None:
+    """
+    Add one run's scores: each date counts its last value, and a date already counted whose value
+    changed within the run is corrected. Then restore min/max that corrections used up, from the
+    run's values, for series the run covers completely.
+    """
+    seen = first_and_last(scores)
+    for (player, game, day), (first, last) in seen.items():
+        rollups.add(player, game, day, last, None if first == last else first)
+    unknown = rollups.unknown_extremes()
+    if unknown:
+        values: dict[tuple, list[float]] = defaultdict(list)
+        for (player, game, day), (_, last) in seen.items():
+            for key in ((player, game), (player, game, day[:7])):
+                if key in unknown:
+                    values[key].append(last)
+        rollups.restore_extremes(values)
+
+
+def report_rows(rollups: Rollups, which: str):
+    """REPORT_COLUMNS rows for totals (month blank), monthly, or both."""
+    groups = []
+    if which in ("totals", "all"):
+        groups.append(((player, game, ""), s) for (player, game), s in rollups.totals.items())
+    if which in ("monthly", "all"):
+        groups.append(rollups.monthly.items())
+    for group in groups:
+        for (player, game, month), s in sorted(group):
+            variance = s.variance
+            yield (
+                player, game, month, s.count, round(s.mean, 4),
+                "" if variance is None else round(math.sqrt(variance), 4), s.min, s.max,
+                *(round(s.quantile(q), 4) for q in PERCENTILES),
+                s.longest_streak, s.current_streak, s.last_date,
+            )
+
+
+def recompute_mismatches(rollups: Rollups, scores: list[tuple[str, str, str, float]]) -> list[str]:
+    """
+    Recompute every statistic from scratch over (player, game, date, score) tuples (the last score
+    given for a date counts) and list where rollups disagrees: exact for counts, min/max and streaks,
+    within 1e-9 relative for mean and variance, and within the sketch accuracy for percentiles.
+    """
+    series: dict[tuple, dict[str, float]] = {}
+    for player, game, day, x in scores:
+        series.setdefault((player, game), {})[day] = x
+    for (player, game), by_day in list(series.items()):
+        for day, x in by_day.items():
+            series.setdefault((player, game, day[:7]), {})[day] = x
+    problems = []
+    for label, kept in (("totals", rollups.totals), ("monthly", rollups.monthly)):
+        expected_keys = {k for k in series if len(k) == (2 if label == "totals" else 3)}
+        for key in expected_keys ^ kept.keys():
+            problems.append(f"{label} {'|'.join(key)}: {'missing' if key in expected_keys else 'unexpected'}")
+    for key, by_day in sorted(series.items()):
+        s = (rollups.totals if len(key) == 2 else rollups.monthly).get(key)
+        if s is None:
+            continue
+        values = [by_day[d] for d in sorted(by_day)]
+        ordinals = [date.fromisoformat(d).toordinal() for d in sorted(by_day)]
+        streaks, run = [], 1
+        for prev, cur in zip(ordinals, ordinals[1:]):
+            if cur == prev + 1:
+                run += 1
+            else:
+                streaks.append(run)
+                run = 1
+        streaks.append(run)
+        ordered = sorted(values)
+        checks = [
+            ("count", s.count, len(values), 0),
+            ("mean", s.mean, statistics.fmean(values), 1e-9),
+            ("variance", s.variance, statistics.variance(values) if len(values) > 1 else None, 1e-9),
+            ("min", s.min, ordered[0], 0),
+            ("max", s.max, ordered[-1], 0),
+            ("longest_streak", s.longest_streak, max(streaks), 0),
+            ("current_streak", s.current_streak, streaks[-1], 0),
+        ]
+        for q in PERCENTILES:
+            checks.append((f"p{round(q * 100)}", s.quantile(q), ordered[math.floor(q * (len(ordered) - 1))], rollups.accuracy))
+        for name, got, want, tolerance in checks:
+            if got is None or want is None:
+                ok = got is want
+            else:
+                ok = abs(got - want) <= tolerance * max(abs(want), 1e-12) if tolerance else got == want
+            if not ok:
+                problems.append(f"{'|'.join(key)} {name}: incremental {got}, recomputed {want}")
+    return problems
+
+
+def iter_scores(paths: list[Path]):
+    """(player, game_slug, date, score) for league sheets (parsed and cached as backfill_league.py does) and .ndjson output."""
+    from backfill_league import parse_files, parse_rules_version
+    from parse_cache import ParseCache
+    from score_table import ScoreTable
+
+    sheets = [p for p in paths if p.suffix.lower() != ".ndjson"]
+    for path in paths:
+        if path.suffix.lower() != ".ndjson":
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                if rec.get("type") == "score":
+                    yield rec["player"], rec["game_slug"], rec["date"], rec["raw_score"]
+    if sheets:
+        table = ScoreTable()
+        for path, scores, _ in parse_files(sheets, cache=ParseCache(parse_rules_version())):
+            table.extend(scores, source=str(path))
+        for d, slug, player, score, _ in table.deduplicated().rows():
+            yield player, slug, d, score
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Incremental per-player, per-game score statistics")
+    ap.add_argument("files", nargs="*", type=Path, help="League sheets (CSV/.xlsx) or backfill .ndjson output to add")
+    ap.add_argument("--state", type=Path, help="Rollups state file: read if it exists, then written back with the new scores")
+    ap.add_argument("--merge", type=Path, nargs="+", metavar="STATE", help="Merge these state files into --state (dates must not overlap)")
+    ap.add_argument("--accuracy", type=float, default=DEFAULT_ACCURACY, help=f"Percentile relative error for a new state (default: {DEFAULT_ACCURACY})")
+    ap.add_argument("--report", choices=("monthly", "totals", "all", "none"), default="monthly", help="Stats to print as CSV (default: monthly)")
+    ap.add_argument("-o", "--output", type=Path, help="Write the report to this file (default: stdout)")
+    ap.add_argument(
+        "--verify",
+        action="store_true",
+        help="Feed the files one at a time through a saved and reloaded state, then check it against a full recompute",
+    )
+    args = ap.parse_args()
+    if not args.files and not args.merge:
+        ap.error("give files to add or --merge state files")
+    if args.merge and not args.state:
+        ap.error("--merge writes --state")
+
+    rollups = Rollups.load(args.state) if args.state and args.state.exists() else Rollups(args.accuracy)
+    for path in args.merge or []:
+        rollups.merge(Rollups.load(path))
+
+    if args.verify:
+        import tempfile
+
+        # Each file is a run: a date keeps the first run's value unless a later run changes it
+        expected: dict[tuple[str, str, str], float] = {}
+        incremental = Rollups(rollups.accuracy)
+        added = replaced = 0
+        with tempfile.TemporaryDirectory() as tmp:
+            state = Path(tmp) / "rollups.json"
+            for path in args.files:
+                incremental.save(state)
+                incremental = Rollups.load(state)
+                scores = list(iter_scores([path]))
+                feed(incremental, scores)
+                added += incremental.added
+                replaced += incremental.replaced
+                for key, (first, last) in first_and_last(scores).items():
+                    if key not in expected or first != last:
+                        expected[key] = last
+        problems = recompute_mismatches(incremental, [(*key, x) for key, x in expected.items()])
+        for line in problems[:20]:
+            print(line, file=sys.stderr)
+        if problems:
+            raise SystemExit(f"Rollups: {len(problems)} mismatch(es) against a full recompute.")
+        print(
+            f"Rollups: {len(incremental.totals)} player/game and {len(incremental.monthly)} monthly series "
+            f"match a full recompute ({added} scores, {replaced} corrections).",
+            file=sys.stderr,
+        )
+        return
+
+    if args.files:
+        feed(rollups, iter_scores(args.files))
+        print(
+            f"Rollups: {rollups.added} score(s) added, {rollups.replaced} correction(s) to dates already counted, "
+            f"{rollups.skipped} already counted.",
+            file=sys.stderr,
+        )
+        unknown = rollups.unknown_extremes()
+        if unknown:
+            print(
+                f"Rollups: min/max of {len(unknown)} series unknown after corrections; "
+                "run with all of their inputs, or rebuild the state, to restore them.",
+                file=sys.stderr,
+            )
+    if args.state:
+        rollups.save(args.state)
+    if args.report != "none":
+        out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        try:
+            w = csv.writer(out, lineterminator="\n")
+            w.writerow(REPORT_COLUMNS)
+            w.writerows(report_rows(rollups, args.report))
+        finally:
+            if args.output:
+                out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Per-stage timings and counters for a backfill run (--stats / --stats-json).
+
+Nothing here is created unless stats are requested; the parsing code only checks
+`if stats is not None` once per file or row, so a normal run pays essentially nothing.
+"""
+
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# Counters reported per file and in total, in display order.
+COUNTERS = (
+    "rows_scanned",
+    "raw_rows",
+    "cells_parsed",
+    "blank_cells",
+    "invalid_cells",
+    "handicap_reversals",
+    "scores",
+    "duplicates_dropped",
+    "skipped_placeholder_ids",
+)
+STAGES = ("load", "layout", "extract", "dedupe", "emit")
+
+
+class _Timed:
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self.counts: Counter = Counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - t0
+
+
+class FileStats(_Timed):
+    """Timings and counters for one input file (picklable, so --jobs workers can return it)."""
+
+    def __init__(self, source: str):
+        super().__init__()
+        self.source = source
+        self.cached = False
+
+
+class RunStats(_Timed):
+    """Per-file stats plus run-level stages (dedupe, emit) and counters."""
+
+    def __init__(self):
+        super().__init__()
+        self.files: list[FileStats] = []
+
+    def total_timings(self) -> dict[str, float]:
+        out = dict.fromkeys(STAGES, 0.0)
+        for fs in self.files:
+            for name, t in fs.timings.items():
+                out[name] = out.get(name, 0.0) + t
+        for name, t in self.timings.items():
+            out[name] = out.get(name, 0.0) + t
+        return out
+
+    def total_counts(self) -> Counter:
+        total = Counter()
+        for fs in self.files:
+            total.update(fs.counts)
+        total.update(self.counts)
+        return total
+
+    def to_dict(self) -> dict:
+        return {
+            "files": [
+                {"source": fs.source, "cached": fs.cached, "timings": fs.timings, "counts": dict(fs.counts)}
+                for fs in self.files
+            ],
+            "total": {"timings": self.total_timings(), "counts": dict(self.total_counts())},
+        }
+
+    def write_json(self, path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def report(self, out) -> None:
+        """Human-readable summary: one line per file, then totals."""
+        for fs in self.files:
+            c = fs.counts
+            t = sum(fs.timings.values())
+            tag = " (cached)" if fs.cached else ""
+            print(
+                f"  {fs.source}{tag}: {t * 1000:.1f} ms, {c['rows_scanned']} rows, {c['cells_parsed']} cells, "
+                f"{c['scores']} scores, {c['blank_cells']} blank, {c['invalid_cells']} invalid, "
+                f"{c['handicap_reversals']} handicap reversals",
+                file=out,
+            )
+        timings = self.total_timings()
+        print("Stage times: " + ", ".join(f"{k} {v * 1000:.1f} ms" for k, v in timings.items()), file=out)
+        counts = self.total_counts()
+        print("Totals: " + ", ".join(f"{k} {counts[k]}" for k in COUNTERS), file=out)
+
+
+def stage(stats: _Timed | None, name: str):
+    """stats.stage(name), or a no-op context when stats are off."""
+    return stats.stage(name) if stats is not None else nullcontext()
@@ -0,0 +1,246 @@
+"""
+Indexed, read-only queries over a ScoreTable, for ad-hoc analysis of backfilled history.
+
+Rows are put in date order once (a counting sort over the table's date codes); a row's position in
+that order is its rank. Every index holds ranks, so everything shares one order:
+  - posting lists (array of ranks, ascending) per player, per game and per (player, game);
+  - the date index: the distinct dates, sorted, with the rank each one starts at, so a date range
+    is a contiguous rank interval and narrows any posting list with two bisects;
+  - one bitmap per day of the week over ranks, for weekday filters.
+query() picks the posting lists its filters need, cuts each to the date range, intersects them by
+leapfrogging (each list jumps ahead to the others' next rank with a bisect), and yields rows lazily,
+in date order, as ScoreTable.rows() tuples.
+
+  index = ScoreIndex(table)
+  index.query(player="stolowd", game="crossword", start="2024-01-01", end="2024-12-31", weekdays={"Sunday"})
+  index.ties("pyramid", start="2025-01-01")
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from score_table import ScoreTable
+
+Row = tuple[str, str, str, int | float, str | None]
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")  # date.weekday() order
+
+
+def _as_set(value: str | Iterable[str] | None) -> list[str] | None:
+    if value is None:
+        return None
+    return [value] if isinstance(value, str) else list(value)
+
+
+class ScoreIndex:
+    """Hash, date and weekday indexes over a ScoreTable (which must not change afterwards)."""
+
+    def __init__(self, table: ScoreTable):
+        self.table = table
+        n = len(table)
+        # Date order: counting sort of rows by the rank of their date code (stable within a date)
+        self.dates: list[str] = sorted(table.dates.values)
+        date_rank = array("I", bytes(4 * len(self.dates)))
+        for i, d in enumerate(self.dates):
+            date_rank[table.dates.codes[d]] = i
+        counts = [0] * (len(self.dates) + 1)
+        for code in table.date_codes:
+            counts[date_rank[code] + 1] += 1
+        for i in range(len(self.dates)):
+            counts[i + 1] += counts[i]
+        self.date_starts = array("I", counts)  # ranks of dates[i] are date_starts[i] .. date_starts[i + 1] - 1
+        order = array("I", bytes(4 * n))
+        fill = counts[:-1]
+        for row, code in enumerate(table.date_codes):
+            slot = date_rank[code]
+            order[fill[slot]] = row
+            fill[slot] += 1
+        self.order = order  # rank -> table row
+
+        # Posting lists of ranks (so already in date order)
+        players, games = table.player_codes, table.game_codes
+        self.by_player: dict[int, array] = {}
+        self.by_game: dict[int, array] = {}
+        self.by_player_game: dict[tuple[int, int], array] = {}
+        for rank, row in enumerate(order):
+            p, g = players[row], games[row]
+            for index, key in ((self.by_player, p), (self.by_game, g), (self.by_player_game, (p, g))):
+                postings = index.get(key)
+                if postings is None:
+                    postings = index[key] = array("I")
+                postings.append(rank)
+
+        # One bit per rank for each weekday, set a whole date (a run of ranks) at a time
+        self.weekday_bitmaps = [bytearray((n + 7) // 8) for _ in range(7)]
+        for i, d in enumerate(self.dates):
+            _set_bits(self.weekday_bitmaps[date.fromisoformat(d).weekday()], self.date_starts[i], self.date_starts[i + 1])
+
+    @classmethod
+    def from_files(cls, paths: list[Path], jobs: int = 1) -> "ScoreIndex":
+        """Index the deduplicated scores of league sheets, parsed (and cached) as backfill_league.py does."""
+        from backfill_league import parse_files, parse_rules_version
+        from parse_cache import ParseCache
+
+        table = ScoreTable()
+        for path, scores, _ in parse_files(paths, jobs, ParseCache(parse_rules_version())):
+            table.extend(scores, source=str(path))
+        return cls(table.deduplicated())
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _rank_range(self, start: str | None, end: str | None) -> tuple[int, int]:
+        """[lo, hi) ranks of rows dated start..end (inclusive ISO dates; None is open)."""
+        lo = 0 if start is None else self.date_starts[bisect_left(self.dates, start)]
+        hi = len(self.order) if end is None else self.date_starts[bisect_right(self.dates, end)]
+        return lo, max(lo, hi)
+
+    def _cut(self, lists: list[array], lo: int, hi: int) -> tuple[array, int, int]:
+        """One (postings, start, stop) slice covering ranks [lo, hi) of lists (merged when several)."""
+        cuts = [(p, bisect_left(p, lo), bisect_left(p, hi)) for p in lists]
+        if len(cuts) == 1:
+            return cuts[0]
+        merged = array("I", sorted(r for p, start, stop in cuts for r in p[start:stop]))
+        return merged, 0, len(merged)
+
+    def _weekday_mask(self, weekdays: Iterable[str | int]) -> bytearray:
+        days = {WEEKDAYS.index(d) if isinstance(d, str) else d for d in weekdays}
+        if len(days) == 1:
+            return self.weekday_bitmaps[days.pop()]
+        combined = 0
+        for d in days:
+            combined |= int.from_bytes(self.weekday_bitmaps[d], "little")
+        return bytearray(combined.to_bytes(len(self.weekday_bitmaps[0]), "little"))
+
+    def _plan(self, player, game, start, end, weekdays):
+        """
+        ([(postings, start, stop)] slices to intersect, or [] for every rank; the [lo, hi) rank range;
+        weekday mask or None), or None when nothing can match.
+        """
+        players, games = _as_set(player), _as_set(game)
+        player_codes = None if players is None else [self.table.players.codes[p] for p in players if p in self.table.players.codes]
+        game_codes = None if games is None else [self.table.games.codes[g] for g in games if g in self.table.games.codes]
+        if player_codes is not None and game_codes is not None:
+            pairs = [(p, g) for p in player_codes for g in game_codes]
+            dimensions = [[self.by_player_game[k] for k in pairs if k in self.by_player_game]]
+        else:
+            dimensions = []
+            if player_codes is not None:
+                dimensions.append([self.by_player[k] for k in player_codes])
+            if game_codes is not None:
+                dimensions.append([self.by_game[k] for k in game_codes])
+        if any(not lists for lists in dimensions):
+            return None
+        lo, hi = self._rank_range(start, end)
+        cuts = [self._cut(lists, lo, hi) for lists in dimensions]
+        mask = None if weekdays is None else self._weekday_mask(weekdays)
+        return sorted(cuts, key=lambda c: c[2] - c[1]), (lo, hi), mask
+
+    def ranks(
+        self,
+        player: str | Iterable[str] | None = None,
+        game: str | Iterable[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        weekdays: Iterable[str | int] | None = None,
+    ) -> Iterator[int]:
+        """Ranks of rows matching every given filter, ascending (see query())."""
+        plan = self._plan(player, game, start, end, weekdays)
+        if plan is None:
+            return iter(())
+        cuts, (lo, hi), mask = plan
+        found = _intersect(cuts) if cuts else iter(range(lo, hi))
+        if mask is not None:
+            found = (r for r in found if mask[r >> 3] >> (r & 7) & 1)
+        return found
+
+    def query(
+        self,
+        player: str | Iterable[str] | None = None,
+        game: str | Iterable[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        weekdays: Iterable[str | int] | None = None,
+    ) -> Iterator[Row]:
+        """
+        Lazily yield (date, game_slug, player, raw_score, source) for rows matching every filter, in
+        date order. player and game take one name or several (any of them); start and end are
+        inclusive ISO dates; weekdays are names ("Sunday") or numbers (Monday = 0).
+        """
+        order = self.order
+        return self.table.rows(order[r] for r in self.ranks(player, game, start, end, weekdays))
+
+    def count(
+        self,
+        player: str | Iterable[str] | None = None,
+        game: str | Iterable[str] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        weekdays: Iterable[str | int] | None = None,
+    ) -> int:
+        """How many rows query() would yield; two bisects when a single posting list (or none) is involved."""
+        plan = self._plan(player, game, start, end, weekdays)
+        if plan is None:
+            return 0
+        cuts, (lo, hi), mask = plan
+        if mask is None and len(cuts) <= 1:
+            return cuts[0][2] - cuts[0][1] if cuts else hi - lo
+        return sum(1 for _ in self.ranks(player, game, start, end, weekdays))
+
+    def ties(
+        self, game: str, start: str | None = None, end: str | None = None, min_players: int = 2
+    ) -> Iterator[tuple[str, int | float, list[str]]]:
+        """(date, score, players) for each score at least min_players players share on one date of game."""
+        rows = self.query(game=game, start=start, end=end)
+        for d, day_rows in groupby(rows, key=lambda r: r[0]):
+            by_score: dict = {}
+            for _, _, player, score, _ in day_rows:
+                by_score.setdefault(score, []).append(player)
+            for score, players in by_score.items():
+                if len(players) >= min_players:
+                    yield d, score, sorted(players)
+
+
+def _intersect(cuts: list[tuple[array, int, int]]) -> Iterator[int]:
+    """Ranks present in every (postings, lo, hi) slice, ascending; shortest slice first."""
+    if len(cuts) == 1:
+        postings, lo, hi = cuts[0]
+        yield from postings[lo:hi]
+        return
+    driver, lo, hi = cuts[0]
+    others = [[postings, olo, ohi] for postings, olo, ohi in cuts[1:]]
+    i = lo
+    while i < hi:
+        target = driver[i]
+        matched = True
+        for other in others:
+            postings, pos, ohi = other
+            pos = bisect_left(postings, target, pos, ohi)
+            other[1] = pos
+            if pos == ohi:
+                return
+            if postings[pos] != target:
+                # Leap the driver forward to the other list's next rank
+                i = bisect_left(driver, postings[pos], i + 1, hi)
+                matched = False
+                break
+        if matched:
+            yield target
+            i += 1
+
+
+def _set_bits(bitmap: bytearray, lo: int, hi: int) -> None:
+    """Set bits lo .. hi - 1 (bit r is bitmap[r >> 3] & (1 << (r & 7)))."""
+    while lo < hi and lo & 7:
+        bitmap[lo >> 3] |= 1 << (lo & 7)
+        lo += 1
+    full = (hi - lo) >> 3
+    if full:
+        bitmap[lo >> 3 : (lo >> 3) + full] = b"\xff" * full
+        lo += full << 3
+    while lo < hi:
+        bitmap[lo >> 3] |= 1 << (lo & 7)
+        lo += 1
@@ -0,0 +1,173 @@
+"""
+Compact, column-oriented store for parsed scores.
+
+A list of score dicts repeats the same date/game/player/source strings on every entry.
+ScoreTable dictionary-encodes those four columns to small integer codes held in
+array.array columns, keeps scores as float64, and indexes (player, game, date) as it goes,
+so duplicate detection needs no second pass.
+"""
+
+from array import array
+from typing import Iterable, Iterator
+
+
+class _Dictionary:
+    """Value <-> small integer code, in first-seen order."""
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values: list = []
+        self.codes: dict = {}
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _pack_key(player: int, game: int, date: int) -> int:
+    return (player << 48) | (game << 32) | date
+
+
+class ScoreTable:
+    """
+    Scores as parallel columns. Row i is
+    (dates[date_codes[i]], games[game_codes[i]], players[player_codes[i]], scores[i], sources[source_codes[i]]).
+    """
+
+    def __init__(self):
+        self.dates = _Dictionary()
+        self.games = _Dictionary()
+        self.players = _Dictionary()
+        self.sources = _Dictionary()
+        self.date_codes = array("I")
+        self.game_codes = array("H")
+        self.player_codes = array("H")
+        self.source_codes = array("H")
+        self.scores = array("d")
+        self.is_int = array("B")  # 1 if raw_score was an int (so 5 stays 5, not 5.0, on export)
+        self._first_row: dict[int, int] = {}  # packed (player, game, date) -> first row with that key
+        self._duplicate_rows: dict[int, list[int]] = {}  # packed key -> every row, for keys seen twice+
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "ScoreTable":
+        table = cls()
+        for s in records:
+            table.append(s["date"], s["game_slug"], s["player"], s["raw_score"], s.get("_source"))
+        return table
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def append(self, date: str, game_slug: str, player: str, raw_score, source: str | None = None) -> int:
+        """Add one score; returns its row number."""
+        d = self.dates.encode(date)
+        g = self.games.encode(game_slug)
+        p = self.players.encode(player)
+        row = len(self.scores)
+        self.date_codes.append(d)
+        self.game_codes.append(g)
+        self.player_codes.append(p)
+        self.source_codes.append(self.sources.encode(source))
+        self.scores.append(raw_score)
+        self.is_int.append(isinstance(raw_score, int))
+        key = _pack_key(p, g, d)
+        first = self._first_row.setdefault(key, row)
+        if first != row:
+            self._duplicate_rows.setdefault(key, [first]).append(row)
+        return row
+
+    def extend(self, scores: Iterable[dict], source: str | None = None) -> None:
+        """Append process_file() score dicts, tagging each with source."""
+        for s in scores:
+            self.append(s["date"], s["game_slug"], s["player"], s["raw_score"], source)
+
+    def row(self, i: int) -> tuple[str, str, str, int | float, str | None]:
+        """(date, game_slug, player, raw_score, source) for row i."""
+        score = self.scores[i]
+        return (
+            self.dates.values[self.date_codes[i]],
+            self.games.values[self.game_codes[i]],
+            self.players.values[self.player_codes[i]],
+            int(score) if self.is_int[i] else score,
+            self.sources.values[self.source_codes[i]],
+        )
+
+    def rows(self, indices: Iterable[int] | None = None) -> Iterator[tuple[str, str, str, int | float, str | None]]:
+        """Yield row tuples (see row()) for indices, or for every row in order."""
+        dates, games, players, sources = (
+            self.dates.values, self.games.values, self.players.values, self.sources.values
+        )
+        for i in range(len(self.scores)) if indices is None else indices:
+            score = self.scores[i]
+            yield (
+                dates[self.date_codes[i]],
+                games[self.game_codes[i]],
+                players[self.player_codes[i]],
+                int(score) if self.is_int[i] else score,
+                sources[self.source_codes[i]],
+            )
+
+    def __iter__(self) -> Iterator[dict]:
+        """Score dicts in the backfill JSON shape; _source is included when the row has one."""
+        for date, game_slug, player, raw_score, source in self.rows():
+            rec = {"date": date, "game_slug": game_slug, "player": player, "raw_score": raw_score}
+            if source is not None:
+                rec["_source"] = source
+            yield rec
+
+    def to_records(self) -> list[dict]:
+        return list(self)
+
+    def _key(self, player: str, game_slug: str, date: str) -> int | None:
+        p = self.players.codes.get(player)
+        g = self.games.codes.get(game_slug)
+        d = self.dates.codes.get(date)
+        if p is None or g is None or d is None:
+            return None
+        return _pack_key(p, g, d)
+
+    def key_rows(self, player: str, game_slug: str, date: str) -> list[int]:
+        """Every row number holding (player, game_slug, date), in insertion order."""
+        key = self._key(player, game_slug, date)
+        if key is None or key not in self._first_row:
+            return []
+        return self._duplicate_rows.get(key) or [self._first_row[key]]
+
+    def get(self, player: str, game_slug: str, date: str):
+        """raw_score of the first row for (player, game_slug, date), or None."""
+        key = self._key(player, game_slug, date)
+        row = self._first_row.get(key) if key is not None else None
+        return None if row is None else self.row(row)[3]
+
+    def duplicates(self) -> dict[tuple[str, str, str], list[str | None]]:
+        """(player, game_slug, date) -> source of every occurrence, for keys that occur more than once."""
+        out = {}
+        for rows in self._duplicate_rows.values():
+            date, game_slug, player, _, _ = self.row(rows[0])
+            out[(player, game_slug, date)] = [self.sources.values[self.source_codes[i]] for i in rows]
+        return out
+
+    def conflict_rows(self) -> Iterator[list[int]]:
+        """Row numbers of each key that occurs more than once, in insertion order."""
+        return iter(self._duplicate_rows.values())
+
+    def without_rows(self, drop: set[int]) -> "ScoreTable":
+        """A new table without the given row numbers, otherwise in the same order."""
+        table = ScoreTable()
+        keep = (i for i in range(len(self.scores)) if i not in drop)
+        for date, game_slug, player, raw_score, source in self.rows(keep):
+            table.append(date, game_slug, player, raw_score, source)
+        return table
+
+    def deduplicated(self) -> "ScoreTable":
+        """A new table keeping only the first occurrence of each (player, game, date)."""
+        if not self._duplicate_rows:
+            return self
+        table = ScoreTable()
+        for date, game_slug, player, raw_score, source in self.rows(sorted(self._first_row.values())):
+            table.append(date, game_slug, player, raw_score, source)
+        return table
@@ -0,0 +1,141 @@
+"""
+Delta backfill (--diff SNAPSHOT): compare parsed rows with an export of what the database
+already has and emit only the INSERTs, UPDATEs and (with --diff-delete) DELETEs needed.
+
+A snapshot is a CSV with a header row, or JSON (a list of row objects, or an object with
+"scores" and/or "league_starting_words" lists), exported from public.scores
+(user_id, game_id, date, score) or public.league_starting_words (league_id, date, word), e.g.
+  \\copy (select user_id, game_id, date, score from scores) to 'scores.csv' csv header
+Several snapshots can be given; each file's columns say which table it holds. A table with no
+snapshot is left out of the output rather than re-inserted in full.
+"""
+
+import csv
+import json
+from pathlib import Path
+
+from sql_output import SqlWriter, sql_literal
+
+# table -> (key columns, value column)
+DIFF_TABLES = {
+    "public.scores": (("user_id", "game_id", "date"), "score"),
+    "public.league_starting_words": (("league_id", "date"), "word"),
+}
+
+
+class Snapshot:
+    """Hash index per table: key tuple -> current value."""
+
+    def __init__(self):
+        self.rows: dict[str, dict[tuple, object]] = {table: {} for table in DIFF_TABLES}
+        self.tables: set[str] = set()  # tables at least one snapshot file covered
+
+    def add(self, record: dict, source: Path) -> None:
+        for table, (key_cols, value_col) in DIFF_TABLES.items():
+            if value_col in record and all(c in record for c in key_cols):
+                key = tuple(str(record[c]) for c in key_cols)
+                self.rows[table][key] = record[value_col]
+                self.tables.add(table)
+                return
+        raise SystemExit(f"{source}: snapshot rows need user_id, game_id, date, score or league_id, date, word")
+
+    @classmethod
+    def load(cls, paths: list[Path]) -> "Snapshot":
+        snap = cls()
+        for path in paths:
+            if path.suffix.lower() == ".json":
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    records = [r for key in ("scores", "league_starting_words") for r in data.get(key) or []]
+                else:
+                    records = data
+                for record in records:
+                    snap.add(record, path)
+            else:
+                with open(path, newline="", encoding="utf-8") as f:
+                    for record in csv.DictReader(f):
+                        snap.add(record, path)
+        return snap
+
+
+def _same_value(old, new) -> bool:
+    if isinstance(new, (int, float)):
+        try:
+            return float(old) == float(new)
+        except (TypeError, ValueError):
+            return False
+    return str(old) == str(new)
+
+
+class DiffWriter:
+    """
+    write_rows() filter in front of a SqlWriter: rows already in the snapshot with the same value
+    are dropped, new rows are inserted, changed rows become UPDATEs. With delete=True, snapshot
+    rows that the parsed data no longer has are deleted — only for dates (and, for scores,
+    user/game pairs) the parsed data covers, so diffing one month never touches the others.
+    user_games rows are kept only for user/game pairs that gained a score; league_game rows are
+    not part of a snapshot and are left out.
+    """
+
+    def __init__(self, writer: SqlWriter, snapshot: Snapshot, delete: bool = False):
+        self.writer = writer
+        self.snapshot = snapshot
+        self.delete = delete
+        self.inserts = 0
+        self.updates = 0
+        self.deletes = 0
+        self.unchanged = 0
+        self._inserted_pairs: set[tuple] = set()
+
+    @property
+    def statements(self) -> int:
+        return self.writer.statements
+
+    @property
+    def rows(self):
+        return self.writer.rows
+
+    def write_rows(self, table: str, columns: tuple[str, ...], rows, on_conflict: str | None = None) -> int:
+        if table == "public.user_games":
+            rows = [r for r in rows if tuple(r) in self._inserted_pairs]
+            return self.writer.write_rows(table, columns, rows, on_conflict)
+        if table not in self.snapshot.tables:
+            return 0
+        key_cols, value_col = DIFF_TABLES[table]
+        key_idx = [columns.index(c) for c in key_cols]
+        value_idx = columns.index(value_col)
+        current = self.snapshot.rows[table]
+        seen: set[tuple] = set()
+        updates: list[tuple] = []
+
+        def new_rows():
+            for row in rows:
+                key = tuple(str(row[i]) for i in key_idx)
+                seen.add(key)
+                if key not in current:
+                    self.inserts += 1
+                    if table == "public.scores":
+                        self._inserted_pairs.add(key[:2])
+                    yield row
+                elif _same_value(current[key], row[value_idx]):
+                    self.unchanged += 1
+                else:
+                    updates.append(key + (row[value_idx],))
+
+        n = self.writer.write_rows(table, columns, new_rows(), on_conflict)
+        where = " AND ".join(f"{c} = {{}}" for c in key_cols)
+        for *key, value in updates:
+            cond = where.format(*(sql_literal(k) for k in key))
+            self.writer.write_statement(f"UPDATE {table} SET {value_col} = {sql_literal(value)} WHERE {cond};")
+        self.updates += len(updates)
+        if self.delete:
+            # Scope: dates present in the parsed rows, and for scores their (user_id, game_id) pairs
+            dates = {key[-1] for key in seen}
+            groups = {key[:-1] for key in seen}
+            for key in current:
+                if key not in seen and key[-1] in dates and key[:-1] in groups:
+                    cond = where.format(*(sql_literal(k) for k in key))
+                    self.writer.write_statement(f"DELETE FROM {table} WHERE {cond};")
+                    self.deletes += 1
+        return n
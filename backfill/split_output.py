@@ -0,0 +1,148 @@
+"""
+--split-by month|year: SQL output as one file per date period, so the periods can load concurrently.
+
+  manifest.json                 split, format, load order, and each file's period, date range and row counts
+  prologue.sql                  league_game and user_games rows (load this first)
+  scores_2024-03.sql, ...       one per period: that period's scores and league_starting_words
+
+Every file is one transaction and needs nothing from the others but the prologue. The scores key
+(user_id, game_id, date) includes the date, so two period files never touch the same row and any
+number of psql sessions can load them at once:
+
+  psql "$DB" -f out/prologue.sql && ls out/scores_*.sql | xargs -P 4 -n 1 psql "$DB" -f
+
+Periods are the partitions of supabase/migration_partition_scores.sql. With --create-partitions the
+prologue creates any missing ones (public.ensure_scores_partition), so each period file loads into
+its own partition.
+"""
+
+import json
+import shutil
+from collections import Counter
+from datetime import date
+from pathlib import Path
+
+from sql_output import SqlWriter, sql_literal
+
+SPLIT_PERIODS = ("month", "year")
+# Tables whose rows go to the period file of their date column; the rest go to the prologue
+DATED_TABLES = {"public.scores": "date", "public.league_starting_words": "date"}
+FORMAT_VERSION = 1
+
+
+def period_of(day: str, split_by: str) -> str:
+    """'2024-03-17' -> '2024-03' (month) or '2024' (year)."""
+    return day[:7] if split_by == "month" else day[:4]
+
+
+def period_bounds(period: str) -> tuple[str, str]:
+    """[start, end) of a period as ISO dates: '2024-03' -> ('2024-03-01', '2024-04-01')."""
+    if len(period) == 4:
+        year = int(period)
+        return date(year, 1, 1).isoformat(), date(year + 1, 1, 1).isoformat()
+    year, month = int(period[:4]), int(period[5:7])
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(year, month, 1).isoformat(), end.isoformat()
+
+
+def partition_name(period: str) -> str:
+    """The scores partition for a period, as ensure_scores_partition names it: scores_2024_03, scores_2024."""
+    return "scores_" + period.replace("-", "_")
+
+
+class SplitWriter:
+    """
+    Collect rows per output file (write_rows routes dated tables by period, everything else to the
+    prologue), then write the directory with finish(). Rows are grouped before anything is written
+    because a period's scores and starting words arrive in separate write_rows calls.
+    """
+
+    def __init__(self, split_by: str, fmt: str, batch_size: int):
+        if split_by not in SPLIT_PERIODS:
+            raise ValueError(f"unknown split: {split_by}")
+        self.split_by = split_by
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.prologue: list[tuple] = []  # (table, columns, rows, on_conflict)
+        self.periods: dict[str, list[tuple]] = {}  # period -> [(table, columns, rows, on_conflict)]
+        self.statements = 0
+        self.rows = Counter()  # table -> rows written
+
+    def write_rows(self, table: str, columns: tuple[str, ...], rows, on_conflict: str | None = None) -> int:
+        date_column = DATED_TABLES.get(table)
+        if date_column is None:
+            rows = list(rows)
+            self.prologue.append((table, columns, rows, on_conflict))
+            n = len(rows)
+        else:
+            i = columns.index(date_column)
+            by_period: dict[str, list] = {}
+            for row in rows:
+                by_period.setdefault(period_of(row[i], self.split_by), []).append(row)
+            for period, period_rows in by_period.items():
+                self.periods.setdefault(period, []).append((table, columns, period_rows, on_conflict))
+            n = sum(len(r) for r in by_period.values())
+        self.rows[table] += n
+        return n
+
+    def _write_file(self, path: Path, statements: list[str], tables: list[tuple]) -> dict:
+        with open(path, "w", encoding="utf-8") as f:
+            writer = SqlWriter(f, self.fmt, self.batch_size)
+            writer.write_statement("BEGIN;")
+            for sql in statements:
+                writer.write_statement(sql)
+            for table, columns, rows, on_conflict in tables:
+                writer.write_rows(table, columns, rows, on_conflict)
+            writer.write_statement("COMMIT;")
+            f.write("\n")
+        self.statements += writer.statements
+        return dict(sorted(writer.rows.items()))
+
+    def finish(self, directory: Path, create_partitions: bool = False) -> dict:
+        """
+        Write the prologue, period files and manifest.json to directory and return the manifest.
+        Files go to a sibling temp directory first, so a failed run leaves a previous split untouched.
+        """
+        periods = sorted(self.periods)
+        tmp = directory.with_name(directory.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            ensure = []
+            if create_partitions:
+                ensure = [
+                    f"SELECT public.ensure_scores_partition({sql_literal(start)}, {sql_literal(end)});"
+                    for start, end in map(period_bounds, periods)
+                ]
+            manifest = {
+                "format": "backfill-split",
+                "version": FORMAT_VERSION,
+                "split_by": self.split_by,
+                "sql_format": self.fmt,
+                "prologue": {"file": "prologue.sql", "rows": self._write_file(tmp / "prologue.sql", ensure, self.prologue)},
+                "periods": [],
+            }
+            for period in periods:
+                name = f"scores_{period}.sql"
+                start, end = period_bounds(period)
+                rows = self._write_file(tmp / name, [], self.periods[period])
+                manifest["periods"].append(
+                    {
+                        "period": period,
+                        "file": name,
+                        "start": start,
+                        "end": end,
+                        "partition": partition_name(period),
+                        "rows": rows,
+                    }
+                )
+            with open(tmp / "manifest.json", "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            old = directory.with_name(directory.name + ".old")
+            if directory.exists():
+                directory.rename(old)
+            tmp.rename(directory)
+            shutil.rmtree(old, ignore_errors=True)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return manifest
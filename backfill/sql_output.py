@@ -0,0 +1,138 @@
+"""
+Streaming SQL writer for backfill output.
+
+Statements are written to the output as they are produced; only counters are kept,
+so the full SQL text never sits in memory.
+
+Formats:
+  insert    one INSERT per row (default; what older runs produced)
+  multirow  batched INSERT ... VALUES (...), (...); with --batch-size rows per statement
+  copy      COPY <table> (...) FROM STDIN blocks (psql -f runs these inline)
+"""
+
+from collections import Counter
+from itertools import chain, islice
+
+SQL_FORMATS = ("insert", "multirow", "copy")
+DEFAULT_BATCH_SIZE = 500
+
+
+def sql_literal(val) -> str:
+    """Render a Python value as a SQL literal: None -> NULL, numbers as-is, str quoted."""
+    if val is None:
+        return "NULL"
+    if isinstance(val, str):
+        return "'" + val.replace("'", "''") + "'"
+    return str(val)
+
+
+def copy_field(val) -> str:
+    """Render a value for COPY ... FROM STDIN text format (tab-separated, \\N for NULL)."""
+    if val is None:
+        return r"\N"
+    s = str(val)
+    return (
+        s.replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class SqlWriter:
+    """Write rows for one table at a time as INSERT, multi-row INSERT or COPY."""
+
+    def __init__(self, out, fmt: str = "insert", batch_size: int = DEFAULT_BATCH_SIZE):
+        if fmt not in SQL_FORMATS:
+            raise ValueError(f"unknown SQL format: {fmt}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.out = out
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.statements = 0
+        self.rows = Counter()  # table -> rows written
+        self._started = False
+
+    def _emit(self, text: str) -> None:
+        # Statements are separated by newlines (no trailing newline, like "\n".join(lines)).
+        if self._started:
+            self.out.write("\n")
+        self.out.write(text)
+        self._started = True
+        self.statements += 1
+
+    def write_statement(self, sql: str) -> None:
+        """Write one complete statement (e.g. an UPDATE or DELETE) as-is."""
+        self._emit(sql)
+
+    def write_rows(self, table: str, columns: tuple[str, ...], rows, on_conflict: str | None = None) -> int:
+        """
+        Write every row (a tuple matching columns) for table. Returns the number of rows written.
+        on_conflict is the conflict clause without the leading ON CONFLICT, e.g. "(game_id, user_id) DO NOTHING".
+        """
+        if self.fmt == "copy":
+            n = self._write_copy(table, columns, rows, on_conflict)
+        elif self.fmt == "multirow":
+            n = self._write_multirow(table, columns, rows, on_conflict)
+        else:
+            n = self._write_insert(table, columns, rows, on_conflict)
+        self.rows[table] += n
+        return n
+
+    def _write_insert(self, table, columns, rows, on_conflict) -> int:
+        cols = ", ".join(columns)
+        suffix = f" ON CONFLICT {on_conflict}" if on_conflict else ""
+        n = 0
+        for row in rows:
+            values = ", ".join(sql_literal(v) for v in row)
+            self._emit(f"INSERT INTO {table} ({cols}) VALUES ({values}){suffix};")
+            n += 1
+        return n
+
+    def _write_multirow(self, table, columns, rows, on_conflict) -> int:
+        cols = ", ".join(columns)
+        suffix = f"\nON CONFLICT {on_conflict}" if on_conflict else ""
+        it = iter(rows)
+        n = 0
+        while True:
+            batch = list(islice(it, self.batch_size))
+            if not batch:
+                break
+            values = ",\n".join(
+                "  (" + ", ".join(sql_literal(v) for v in row) + ")" for row in batch
+            )
+            self._emit(f"INSERT INTO {table} ({cols}) VALUES\n{values}{suffix};")
+            n += len(batch)
+        return n
+
+    def _write_copy(self, table, columns, rows, on_conflict) -> int:
+        it = iter(rows)
+        first = next(it, None)
+        if first is None:
+            return 0
+        cols = ", ".join(columns)
+        target = table
+        if on_conflict:
+            # COPY cannot skip conflicting rows, so stage into a temp table and merge from it.
+            target = "backfill_stage_" + table.rsplit(".", 1)[-1]
+            self._emit(f"CREATE TEMP TABLE {target} (LIKE {table} INCLUDING DEFAULTS);")
+        # Header, rows and terminator are written piecewise so a large COPY is never built as one string.
+        if self._started:
+            self.out.write("\n")
+        self._started = True
+        self.out.write(f"COPY {target} ({cols}) FROM STDIN;\n")
+        n = 0
+        for row in chain((first,), it):
+            self.out.write("\t".join(copy_field(v) for v in row))
+            self.out.write("\n")
+            n += 1
+        self.out.write("\\.")
+        self.statements += 1
+        if on_conflict:
+            self._emit(
+                f"INSERT INTO {table} ({cols}) SELECT {cols} FROM {target} ON CONFLICT {on_conflict};"
+            )
+            self._emit(f"DROP TABLE {target};")
+        return n
+
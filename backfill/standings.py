@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Compute league standings offline and write them as materialized tables.
+
+Same rules as supabase/query_standings_with_handicaps.sql (and the standings route):
+  - only league members' scores for games active in league_game on that date count;
+  - adjusted score = score * league_handicap day multiplier for (user, game, date), else score;
+  - per game per day, players are ranked by adjusted score (score_type decides the direction),
+    ties share the rank and the next rank skips (1, 1, 3, 4);
+  - a player's daily raw points are the sum of their game ranks that day, and the day is ranked
+    on those (lower better, same tie rule); monthly points are the sum of day ranks.
+Months are independent, so with --state only months whose inputs changed are recomputed.
+
+Members are the league_player rows of --members and players are labelled with users.username from
+--users, as in the SQL. Without those exports the ids file stands in: its user_ids are the members
+and their keys the usernames, which matches the SQL only while the two agree.
+
+Usage:
+  python3 standings.py --ids ids.json --handicaps league_handicap.csv data/*.csv
+  python3 standings.py --ids ids.json --members league_player.csv --users users.csv --scores scores.csv
+  python3 standings.py --ids ids.json --scores scores.csv --month 2026-01
+  python3 standings.py --ids ids.json --format copy --state standings-state.json data/*.csv -o standings.sql
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import sys
+from collections import defaultdict
+from decimal import Decimal
+from pathlib import Path
+
+from backfill_league import SCORE_TYPES
+from handicap_schedule import day_of_week, load_handicaps
+from sql_output import SQL_FORMATS, SqlWriter, sql_literal
+
+TABLES = {
+    "game_day": ("public.standings_game_day", ("league_id", "date", "game_id", "user_id", "adjusted_score", "points")),
+    "daily": ("public.standings_daily", ("league_id", "date", "user_id", "raw_points", "points")),
+    "monthly": ("public.standings_monthly", ("league_id", "month", "user_id", "points")),
+}
+FORMATS = ("report", "csv") + SQL_FORMATS
+
+
+def _plain(value: Decimal) -> Decimal:
+    """Drop trailing zeros without going to exponent form: 811.00 -> 811, 526.500 -> 526.5."""
+    value = value.normalize()
+    return value.quantize(Decimal(1)) if value.as_tuple().exponent > 0 else value
+
+
+def competition_ranks(values: list, reverse: bool = False) -> list[int]:
+    """rank() over values: ties share a rank and the next rank skips (1, 1, 3, 4)."""
+    order = sorted(range(len(values)), key=values.__getitem__, reverse=reverse)
+    ranks = [0] * len(values)
+    for pos, i in enumerate(order):
+        if pos and values[i] == values[order[pos - 1]]:
+            ranks[i] = ranks[order[pos - 1]]
+        else:
+            ranks[i] = pos + 1
+    return ranks
+
+
+class League:
+    """Members, game windows, score types and handicaps for one league, keyed by uuid."""
+
+    def __init__(
+        self,
+        ids: dict,
+        handicaps: list[dict] | None = None,
+        members: list[dict] | None = None,
+        users: list[dict] | None = None,
+    ):
+        self.league_id = ids.get("league_id") or ""
+        user_ids = ids.get("user_ids") or {}
+        game_ids = ids.get("game_ids") or {}
+        names = {uid: name for name, uid in user_ids.items()}
+        if users is not None:
+            names.update((u["user_id"], u["username"]) for u in users)
+        if members is not None:
+            member_ids = [m["userid"] for m in members if not m.get("leagueid") or m["leagueid"] == self.league_id]
+        else:
+            member_ids = list(user_ids.values())
+        self.members = {uid: names.get(uid, uid) for uid in member_ids}
+        score_types = {**SCORE_TYPES, **(ids.get("score_types") or {})}
+        self.score_types = {gid: score_types.get(slug) for slug, gid in game_ids.items()}
+        self.windows: dict[str, list[tuple[str, str | None]]] = defaultdict(list)
+        for slug, spec in (ids.get("league_games") or {}).items():
+            gid = game_ids.get(slug)
+            for window in spec if isinstance(spec, list) else [spec]:
+                if gid and window.get("start_date"):
+                    self.windows[gid].append((window["start_date"], window.get("end_date") or None))
+        self.handicaps: dict[tuple[str, str], list[tuple[str, str | None, dict]]] = defaultdict(list)
+        for h in handicaps or []:
+            if h.get("league_id") and h["league_id"] != self.league_id:
+                continue
+            mults = h.get("day_multipliers") or {}
+            if isinstance(mults, str):
+                mults = json.loads(mults)
+            self.handicaps[(h["user_id"], h["game_id"])].append((h["start_date"], h.get("end_date") or None, mults))
+
+    def active(self, game_id: str, d: str) -> bool:
+        return any(start <= d and (end is None or end >= d) for start, end in self.windows.get(game_id, ()))
+
+    def multiplier(self, user_id: str, game_id: str, d: str) -> Decimal:
+        """Day multiplier of the first handicap covering d (like LIMIT 1 / handicaps.find), else 1."""
+        for start, end, mults in self.handicaps.get((user_id, game_id), ()):
+            if d >= start and (end is None or d <= end):
+                mult = mults.get(day_of_week(d))
+                return Decimal(str(mult)) if mult is not None else Decimal(1)
+        return Decimal(1)
+
+
+def adjusted_scores(scores, league: League) -> dict[str, list[tuple[str, str, str, Decimal]]]:
+    """
+    month -> [(date, game_id, user_id, adjusted_score)] for member scores in active games.
+    scores are (user_id, game_id, date, score) tuples.
+    """
+    months: dict[str, list] = defaultdict(list)
+    for user_id, game_id, d, score in scores:
+        if user_id not in league.members or league.score_types.get(game_id) is None:
+            continue
+        if not league.active(game_id, d):
+            continue
+        adjusted = _plain(Decimal(str(score)) * league.multiplier(user_id, game_id, d))
+        months[d[:7]].append((d, game_id, user_id, adjusted))
+    return months
+
+
+def month_digest(rows: list[tuple], league: League) -> str:
+    """Changes whenever anything that feeds the month's standings changes."""
+    h = hashlib.sha256(league.league_id.encode())
+    for d, game_id, user_id, adjusted in sorted(rows):
+        h.update(f"{d}|{game_id}|{user_id}|{adjusted}|{league.score_types[game_id]}\n".encode())
+    return h.hexdigest()
+
+
+def compute_month(month: str, rows: list[tuple], league: League) -> dict[str, list[tuple]]:
+    """Standings rows for one month, per TABLES key, in a stable order."""
+    by_game_day: dict[tuple[str, str], list[tuple[str, Decimal]]] = defaultdict(list)
+    for d, game_id, user_id, adjusted in rows:
+        by_game_day[(d, game_id)].append((user_id, adjusted))
+
+    game_day = []
+    daily_raw: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    for (d, game_id), entries in by_game_day.items():
+        ranks = competition_ranks([a for _, a in entries], reverse=league.score_types[game_id] != "lower_better")
+        for (user_id, adjusted), rank in zip(entries, ranks):
+            game_day.append((league.league_id, d, game_id, user_id, adjusted, rank))
+            daily_raw[d][user_id] += rank
+
+    daily = []
+    monthly: dict[str, int] = defaultdict(int)
+    for d, totals in daily_raw.items():
+        users = list(totals)
+        for user_id, rank in zip(users, competition_ranks([totals[u] for u in users])):
+            daily.append((league.league_id, d, user_id, totals[user_id], rank))
+            monthly[user_id] += rank
+
+    name = league.members.get
+    game_day.sort(key=lambda r: (r[1], r[2], r[5], name(r[3])))
+    daily.sort(key=lambda r: (r[1], r[4], name(r[2])))
+    monthly_rows = sorted(
+        ((league.league_id, f"{month}-01", user_id, points) for user_id, points in monthly.items()),
+        key=lambda r: (r[3], name(r[2])),
+    )
+    return {"game_day": game_day, "daily": daily, "monthly": monthly_rows}
+
+
+def write_report(out, results: dict[str, dict], league: League) -> None:
+    """Rows as query_standings_with_handicaps.sql returns them for each month: date, username, daily_raw_points, points."""
+    w = csv.writer(out, lineterminator="\n")
+    w.writerow(("date", "username", "daily_raw_points", "points"))
+    for month in sorted(results):
+        for _, d, user_id, raw, points in results[month]["daily"]:
+            w.writerow((d, league.members[user_id], raw, points))
+        for _, _, user_id, points in results[month]["monthly"]:
+            w.writerow(("", league.members[user_id], "", points))
+
+
+def write_csv_dir(out_dir: Path, results: dict[str, dict], keep: set[str], selected: set[str] | None = None) -> None:
+    """
+    One CSV per table in out_dir. Rows of months in keep (not recomputed) and, when the run is
+    limited to selected months, of every month outside them are carried over from the existing
+    files; everything else comes from results.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for key, (table, columns) in TABLES.items():
+        path = out_dir / f"{table.removeprefix('public.')}.csv"
+        kept = []
+        if (keep or selected is not None) and path.exists():
+            with open(path, newline="", encoding="utf-8") as f:
+                kept = [row for row in csv.reader(f)][1:]
+            kept = [
+                row for row in kept
+                if row[1][:7] not in results and (row[1][:7] in keep or (selected is not None and row[1][:7] not in selected))
+            ]
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f, lineterminator="\n")
+            w.writerow(columns)
+            rows = kept + [row for month in results for row in results[month][key]]
+            rows.sort(key=lambda r: str(r[1]))  # by date/month; stable within a day
+            w.writerows(rows)
+        tmp.replace(path)
+
+
+def write_standings_sql(writer: SqlWriter, results: dict[str, dict], league: League) -> None:
+    """DELETE each recomputed month's rows, then insert the new ones (rerunning is idempotent)."""
+    lid = sql_literal(league.league_id)
+    for month in sorted(results):
+        first = sql_literal(f"{month}-01")
+        writer.write_statement(f"DELETE FROM public.standings_game_day WHERE league_id = {lid} AND date >= {first} AND date < {first}::date + interval '1 month';")
+        writer.write_statement(f"DELETE FROM public.standings_daily WHERE league_id = {lid} AND date >= {first} AND date < {first}::date + interval '1 month';")
+        writer.write_statement(f"DELETE FROM public.standings_monthly WHERE league_id = {lid} AND month = {first};")
+    for key, (table, columns) in TABLES.items():
+        writer.write_rows(table, columns, (row for month in sorted(results) for row in results[month][key]))
+
+
+def load_scores(args, ids: dict):
+    """(user_id, game_id, date, score) tuples from --scores exports or parsed league CSVs."""
+    if args.scores:
+        from snapshot_diff import Snapshot
+
+        for (user_id, game_id, d), score in Snapshot.load(args.scores).rows["public.scores"].items():
+            yield user_id, game_id, d[:10], score
+        return
+    # League sheets: parsed (and cached) exactly as backfill_league.py does; first occurrence wins.
+    from backfill_league import parse_files, parse_rules_version
+    from parse_cache import ParseCache
+    from score_table import ScoreTable
+
+    table = ScoreTable()
+    paths = [p for p in args.files if p.exists()]
+    for path, scores, _ in parse_files(paths, cache=ParseCache(parse_rules_version())):
+        table.extend(scores, source=str(path))
+    user_ids = ids.get("user_ids") or {}
+    game_ids = ids.get("game_ids") or {}
+    for d, slug, player, score, _ in table.deduplicated().rows():
+        if player in user_ids and slug in game_ids:
+            yield user_ids[player], game_ids[slug], d, score
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Materialize league standings (game ranks, daily and monthly points)")
+    ap.add_argument("files", nargs="*", type=Path, help="League CSV(s) to parse (or use --scores)")
+    ap.add_argument("--ids", type=Path, required=True, help="JSON file with user_ids, game_ids, league_id and league_games")
+    ap.add_argument("--scores", type=Path, action="append", help="Export of public.scores (CSV with header or JSON) instead of CSV sheets")
+    ap.add_argument("--handicaps", type=Path, action="append", default=[], help="Export of public.league_handicap (CSV or JSON)")
+    ap.add_argument(
+        "--members",
+        type=Path,
+        action="append",
+        help="Export of public.league_player (CSV or JSON): the league's members (default: the ids file's user_ids)",
+    )
+    ap.add_argument(
+        "--users",
+        type=Path,
+        action="append",
+        help="Export of public.users (CSV or JSON): usernames for the report (default: the ids file's user_ids keys)",
+    )
+    ap.add_argument("--month", action="append", help="Only these months (YYYY-MM, repeatable); default: every month with scores")
+    ap.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="report",
+        help="report (default: the rows query_standings_with_handicaps.sql returns, per month), csv (one file per table in -o DIR), or SQL",
+    )
+    ap.add_argument("--batch-size", type=int, default=500, help="Rows per statement for --format multirow")
+    ap.add_argument("-o", "--output", type=Path, help="Output file (directory for --format csv); default: stdout")
+    ap.add_argument(
+        "--state",
+        type=Path,
+        help="JSON file of per-month input digests: months unchanged since the last run are not recomputed (csv and SQL formats)",
+    )
+    args = ap.parse_args()
+    if not args.files and not args.scores:
+        ap.error("give league CSV files or --scores")
+    if args.format == "csv" and not args.output:
+        ap.error("--format csv needs -o DIR")
+    if args.state and args.format == "report":
+        ap.error("--state applies to --format csv and SQL formats")
+
+    ids = json.loads(args.ids.read_text(encoding="utf-8"))
+    # league_player and users exports come as CSV or JSON, like league_handicap's
+    league = League(
+        ids,
+        load_handicaps(args.handicaps),
+        load_handicaps(args.members) if args.members else None,
+        load_handicaps(args.users) if args.users else None,
+    )
+    months = adjusted_scores(load_scores(args, ids), league)
+    if args.month:
+        months = {m: rows for m, rows in months.items() if m in args.month}
+
+    digests = {m: month_digest(rows, league) for m, rows in months.items()}
+    previous = {}
+    if args.state and args.state.exists():
+        previous = json.loads(args.state.read_text(encoding="utf-8")).get("months", {})
+    unchanged = {m for m, digest in digests.items() if previous.get(m) == digest}
+    if args.format == "csv" and not all((args.output / f"{t.removeprefix('public.')}.csv").exists() for t, _ in TABLES.values()):
+        unchanged = set()  # nothing to carry over
+        previous = {}
+    results = {m: compute_month(m, rows, league) for m, rows in sorted(months.items()) if m not in unchanged}
+    if args.state:
+        print(f"Standings: {len(results)} month(s) recomputed, {len(unchanged)} unchanged.", file=sys.stderr)
+
+    if args.format == "csv":
+        write_csv_dir(args.output, results, unchanged, set(args.month) if args.month else None)
+    else:
+        out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        try:
+            if args.format == "report":
+                write_report(out, results, league)
+            else:
+                write_standings_sql(SqlWriter(out, args.format, args.batch_size), results, league)
+        finally:
+            if args.output:
+                out.close()
+    if args.state:
+        # A --month run leaves the other months' output (and so their digests) as they were;
+        # a full run covers every month, so months that no longer have scores drop out.
+        carried = {m: digest for m, digest in previous.items() if m not in args.month} if args.month else {}
+        args.state.write_text(json.dumps({"months": {**carried, **digests}}, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Intervals from a league_handicap export with day_multipliers NULL (JSON null or an empty CSV cell)
+take the sheet's handicap row, like ids.json entries with "day_multipliers": null.
+
+Run from backfill/: python3 -m unittest discover -s tests
+"""
+
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKFILL = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKFILL))
+
+from handicap_schedule import HandicapSchedule, load_handicaps  # noqa: E402
+
+IDS = {"user_ids": {"sary": "u-sary", "sal": "u-sal"}, "game_ids": {"crossword": "g-cw"}, "league_id": "l-1"}
+MONDAY, TUESDAY = "2024-01-01", "2024-01-02"
+
+
+class LeagueHandicapNullMultipliersTest(unittest.TestCase):
+    def check(self, schedule: HandicapSchedule):
+        # No multipliers: the sheet's value for the date, whatever it is
+        self.assertEqual(schedule.multiplier("sary", "crossword", MONDAY, sheet=0.75), 0.75)
+        self.assertIsNone(schedule.multiplier("sary", "crossword", TUESDAY, sheet=None))
+        self.assertEqual(schedule.row_multipliers("sary", "crossword", [MONDAY, TUESDAY], [0.75, None]), [0.75, None])
+        self.assertEqual(schedule.disagreements("crossword", [MONDAY], [0.5]), [(MONDAY, "sal", 0.5, 0.25)])
+        # Explicit multipliers still override the sheet
+        self.assertEqual(schedule.multiplier("sal", "crossword", MONDAY, sheet=0.5), 0.25)
+        self.assertIsNone(schedule.multiplier("sal", "crossword", TUESDAY, sheet=0.5))
+
+    def test_json_null(self):
+        rows = [
+            {"league_id": "l-1", "user_id": "u-sary", "game_id": "g-cw", "start_date": "2023-10-01", "end_date": None,
+             "day_multipliers": None},
+            {"league_id": "l-1", "user_id": "u-sal", "game_id": "g-cw", "start_date": "2023-10-01", "end_date": None,
+             "day_multipliers": {"1": 0.25}},
+        ]
+        self.check(HandicapSchedule.from_league_handicap(rows, IDS))
+
+    def test_csv_empty_cell(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "league_handicap.csv"
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                w.writerow(("league_id", "user_id", "game_id", "start_date", "end_date", "day_multipliers"))
+                w.writerow(("l-1", "u-sary", "g-cw", "2023-10-01", "", ""))
+                w.writerow(("l-1", "u-sal", "g-cw", "2023-10-01", "", '{"1": 0.25}'))
+            self.check(HandicapSchedule.from_league_handicap(load_handicaps([path]), IDS))
+
+
+if __name__ == "__main__":
+    unittest.main()
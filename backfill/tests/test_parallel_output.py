@@ -0,0 +1,70 @@
+"""
+--jobs N writes byte for byte what a serial run writes: JSON, SQL, and --deduplicate runs where
+the same (player, game, date) comes from several files and input order decides which one is kept.
+
+Run from backfill/: python3 -m unittest discover -s tests
+"""
+
+import csv
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKFILL = Path(__file__).resolve().parent.parent
+DATA = sorted((BACKFILL / "data").glob("*.csv"))
+
+
+def run_backfill(*args: str) -> bytes:
+    result = subprocess.run(
+        [sys.executable, str(BACKFILL / "backfill_league.py"), "--no-cache", *args],
+        cwd=BACKFILL, capture_output=True,
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr.decode())
+    return result.stdout
+
+
+def write_conflicting_copy(src: Path, dest: Path) -> None:
+    """src with every raw score shifted by one, so each of its keys conflicts with a different value."""
+    with open(src, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    for row in rows:
+        if "raw" in row:
+            start = row.index("raw") + 1
+            row[start:] = [str(int(float(v)) + 1) if v.strip().replace(".", "", 1).isdigit() else v for v in row[start:]]
+    with open(dest, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(rows)
+
+
+class ParallelOutputTest(unittest.TestCase):
+    def assertSameOutput(self, files: list[Path], *args: str):
+        paths = [str(p) for p in files]
+        serial = run_backfill(*paths, *args, "--jobs", "1")
+        parallel = run_backfill(*paths, *args, "--jobs", "4")
+        self.assertTrue(serial.strip())
+        self.assertEqual(serial, parallel)
+
+    def test_json(self):
+        self.assertSameOutput(DATA)
+
+    def test_sql(self):
+        for fmt in ("insert", "multirow", "copy"):
+            with self.subTest(fmt=fmt):
+                self.assertSameOutput(DATA, "--format", fmt, "--ids", "ids.json")
+
+    def test_deduplicate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            early = Path(tmp) / "early.csv"
+            late = Path(tmp) / "late.csv"
+            write_conflicting_copy(DATA[3], early)
+            write_conflicting_copy(DATA[-2], late)
+            files = [early, *DATA, late]
+            for args in (["--deduplicate"], ["--deduplicate", "--sql", "--ids", "ids.json"], ["--on-conflict", "last"]):
+                with self.subTest(args=args):
+                    self.assertSameOutput(files, *args, "--conflicts-report", str(Path(tmp) / "conflicts.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
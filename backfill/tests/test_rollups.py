@@ -0,0 +1,92 @@
+"""
+rollups applies corrections, a date whose value changes within one run's inputs (as in a watch
+run's growing ndjson): the old value leaves every statistic (count, mean, variance, min/max,
+sketch) and the new one enters, in the totals and the month, without a per-date history in the
+state.
+
+Run from backfill/: python3 -m unittest discover -s tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKFILL = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKFILL))
+
+from rollups import EXTREMES, Rollups, feed, recompute_mismatches  # noqa: E402
+
+
+def scores_for(days, value) -> list[tuple[str, str, str, float]]:
+    return [("sal", "crossword", f"2024-01-{d:02d}", float(value(d))) for d in days]
+
+
+def reloaded(rollups: Rollups) -> Rollups:
+    with tempfile.TemporaryDirectory() as tmp:
+        state = Path(tmp) / "rollups.json"
+        rollups.save(state)
+        return Rollups.load(state)
+
+
+class RollupsCorrectionsTest(unittest.TestCase):
+    def test_corrections_match_recompute(self):
+        first = scores_for(range(1, 11), lambda d: 10 * d)
+        # Lower the max, raise the min, change a middle value; the rest repeat unchanged
+        corrections = [
+            ("sal", "crossword", "2024-01-10", 55.0),
+            ("sal", "crossword", "2024-01-01", 42.0),
+            ("sal", "crossword", "2024-01-05", 0.0),
+        ]
+        rollups = Rollups()
+        feed(rollups, first)
+        rollups = reloaded(rollups)
+        # The watch's ndjson: what was sent first, then the changed values appended
+        feed(rollups, first + corrections)
+        self.assertEqual((rollups.added, rollups.replaced, rollups.skipped), (0, 3, 7))
+        self.assertEqual(recompute_mismatches(rollups, first + corrections), [])
+        stats = rollups.totals[("sal", "crossword")]
+        self.assertEqual((stats.count, stats.min, stats.max), (10, 0.0, 90.0))
+
+        # Feeding the same inputs again retracts nothing twice
+        rollups = reloaded(rollups)
+        feed(rollups, first + corrections)
+        self.assertEqual((rollups.added, rollups.replaced, rollups.skipped), (0, 0, 10))
+        self.assertEqual(recompute_mismatches(rollups, first + corrections), [])
+
+    def test_state_does_not_keep_history(self):
+        small, large = Rollups(), Rollups()
+        feed(small, scores_for(range(1, 3), lambda d: d))
+        feed(large, scores_for(range(1, 32), lambda d: d))
+        with tempfile.TemporaryDirectory() as tmp:
+            small.save(Path(tmp) / "small.json")
+            large.save(Path(tmp) / "large.json")
+            sizes = [(Path(tmp) / name).stat().st_size for name in ("small.json", "large.json")]
+        # 31 consecutive days are one run and a few sketch buckets more than 2 days
+        self.assertLess(sizes[1], sizes[0] + 1500)
+
+    def test_used_up_extremes(self):
+        first = scores_for(range(1, 31), lambda d: d)
+        # Move the EXTREMES + 2 lowest values above everything else
+        corrections = scores_for(range(1, EXTREMES + 3), lambda d: 100 + d)
+        rollups = Rollups()
+        feed(rollups, first)
+        rollups = reloaded(rollups)
+        feed(rollups, first + corrections)
+        # The run lists every date, so min/max are rebuilt from it
+        self.assertEqual(rollups.unknown_extremes(), set())
+        self.assertEqual(recompute_mismatches(rollups, first + corrections), [])
+
+        # Given only the changed dates, the rest of the series is not there to rebuild from
+        rollups = Rollups()
+        feed(rollups, first)
+        old_and_new = scores_for(range(1, EXTREMES + 3), lambda d: d) + corrections
+        feed(rollups, old_and_new)
+        self.assertEqual(rollups.unknown_extremes(), {("sal", "crossword"), ("sal", "crossword", "2024-01")})
+        stats = rollups.totals[("sal", "crossword")]
+        self.assertEqual((stats.min, stats.max), (None, 100.0 + EXTREMES + 2))
+        self.assertAlmostEqual(stats.mean, (sum(range(EXTREMES + 3, 31)) + sum(100 + d for d in range(1, EXTREMES + 3))) / 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
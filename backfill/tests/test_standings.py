@@ -0,0 +1,89 @@
+"""
+standings.py --state runs against the same output: a --month pass recomputes only that month
+and leaves every other month's rows (and their digests) in place. Members and usernames come
+from league_player and users exports when given.
+
+Run from backfill/: python3 -m unittest discover -s tests
+"""
+
+import csv
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+BACKFILL = Path(__file__).resolve().parent.parent
+DATA = sorted((BACKFILL / "data").glob("*.csv"))
+TABLES = ("standings_game_day", "standings_daily", "standings_monthly")
+
+
+def run_standings(*args: str) -> str:
+    result = subprocess.run(
+        [sys.executable, str(BACKFILL / "standings.py"), "--ids", "ids.json", *args, *map(str, DATA)],
+        cwd=BACKFILL, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return result.stderr
+
+
+def read_tables(out: Path) -> dict[str, list[list[str]]]:
+    tables = {}
+    for name in TABLES:
+        with open(out / f"{name}.csv", newline="", encoding="utf-8") as f:
+            tables[name] = list(csv.reader(f))
+    return tables
+
+
+class StandingsStateTest(unittest.TestCase):
+    def test_month_pass_keeps_other_months(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out, state = Path(tmp) / "standings", str(Path(tmp) / "state.json")
+            run_standings("--format", "csv", "-o", str(out), "--state", state)
+            full = read_tables(out)
+            months = {row[1][:7] for row in full["standings_daily"][1:]}
+            self.assertGreater(len(months), 2)
+            month = sorted(months)[len(months) // 2]
+
+            # Unchanged month: carried over, as is everything outside it
+            report = run_standings("--format", "csv", "-o", str(out), "--state", state, "--month", month)
+            self.assertIn("0 month(s) recomputed, 1 unchanged", report)
+            self.assertEqual(read_tables(out), full)
+            # Without --state the month is recomputed; the others stay
+            run_standings("--format", "csv", "-o", str(out), "--month", month)
+            self.assertEqual(read_tables(out), full)
+            # And the state still describes the whole output
+            report = run_standings("--format", "csv", "-o", str(out), "--state", state)
+            self.assertIn(f"0 month(s) recomputed, {len(months)} unchanged", report)
+            self.assertEqual(read_tables(out), full)
+
+
+class StandingsMembersTest(unittest.TestCase):
+    def test_members_and_usernames_from_exports(self):
+        ids = json.loads((BACKFILL / "ids.json").read_text(encoding="utf-8"))
+        user_ids = ids["user_ids"]
+        dropped = "stolowd"
+        with tempfile.TemporaryDirectory() as tmp:
+            members, users = Path(tmp) / "league_player.json", Path(tmp) / "users.csv"
+            members.write_text(json.dumps(
+                [{"leagueid": ids["league_id"], "userid": uid} for name, uid in user_ids.items() if name != dropped]
+                + [{"leagueid": "another-league", "userid": user_ids[dropped]}]
+            ))
+            with open(users, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                w.writerow(("user_id", "username"))
+                w.writerows((uid, f"{name}_db") for name, uid in user_ids.items())
+            result = subprocess.run(
+                [sys.executable, str(BACKFILL / "standings.py"), "--ids", "ids.json", "--members", str(members),
+                 "--users", str(users), "--month", "2024-01", *map(str, DATA)],
+                cwd=BACKFILL, capture_output=True, text=True,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            names = {row[1] for row in csv.reader(result.stdout.splitlines()[1:])}
+            self.assertEqual(names, {f"{name}_db" for name in user_ids if name != dropped})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+--watch picks up .xlsx workbooks as well as CSV exports, and skips Excel's lock files.
+
+Run from backfill/: python3 -m unittest discover -s tests
+"""
+
+import csv
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from test_xlsx_input import BACKFILL, write_xlsx
+
+DATA = sorted((BACKFILL / "data").glob("*.csv"))
+
+
+class WatchWorkbooksTest(unittest.TestCase):
+    def test_watch_once_reads_workbooks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            inbox = tmp / "inbox"
+            inbox.mkdir()
+            shutil.copy(DATA[0], inbox / DATA[0].name)
+            with open(DATA[1], newline="", encoding="utf-8") as f:
+                write_xlsx(inbox / "geniusness 0125.XLSX", list(csv.reader(f)))
+            (inbox / "~$geniusness 0125.XLSX").write_bytes(b"lock")
+            out = tmp / "scores.ndjson"
+            result = subprocess.run(
+                [sys.executable, str(BACKFILL / "backfill_league.py"), "--watch", str(inbox), "--watch-once",
+                 "--watch-state", str(tmp / "state.json"), "-o", str(out)],
+                cwd=BACKFILL, capture_output=True, text=True,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertNotIn("~$", result.stderr)
+            months = {json.loads(line)["date"][:7] for line in out.read_text(encoding="utf-8").splitlines()}
+            self.assertIn("2024-01", months)
+            self.assertIn("2025-01", months)
+            files = json.loads((tmp / "state.json").read_text(encoding="utf-8"))["files"]
+            self.assertEqual(sorted(files), [DATA[0].name, "geniusness 0125.XLSX"])
+
+
+if __name__ == "__main__":
+    unittest.main()
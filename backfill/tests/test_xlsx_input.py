@@ -0,0 +1,96 @@
+"""
+.xlsx workbooks parse exactly like their CSV exports, including when a handicap schedule is set
+(which reads every input's handicap row before the run).
+
+Run from backfill/: python3 -m unittest discover -s tests
+"""
+
+import csv
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+BACKFILL = Path(__file__).resolve().parent.parent
+SHEET = BACKFILL / "data" / "geniusness 0124.xlsx - 0124.csv"
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+
+
+def _column(i: int) -> str:
+    s = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        s = chr(65 + r) + s
+    return s
+
+
+def write_xlsx(path: Path, rows: list[list[str]]) -> None:
+    """Minimal one-sheet workbook, every cell an inline string (as the CSV export shows it)."""
+    width = max(len(r) for r in rows)
+    xml = [f'<worksheet xmlns="{MAIN_NS}"><dimension ref="A1:{_column(width - 1)}{len(rows)}"/><sheetData>']
+    for i, row in enumerate(rows, 1):
+        cells = "".join(
+            f'<c r="{_column(j)}{i}" t="inlineStr"><is><t>{escape(v)}</t></is></c>' for j, v in enumerate(row) if v
+        )
+        xml.append(f'<row r="{i}">{cells}</row>')
+    xml.append("</sheetData></worksheet>")
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="current" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        zf.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>',
+        )
+        zf.writestr("xl/worksheets/sheet1.xml", "".join(xml))
+
+
+def run_backfill(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, str(BACKFILL / "backfill_league.py"), "--no-cache", *args],
+        cwd=BACKFILL, capture_output=True, text=True,
+    )
+
+
+class XlsxWithHandicapScheduleTest(unittest.TestCase):
+    def test_workbook_matches_csv_with_schedule(self):
+        with open(SHEET, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            workbook = tmp / "geniusness 0124.xlsx"
+            write_xlsx(workbook, rows)
+            ids = tmp / "ids.json"
+            # sal at a flat 50% disagrees with the sheet's 75% days
+            ids.write_text(json.dumps({"handicaps": [
+                {"player": "sary", "game": "crossword", "start_date": "2020-01-01", "end_date": None, "day_multipliers": None},
+                {"player": "stolowd", "game": "crossword", "start_date": "2020-01-01", "end_date": None, "day_multipliers": None},
+                {"player": "sal", "game": "crossword", "start_date": "2020-01-01", "end_date": None,
+                 "day_multipliers": {str(d): 0.5 for d in range(7)}},
+            ]}))
+            from_csv = run_backfill(str(SHEET), "--ids", str(ids), "-o", str(tmp / "csv.json"))
+            from_xlsx = run_backfill(str(workbook), "--ids", str(ids), "-o", str(tmp / "xlsx.json"))
+            self.assertEqual(from_csv.returncode, 0, from_csv.stderr)
+            self.assertEqual(from_xlsx.returncode, 0, from_xlsx.stderr)
+            # Identical apart from each score's _source
+            self.assertEqual(
+                (tmp / "csv.json").read_text(encoding="utf-8").replace(json.dumps(str(SHEET))[1:-1], "SOURCE"),
+                (tmp / "xlsx.json").read_text(encoding="utf-8").replace(json.dumps(str(workbook))[1:-1], "SOURCE"),
+            )
+            # Same disagreement report, apart from the file name
+            self.assertIn("handicap schedule disagrees", from_xlsx.stderr)
+            self.assertEqual(
+                from_csv.stderr.replace(SHEET.name, "SHEET"), from_xlsx.stderr.replace(workbook.name, "SHEET")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
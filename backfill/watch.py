@@ -0,0 +1,232 @@
+"""
+--watch DIR: keep ingesting a directory of league CSV exports (and .xlsx workbooks) as they
+appear or change.
+
+Every poll stats the directory's sheets. A file whose (mtime, size) moved is hashed, and only
+a file whose content hash changed is reparsed. Its scores and starting words are compared
+with what was already sent to the sink, and only new or changed values go out. So a cycle
+costs a stat per file plus the parse of whatever changed. Sent values, file signatures and
+the parsing rules version are kept in a state file, which is saved only after the sink has
+taken the cycle's rows. A restart therefore picks up where it stopped, and a rule change
+reparses everything but still sends only real differences.
+
+Sinks are append-only: a score removed from a sheet is not deleted downstream, and a key that
+appears in two files takes the value from whichever file changed last. Polling is used rather
+than inotify, which the standard library does not offer; a few seconds' interval is plenty
+for monthly exports.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+from db_loader import UPSERT_KEYS
+from parse_cache import file_digest
+from score_table import ScoreTable
+
+DEFAULT_INTERVAL = 5.0
+# Inputs open_sheet_rows reads: CSV exports and .xlsx workbooks (any case)
+SHEET_SUFFIXES = (".csv", ".xlsx")
+
+
+def _score_key(date: str, game_slug: str, player: str) -> str:
+    return f"{date}|{game_slug}|{player}"
+
+
+class UpsertWriter:
+    """
+    Wrap a SqlWriter so appended SQL can be replayed over existing rows: scores and starting
+    words upsert on their unique keys, and league_game is written only once per sink.
+    """
+
+    def __init__(self, writer, include_league_game: bool):
+        self.writer = writer
+        self.include_league_game = include_league_game
+
+    def __getattr__(self, name):
+        return getattr(self.writer, name)
+
+    def write_rows(self, table: str, columns: tuple[str, ...], rows, on_conflict: str | None = None) -> int:
+        if table == "public.league_game" and not self.include_league_game:
+            return 0
+        keys, value = UPSERT_KEYS.get(table, (None, None))
+        if value is not None:
+            on_conflict = f"({', '.join(keys)}) DO UPDATE SET {value} = EXCLUDED.{value}"
+        return self.writer.write_rows(table, columns, rows, on_conflict)
+
+
+class Delta:
+    """One cycle's output: new or changed scores and starting words, and the files they came from."""
+
+    def __init__(self, files: list[Path]):
+        self.files = files
+        self.scores = ScoreTable()
+        self.words: list[tuple[str, str]] = []
+        self.new_scores = 0
+        self.changed_scores = 0
+
+
+class DirectoryWatcher:
+    """
+    poll() returns a Delta whenever files changed (None otherwise); pass it to the sink, then
+    commit() it. run() does both in a loop. parse is process_file; resolve applies --on-conflict
+    to the changed files' scores.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        state_path: Path,
+        rules_version: str,
+        parse: Callable[[Path], tuple[list[dict], list[tuple[str, str]]]],
+        resolve: Callable[[ScoreTable], ScoreTable],
+        suffixes: tuple[str, ...] = SHEET_SUFFIXES,
+    ):
+        self.directory = directory
+        self.state_path = state_path
+        self.rules_version = rules_version
+        self.parse = parse
+        self.resolve = resolve
+        self.suffixes = suffixes
+        self.files: dict[str, list] = {}  # name -> [mtime_ns, size, sha256] as last committed
+        self.scores: dict[str, int | float] = {}  # "date|game|player" -> raw_score sent
+        self.words: dict[str, str] = {}  # date -> starting word sent
+        self._failed: dict[str, list] = {}  # name -> signature of a version that failed to parse or resolve
+        self._retry: set[str] = set()  # files of a cycle that failed to resolve, reparsed with the next change
+        self._pending: dict[str, list] = {}
+        if state_path.exists():
+            with open(state_path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.scores = state.get("scores", {})
+            self.words = state.get("words", {})
+            if state.get("rules") == rules_version:
+                self.files = state.get("files", {})
+
+    @property
+    def first_cycle(self) -> bool:
+        return not self.files and not self.scores
+
+    def _sheets(self) -> list[Path]:
+        """The directory's sheets, by name; Excel's "~$name.xlsx" lock files are not workbooks."""
+        return sorted(
+            path for path in self.directory.iterdir()
+            if path.suffix.lower() in self.suffixes and not path.name.startswith("~$") and path.is_file()
+        )
+
+    def _changed(self) -> dict[str, list]:
+        """name -> new signature for files whose content differs from the last committed cycle."""
+        changed = {}
+        for path in self._sheets():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            old = self.files.get(path.name)
+            if old is not None and old[0] == st.st_mtime_ns and old[1] == st.st_size:
+                continue
+            failed = self._failed.get(path.name) if path.name not in self._retry else None
+            if failed is not None and failed[0] == st.st_mtime_ns and failed[1] == st.st_size:
+                continue
+            sig = [st.st_mtime_ns, st.st_size, file_digest(path)]
+            if old is not None and old[2] == sig[2]:
+                # Touched but not edited: remember the new mtime so it is not hashed again
+                self.files[path.name] = sig
+                continue
+            if failed is not None and failed[2] == sig[2]:
+                self._failed[path.name] = sig
+                continue
+            changed[path.name] = sig
+        if changed.keys() <= self._retry:
+            return {}
+        return changed
+
+    def poll(self) -> Delta | None:
+        changed = self._changed()
+        if not changed:
+            return None
+        table = ScoreTable()
+        words: dict[str, str] = {}
+        for name in sorted(changed):
+            path = self.directory / name
+            try:
+                scores, file_words = self.parse(path)
+            except SystemExit as e:
+                # A half-written or malformed sheet: skip it until its content changes
+                print(f"Watch: {e.code} (skipped until it changes)", file=sys.stderr)
+                self._failed[name] = changed.pop(name)
+                continue
+            self._failed.pop(name, None)
+            table.extend(scores, source=str(path))
+            for d, w in file_words:
+                words.setdefault(d, w)
+        if not changed:
+            return None
+        try:
+            table = self.resolve(table)
+        except SystemExit:
+            self._failed.update(changed)
+            self._retry = set(changed)
+            raise
+        self._pending = changed
+        self._retry = set()
+        delta = Delta([self.directory / name for name in sorted(changed)])
+        for rec in table:
+            key = _score_key(rec["date"], rec["game_slug"], rec["player"])
+            old = self.scores.get(key)
+            if old == rec["raw_score"]:
+                continue
+            delta.scores.append(rec["date"], rec["game_slug"], rec["player"], rec["raw_score"], rec["_source"])
+            if old is None:
+                delta.new_scores += 1
+            else:
+                delta.changed_scores += 1
+        delta.words = [(d, w) for d, w in sorted(words.items()) if self.words.get(d) != w]
+        return delta
+
+    def commit(self, delta: Delta) -> None:
+        """Record delta as sent and save the state file."""
+        for date, game_slug, player, raw_score, _ in delta.scores.rows():
+            self.scores[_score_key(date, game_slug, player)] = raw_score
+        self.words.update(delta.words)
+        self.files.update(self._pending)
+        self._pending = {}
+        state = {"rules": self.rules_version, "files": self.files, "scores": self.scores, "words": self.words}
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        tmp.replace(self.state_path)
+
+    def run(self, sink: Callable[[Delta, bool], None], interval: float = DEFAULT_INTERVAL, once: bool = False) -> None:
+        """
+        Poll every interval seconds until interrupted, handing each Delta to sink(delta, first_cycle).
+        With once, run a single cycle and let errors propagate (for cron or scripts).
+        """
+        while True:
+            try:
+                first = self.first_cycle
+                delta = self.poll()
+                if delta is not None:
+                    if delta.scores or delta.words:
+                        sink(delta, first)
+                    self.commit(delta)
+                    names = ", ".join(p.name for p in delta.files) if len(delta.files) <= 3 else f"{len(delta.files)} files"
+                    print(
+                        f"Watch: {names}: {delta.new_scores} new score(s), {delta.changed_scores} changed, "
+                        f"{len(delta.words)} starting word(s).",
+                        file=sys.stderr,
+                    )
+            except SystemExit as e:
+                # --on-conflict error (or a sink failure): nothing was committed
+                if once:
+                    raise
+                if e.code not in (None, 0, 1):
+                    print(f"Watch: {e.code}", file=sys.stderr)
+                print("Watch: cycle skipped; its files are retried when they change.", file=sys.stderr)
+            if once:
+                return
+            try:
+                time.sleep(interval)
+            except KeyboardInterrupt:
+                return
@@ -0,0 +1,200 @@
+"""
+Read a league sheet straight from an .xlsx workbook, as the rows its CSV export would have.
+
+Only the standard library is used: the workbook is a zip of XML parts. workbook.xml and its
+relationships map sheet names to parts; the shared-strings table and the number formats
+(styles.xml) are loaded once; then only the chosen sheet's XML is parsed, incrementally, one
+<row> at a time, and each row is cleared once yielded. No object model of the workbook is built.
+
+Rows come out as list[str], like csv.reader over the export: padded to the sheet's width, with
+rows the sheet leaves out yielded blank. Cells are rendered as the export shows them where the parser
+cares: date-formatted numbers as M/D/YYYY, percent-formatted numbers as 75%, booleans as
+TRUE/FALSE, and other numbers without a trailing .0.
+"""
+
+import io
+import re
+import zipfile
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+from xml.etree.ElementTree import iterparse
+
+NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+# Sheet used when none is named: the live tab of current workbooks; older ones have a single tab
+LEAGUE_SHEET = "current"
+# Built-in number formats (ECMA-376 18.8.30) that display dates or percentages
+DATE_FORMAT_IDS = {14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 46, 47}
+PERCENT_FORMAT_IDS = {9, 10}
+# A custom format is a date if it has d/m/y/h/s outside quoted text, escapes and [colour] codes
+_FORMAT_NOISE = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+_CELL_COLUMN = re.compile(r"[A-Z]+")
+
+
+def _column_index(ref: str) -> int:
+    """'A1' -> 0, 'AB7' -> 27."""
+    n = 0
+    for ch in _CELL_COLUMN.match(ref).group():
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def _text(el) -> str:
+    """Text of a shared string or inline string: every <t> run, skipping phonetic (<rPh>) hints."""
+    parts = []
+    for child in el:
+        if child.tag == NS + "t":
+            parts.append(child.text or "")
+        elif child.tag == NS + "r":
+            parts.extend(t.text or "" for t in child.iter(NS + "t"))
+    return "".join(parts)
+
+
+def sheet_parts(zf: zipfile.ZipFile) -> tuple[dict[str, str], bool]:
+    """({sheet name: zip member}, uses the 1904 date system) from workbook.xml and its relationships."""
+    targets = {}
+    with zf.open("xl/_rels/workbook.xml.rels") as f:
+        for _, el in iterparse(f):
+            if el.tag == PKG_REL_NS + "Relationship":
+                target = el.get("Target")
+                targets[el.get("Id")] = target.lstrip("/") if target.startswith("/") else "xl/" + target
+    sheets = {}
+    date1904 = False
+    with zf.open("xl/workbook.xml") as f:
+        for _, el in iterparse(f):
+            if el.tag == NS + "sheet":
+                sheets[el.get("name")] = targets[el.get(REL_NS + "id")]
+            elif el.tag == NS + "workbookPr":
+                date1904 = el.get("date1904") in ("1", "true")
+    return sheets, date1904
+
+
+def load_shared_strings(zf: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    strings = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, el in iterparse(f):
+            if el.tag == NS + "si":
+                strings.append(_text(el))
+                el.clear()
+    return strings
+
+
+def load_cell_kinds(zf: zipfile.ZipFile) -> list[str | None]:
+    """Per cell style index (a cell's s attribute): "date", "percent" or None, from styles.xml."""
+    if "xl/styles.xml" not in zf.namelist():
+        return []
+    custom: dict[int, str] = {}
+    kinds: list[str | None] = []
+    with zf.open("xl/styles.xml") as f:
+        in_xfs = False
+        for event, el in iterparse(f, events=("start", "end")):
+            if el.tag == NS + "cellXfs":
+                in_xfs = event == "start"
+            elif event == "end" and el.tag == NS + "numFmt":
+                code = _FORMAT_NOISE.sub("", el.get("formatCode", ""))
+                if "%" in code:
+                    custom[int(el.get("numFmtId"))] = "percent"
+                elif re.search(r"[dmyhs]", code, re.I):
+                    custom[int(el.get("numFmtId"))] = "date"
+            elif event == "end" and in_xfs and el.tag == NS + "xf":
+                fmt = int(el.get("numFmtId", "0"))
+                kinds.append(
+                    custom.get(fmt)
+                    or ("date" if fmt in DATE_FORMAT_IDS else "percent" if fmt in PERCENT_FORMAT_IDS else None)
+                )
+    return kinds
+
+
+def format_number(value: float) -> str:
+    return str(int(value)) if value.is_integer() else format(value, ".15g")
+
+
+def pick_sheet(names: list[str], sheet: str | None) -> str:
+    """The sheet to read: sheet if given; else LEAGUE_SHEET if the workbook has it; else the first."""
+    if sheet is not None:
+        if sheet not in names:
+            raise SystemExit(f"no sheet named {sheet!r} (sheets: {', '.join(names)})")
+        return sheet
+    for name in names:
+        if name.strip().lower() == LEAGUE_SHEET:
+            return name
+    if not names:
+        raise SystemExit("workbook has no sheets")
+    return names[0]
+
+
+def iter_xlsx_rows(path: Path, sheet: str | None = None, data: bytes | None = None) -> Iterator[list[str]]:
+    """
+    Yield the rows of one sheet of an .xlsx workbook (see pick_sheet) as lists of strings.
+    data: the workbook's bytes, if already read (path is then only used in messages).
+    """
+    try:
+        zf = zipfile.ZipFile(path if data is None else io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise SystemExit(f"{path}: not an .xlsx workbook")
+    with zf:
+        parts, date1904 = sheet_parts(zf)
+        name = pick_sheet(list(parts), sheet)
+        strings = load_shared_strings(zf)
+        kinds = load_cell_kinds(zf)
+        epoch = date(1904, 1, 1) if date1904 else date(1899, 12, 30)
+        width = 0
+        next_row = 1
+        with zf.open(parts[name]) as f:
+            sheet_data = None
+            for event, el in iterparse(f, events=("start", "end")):
+                tag = el.tag
+                if event == "start":
+                    if tag == NS + "sheetData":
+                        sheet_data = el
+                    continue
+                if tag == NS + "dimension":
+                    # e.g. "A1:AS40": pad every row to the last column, as the CSV export does
+                    last = el.get("ref", "A1").rsplit(":", 1)[-1]
+                    width = _column_index(last) + 1
+                    continue
+                if tag != NS + "row":
+                    continue
+                r = int(el.get("r") or next_row)
+                while next_row < r:
+                    yield [""] * width
+                    next_row += 1
+                next_row = r + 1
+                row = [""] * width
+                for i, c in enumerate(el.iter(NS + "c")):
+                    ref = c.get("r")
+                    col = _column_index(ref) if ref else i
+                    t = c.get("t", "n")
+                    if t == "inlineStr":
+                        is_el = c.find(NS + "is")
+                        value = _text(is_el) if is_el is not None else ""
+                    else:
+                        v = c.find(NS + "v")
+                        if v is None or v.text is None:
+                            continue
+                        value = v.text
+                        if t == "s":
+                            value = strings[int(value)]
+                        elif t == "b":
+                            value = "TRUE" if value == "1" else "FALSE"
+                        elif t == "n":
+                            number = float(value)
+                            style = int(c.get("s", "0"))
+                            kind = kinds[style] if style < len(kinds) else None
+                            if kind == "date":
+                                d = epoch + timedelta(days=int(number))
+                                value = f"{d.month}/{d.day}/{d.year}"
+                            elif kind == "percent":
+                                value = format_number(round(number * 100, 10)) + "%"
+                            else:
+                                value = format_number(number)
+                    if col >= len(row):
+                        row.extend([""] * (col + 1 - len(row)))
+                    row[col] = value
+                # Drop the parsed row so memory stays flat however long the sheet is
+                sheet_data.clear()
+                yield row
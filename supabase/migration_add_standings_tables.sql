@@ -0,0 +1,31 @@
+-- Migration: Add materialized standings tables (filled by backfill/standings.py)
+-- Run this in the Supabase SQL Editor
+-- Same numbers as query_standings_with_handicaps.sql, precomputed: per-game ranks per day,
+-- daily raw totals and day ranks, and monthly points (month = first day of the month).
+
+create table if not exists standings_game_day (
+  league_id uuid not null references league(leagueid) on delete cascade,
+  date date not null,
+  game_id uuid not null references games(gameid) on delete cascade,
+  user_id uuid not null references users(user_id) on delete cascade,
+  adjusted_score numeric not null,
+  points integer not null,
+  primary key (league_id, date, game_id, user_id)
+);
+
+create table if not exists standings_daily (
+  league_id uuid not null references league(leagueid) on delete cascade,
+  date date not null,
+  user_id uuid not null references users(user_id) on delete cascade,
+  raw_points integer not null,
+  points integer not null,
+  primary key (league_id, date, user_id)
+);
+
+create table if not exists standings_monthly (
+  league_id uuid not null references league(leagueid) on delete cascade,
+  month date not null,
+  user_id uuid not null references users(user_id) on delete cascade,
+  points integer not null,
+  primary key (league_id, month, user_id)
+);
@@ -0,0 +1,85 @@
+-- Migration (optional): Range-partition scores by date
+-- Run this in the Supabase SQL Editor at a quiet time: it copies every score into the new table.
+-- Partitions cover one month (or one year: change granularity below), the same periods as
+-- backfill_league.py --split-by, so each period file of a split backfill loads into its own
+-- partition and date-range standings queries only scan the partitions they need.
+-- Dates outside every partition land in scores_default; ensure_scores_partition() moves them out
+-- when their partition is created. Run backfill_league.py --split-by ... --create-partitions to
+-- create the partitions a backfill needs before its period files load.
+-- The unique key (user_id, game_id, date) and the indexes stay the same. The primary key becomes
+-- (id, date), because a partitioned table's keys must include the partition column.
+
+-- Create the scores partition for [p_start, p_end) if it is missing; returns its name
+-- (scores_2024_03 for a month, scores_2024 for a year). Not safe to run concurrently.
+create or replace function public.ensure_scores_partition(p_start date, p_end date)
+returns text
+language plpgsql
+as $$
+declare
+  part text := 'scores_' || case
+    when p_end = (p_start + interval '1 year')::date then to_char(p_start, 'YYYY')
+    else to_char(p_start, 'YYYY_MM')
+  end;
+begin
+  if to_regclass('public.' || part) is not null then
+    return part;
+  end if;
+  execute format('create table public.%I (like public.scores including defaults)', part);
+  execute format(
+    'with moved as (delete from public.scores_default where date >= %L and date < %L returning *) insert into public.%I select * from moved',
+    p_start, p_end, part
+  );
+  execute format('alter table public.scores attach partition public.%I for values from (%L) to (%L)', part, p_start, p_end);
+  return part;
+end $$;
+
+begin;
+
+alter table public.scores rename to scores_unpartitioned;
+
+create table public.scores (
+  id uuid not null default gen_random_uuid(),
+  user_id uuid not null references users(user_id) on delete cascade,
+  game_id uuid not null references games(gameid) on delete cascade,
+  date date not null,
+  score numeric not null,
+  created_at timestamptz default now(),
+  constraint scores_partitioned_pkey primary key (id, date),
+  constraint scores_partitioned_user_game_date_unique unique (user_id, game_id, date)
+) partition by range (date);
+
+create table public.scores_default partition of public.scores default;
+
+-- One partition per period that has scores
+do $$
+declare
+  granularity text := 'month';  -- or 'year': use the same period as --split-by
+  step interval := case granularity when 'year' then interval '1 year' else interval '1 month' end;
+  d date;
+  last_day date;
+begin
+  select date_trunc(granularity, min(date))::date, max(date) into d, last_day from public.scores_unpartitioned;
+  while d <= last_day loop
+    perform public.ensure_scores_partition(d, (d + step)::date);
+    d := (d + step)::date;
+  end loop;
+end $$;
+
+insert into public.scores (id, user_id, game_id, date, score, created_at)
+select id, user_id, game_id, date, score, created_at from public.scores_unpartitioned;
+
+drop table public.scores_unpartitioned;
+
+alter table public.scores rename constraint scores_partitioned_pkey to scores_pkey;
+alter table public.scores rename constraint scores_partitioned_user_game_date_unique to scores_user_game_date_unique;
+create index if not exists idx_scores_user_game_date on public.scores(user_id, game_id, date);
+create index if not exists idx_scores_user_game on public.scores(user_id, game_id);
+create index if not exists idx_scores_date on public.scores(date);
+
+commit;
+
+-- Verify: rows per partition
+select tableoid::regclass as partition, count(*), min(date), max(date)
+from public.scores
+group by 1
+order by 3;
@@ -135,6 +135,7 @@ create table if not exists user_games (
 );
 
 -- Daily scores: one row per user per game per date (league-agnostic)
+-- (migration_partition_scores.sql optionally range-partitions this table by date)
 create table if not exists scores (
   id uuid primary key default gen_random_uuid(),
   user_id uuid not null references users(user_id) on delete cascade,